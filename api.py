@@ -0,0 +1,208 @@
+import sys
+import json
+import contextlib
+from pathlib import Path
+
+import anyio
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+from azureai.settings import get_settings, RETRIEVAL_MODES
+
+# Streamlit 없이 RAG/인벤토리 기능을 JSON으로 제공하는 ASGI 서비스
+#   uvicorn api:app --host 0.0.0.0 --port 8000
+# 동기 Azure SDK 호출은 워커 스레드에서 실행되며, 프로세스 단위 클라이언트/자격 증명/캐시(azureai.cache)와
+# 동시 호출 합치기(azureai.singleflight)를 Streamlit 앱과 같은 방식으로 공유한다.
+
+
+class _JSONResponse(JSONResponse):
+    """한글을 그대로 두고 datetime 등은 문자열로 직렬화하는 JSON 응답"""
+
+    def render(self, content):
+        return json.dumps(content, ensure_ascii=False, default=str).encode("utf-8")
+
+
+async def _read_json(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(400, "요청 본문이 올바른 JSON이 아닙니다.")
+    if not isinstance(body, dict):
+        raise HTTPException(400, "요청 본문은 JSON 객체여야 합니다.")
+    return body
+
+
+def _ask_arguments(body):
+    """질문 요청 본문 검증 → ask_question_with_container 인자"""
+    query = body.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise HTTPException(400, "질문(query)을 입력하세요.")
+    retrieval_mode = body.get("retrieval_mode")
+    if retrieval_mode is not None and retrieval_mode not in RETRIEVAL_MODES:
+        raise HTTPException(400, f"retrieval_mode는 {', '.join(RETRIEVAL_MODES)} 중 하나여야 합니다.")
+    return query.strip(), body.get("container"), body.get("index"), retrieval_mode
+
+
+def _ndjson_events(events):
+    """이벤트 제너레이터를 NDJSON 줄로 변환 (도중 오류는 error 이벤트로 전달)"""
+    try:
+        for event in events:
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+    except Exception as e:
+        yield json.dumps({"type": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+
+
+# --- 상태 ---
+
+async def health(request):
+    settings = get_settings()
+    return _JSONResponse({"status": "ok", "auth_mode": settings.auth_mode, "retrieval_mode": settings.retrieval_mode})
+
+
+async def health_dependencies(request):
+    from azureai.health import run_health_checks
+    force = request.query_params.get("force") in ("1", "true")
+    return _JSONResponse({"checks": await run_in_threadpool(run_health_checks, force)})
+
+
+async def cache_stats(request):
+    from azureai.cache import get_cache_stats
+    return _JSONResponse({"caches": get_cache_stats()})
+
+
+# --- 질문 ---
+
+async def ask(request):
+    """질문에 답변 (stream이 true이면 delta/done 이벤트를 NDJSON으로 스트리밍)"""
+    body = await _read_json(request)
+    arguments = _ask_arguments(body)
+    from azureai.aisearch import ask_question_with_container, stream_question_with_container
+
+    if body.get("stream"):
+        # 동기 제너레이터는 StreamingResponse가 워커 스레드에서 순회한다
+        return StreamingResponse(_ndjson_events(stream_question_with_container(*arguments)), media_type="application/x-ndjson")
+    return _JSONResponse(await run_in_threadpool(ask_question_with_container, *arguments))
+
+
+# --- 컨테이너/인덱스 ---
+
+async def list_containers(request):
+    settings = get_settings()
+    if not settings.storage_account_name:
+        raise HTTPException(503, "AZURE_STORAGE_ACCOUNT_NAME이 설정되지 않았습니다.")
+    from azureai.storage import list_storage_containers
+    containers = await run_in_threadpool(list_storage_containers, settings.storage_account_name)
+    return _JSONResponse({"storage_account": settings.storage_account_name, "containers": containers})
+
+
+async def container_indexes(request):
+    """컨테이너에 연결된 인덱스 목록과 자동 선택 시 사용할 인덱스"""
+    from azureai.aisearch import get_indexes_for_container, get_index_for_container
+    container_name = request.path_params["name"]
+    indexes = await run_in_threadpool(get_indexes_for_container, container_name)
+    default_index = await run_in_threadpool(get_index_for_container, container_name)
+    return _JSONResponse({"container": container_name, "indexes": indexes or [], "default_index": default_index})
+
+
+async def list_indexes(request):
+    from azureai.aisearch import get_available_search_indexes
+    return _JSONResponse({"indexes": await run_in_threadpool(get_available_search_indexes)})
+
+
+# --- 공지사항 ---
+
+async def list_notices(request):
+    from modules.notice_store import list_notices as _list_notices
+    return _JSONResponse({"notices": await run_in_threadpool(_list_notices)})
+
+
+async def create_notice(request):
+    from modules.notice_store import create_notice as _create_notice
+    body = await _read_json(request)
+    return _JSONResponse(await run_in_threadpool(_create_notice, body), status_code=201)
+
+
+async def notice_detail(request):
+    """GET/PATCH/DELETE /notices/{id}"""
+    from modules import notice_store
+    notice_id = request.path_params["notice_id"]
+
+    if request.method == "GET":
+        notice = await run_in_threadpool(notice_store.get_notice, notice_id)
+    elif request.method == "PATCH":
+        body = await _read_json(request)
+        notice = await run_in_threadpool(notice_store.update_notice, notice_id, body)
+    else:
+        if not await run_in_threadpool(notice_store.delete_notice, notice_id):
+            raise HTTPException(404, "공지를 찾을 수 없습니다.")
+        return _JSONResponse({"deleted": notice_id})
+
+    if notice is None:
+        raise HTTPException(404, "공지를 찾을 수 없습니다.")
+    return _JSONResponse(notice)
+
+
+# --- 대시보드 ---
+
+async def list_dashboards(request):
+    """공유 대시보드 스냅샷 (Streamlit 앱과 같은 프로세스 캐시/저장본 사용)"""
+    from modules.dashboard import load_dashboard_snapshot
+    snapshot = await run_in_threadpool(load_dashboard_snapshot)
+    subscription_info = snapshot.data.get('subscription_info')
+    return _JSONResponse({
+        "version": snapshot.version,
+        "fetched_at": snapshot.fetched_wall,
+        "restored": snapshot.restored,
+        "subscription": vars(subscription_info) if subscription_info is not None else None,
+        "dashboards": list(snapshot.data['dashboards']),
+    })
+
+
+# --- 앱 ---
+
+async def _http_error(request, exc):
+    return _JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+
+async def _value_error(request, exc):
+    # 입력 검증 실패 (notice_store, aisearch 설정 오류 등)
+    return _JSONResponse({"error": str(exc)}, status_code=400)
+
+
+async def _server_error(request, exc):
+    return _JSONResponse({"error": str(exc)}, status_code=502)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # 동기 SDK 호출을 실행하는 워커 스레드 수 (기본 40 → 설정값)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = get_settings().api_worker_threads
+    yield
+
+
+routes = [
+    Route("/health", health),
+    Route("/health/dependencies", health_dependencies),
+    Route("/cache/stats", cache_stats),
+    Route("/ask", ask, methods=["POST"]),
+    Route("/containers", list_containers),
+    Route("/containers/{name}/indexes", container_indexes),
+    Route("/indexes", list_indexes),
+    Route("/notices", list_notices, methods=["GET"]),
+    Route("/notices", create_notice, methods=["POST"]),
+    Route("/notices/{notice_id}", notice_detail, methods=["GET", "PATCH", "DELETE"]),
+    Route("/dashboards", list_dashboards),
+]
+
+app = Starlette(
+    routes=routes,
+    exception_handlers={HTTPException: _http_error, ValueError: _value_error, Exception: _server_error},
+    lifespan=lifespan,
+)
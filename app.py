@@ -6,10 +6,9 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 sys.path.append(str(BASE_DIR))
 
-# 페이지 모듈 import
-from modules.dashboard import render_dashboard
-from modules.notice import render_notice_board
-from modules.ai_chat import render_ai_chat
+# 페이지 모듈은 선택된 페이지만 필요할 때 import (pandas/Azure SDK 등 무거운 의존성 지연)
+from modules.router import PAGES, load_page, get_import_report
+from azureai.tracing import start_trace
 
 # 페이지 설정
 st.set_page_config(
@@ -25,13 +24,37 @@ st.set_page_config(
 st.sidebar.title("Dashboard")
 page = st.sidebar.radio(
     "메뉴를 선택하세요",
-    ("대시보드 보기", "공지사항", "AI에게 질문하기")
+    tuple(PAGES),
+    key="page"
 )
 
-# 페이지 라우팅
-if page == "대시보드 보기":
-    render_dashboard()
-elif page == "공지사항":
-    render_notice_board()
-elif page == "AI에게 질문하기":
-    render_ai_chat()
\ No newline at end of file
+# 페이지 라우팅 (rerun 한 번의 Azure 호출을 하나의 트레이스로 묶음)
+with start_trace("rerun", page=page) as rerun_trace:
+    load_page(page)()
+
+# 페이지 모듈 import 비용 보고
+with st.sidebar.expander("⏱ 모듈 로드 시간", expanded=False):
+    for entry in get_import_report():
+        heavy = f" · {', '.join(entry['heavy_packages'])}" if entry['heavy_packages'] else ""
+        st.caption(f"{entry['page']}: {entry['elapsed_ms']:.0f} ms (모듈 {entry['new_modules']}개{heavy})")
+
+# 공유 캐시 적중률/로드 시간 (azureai.cache 레지스트리)
+with st.sidebar.expander("🗄 캐시 통계", expanded=False):
+    from azureai.cache import get_cache_stats
+    for stats in get_cache_stats():
+        hit_rate = f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else "-"
+        load_ms = f"{stats['avg_load_ms']:.0f} ms" if stats['avg_load_ms'] is not None else "-"
+        st.caption(
+            f"{stats['name']}: 적중 {stats['hits']} / 미적중 {stats['misses']} ({hit_rate}), "
+            f"항목 {stats['size']}/{stats['max_entries']}, 평균 로드 {load_ms}"
+        )
+
+# 디버그: 이번 rerun의 Azure 호출 타이밍 워터폴 (azureai.tracing)
+if st.sidebar.toggle("🐞 호출 타이밍 보기", key="debug_trace_waterfall"):
+    from modules.trace_view import render_trace_waterfall
+    render_trace_waterfall(rerun_trace)
+
+# 디버그: 이 세션이 따로 들고 있는 메모리 (공유 데이터셋은 azureai.shared에서 프로세스당 한 벌)
+if st.sidebar.toggle("🧮 세션 메모리 보기", key="debug_session_memory"):
+    from modules.session_memory import render_session_memory
+    render_session_memory()
@@ -1,5 +1,10 @@
 # azureai/__init__.py
 # 이 파일이 있으면 azureai 폴더가 파이썬 패키지로 인식됩니다.
 
-# aisearch 모듈을 임포트할 수 있도록 명시적으로 추가
-from .aisearch import ask_question
+# aisearch 모듈의 ask_question을 패키지에서 바로 임포트할 수 있도록 제공
+# (openai/azure SDK 로딩은 실제로 접근할 때까지 지연하여 azureai.singleflight 등 가벼운 모듈만 쓸 때 비용이 없도록 함)
+def __getattr__(name):
+	if name == "ask_question":
+		from .aisearch import ask_question
+		return ask_question
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
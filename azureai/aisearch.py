@@ -2,46 +2,50 @@
 Non-blocking auth selection and lazy client initialization to avoid UI delays.
 """
 
-import os
-from dotenv import load_dotenv
-from openai import AzureOpenAI
-from azure.identity import ManagedIdentityCredential, ClientSecretCredential, get_bearer_token_provider
+import time
 
-load_dotenv()
+from .settings import get_settings, get_credential, get_search_credential
+from .cache import cached
+from .singleflight import singleflight, do as singleflight_do, make_key
+from .tracing import span, propagate
 
-# Environment variables (support both new and legacy names)
-ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT") or os.getenv("ENDPOINT_URL") or "https://azureopenai-jmg.openai.azure.com/"
-DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT") or os.getenv("DEPLOYMENT_NAME") or "gpt-4.1-mini"
-API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION") or "2024-05-01-preview"
+# Settings are read once per process (azureai.settings); legacy names are kept for importers
+_settings = get_settings()
+ENDPOINT = _settings.openai_endpoint
+DEPLOYMENT = _settings.openai_deployment
+API_VERSION = _settings.openai_api_version
 
-SEARCH_ENDPOINT = os.getenv("AZURE_SEARCH_ENDPOINT")
-SEARCH_INDEX = os.getenv("AZURE_SEARCH_INDEX")
+SEARCH_ENDPOINT = _settings.search_endpoint
+SEARCH_INDEX = _settings.search_index
+# "extension": extra_body.data_sources 사용, "client": SearchClient로 직접 검색 (azureai.retrieval)
+RETRIEVAL_MODE = _settings.retrieval_mode
 
 RESOURCE_SCOPE = "https://cognitiveservices.azure.com/.default"
 
+# Search topology (indexes, data sources, indexers) changes rarely; listings are shared across sessions
+TOPOLOGY_CACHE_TTL_SECONDS = 300
+
 _client = None  # Lazy-initialized AzureOpenAI client
 
 
 def _get_token_provider():
-	"""Prefer Service Principal if available; otherwise use Managed Identity.
+	"""Token provider over the shared credential (Service Principal if configured, otherwise Managed Identity).
 	We do not call get_token() here to avoid blocking UI; token is acquired on-demand.
 	"""
-	client_id = os.getenv("AZURE_CLIENT_ID")
-	tenant_id = os.getenv("AZURE_TENANT_ID")
-	client_secret = os.getenv("AZURE_CLIENT_SECRET")
-	if client_id and tenant_id and client_secret:
-		cred = ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
-	else:
-		cred = ManagedIdentityCredential()
-	return get_bearer_token_provider(cred, RESOURCE_SCOPE)
+	from azure.identity import get_bearer_token_provider
 
+	return get_bearer_token_provider(get_credential(), RESOURCE_SCOPE)
 
-def _get_client() -> AzureOpenAI:
+
+def _get_client() -> "AzureOpenAI":
 	global _client
 	if _client is not None:
 		return _client
 
-	api_key = os.getenv("AZURE_OPENAI_KEY")
+	# openai SDK is imported on first use so that importing this module stays cheap
+	from openai import AzureOpenAI
+
+	api_key = _settings.openai_key
 	if api_key:
 		_client = AzureOpenAI(
 			azure_endpoint=ENDPOINT,
@@ -78,29 +82,25 @@ def get_index_for_container(container_name: str) -> str:
 	return None
 
 
+def _has_results(value) -> bool:
+	"""빈 결과(조회 실패 포함)는 캐시하지 않아 다음 호출에서 다시 시도"""
+	if isinstance(value, tuple):
+		return any(value)
+	return bool(value)
+
+
+@cached("search.indexed_containers", TOPOLOGY_CACHE_TTL_SECONDS, max_entries=1, should_cache=_has_results)
+@singleflight()
 def get_indexed_containers():
 	"""AI Search에 인덱스가 생성된 컨테이너 목록을 반환하는 함수"""
 	try:
 		from azure.search.documents import SearchClient
-		from azure.identity import ClientSecretCredential, ManagedIdentityCredential
-		from azure.core.credentials import AzureKeyCredential
 		
 		if not SEARCH_ENDPOINT:
 			return []
 		
-		# 인증 설정
-		search_key = os.getenv("AZURE_SEARCH_KEY")
-		if search_key:
-			credential = AzureKeyCredential(search_key)
-		else:
-			# Service Principal 또는 Managed Identity 사용
-			client_id = os.getenv("AZURE_CLIENT_ID")
-			tenant_id = os.getenv("AZURE_TENANT_ID")
-			client_secret = os.getenv("AZURE_CLIENT_SECRET")
-			if client_id and tenant_id and client_secret:
-				credential = ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
-			else:
-				credential = ManagedIdentityCredential()
+		# 인증 설정 (API 키 또는 공유 Azure 자격 증명)
+		credential = get_search_credential()
 		
 		indexed_containers = []
 		
@@ -108,7 +108,8 @@ def get_indexed_containers():
 		try:
 			from azure.search.documents.indexes import SearchIndexClient
 			index_client = SearchIndexClient(endpoint=SEARCH_ENDPOINT, credential=credential)
-			known_indexes = [index.name for index in index_client.list_indexes()]
+			with span("search.list_indexes"):
+				known_indexes = [index.name for index in index_client.list_indexes()]
 		except Exception:
 			# 인덱스 목록을 가져올 수 없으면 빈 목록
 			known_indexes = []
@@ -129,6 +130,9 @@ def get_indexed_containers():
 				if index_name == (SEARCH_INDEX or "azureblob-index"):
 					# 기본 인덱스의 경우 실제 문서에서 컨테이너 정보 추출 시도
 					try:
+						# 검색 요청은 결과를 읽을 때 실행됨 (기본 인덱스만 실제로 조회)
+						with span("search.probe", index=index_name):
+							results = list(results)
 						# 검색 결과에서 컨테이너 정보 추출
 						for result in results:
 							# 메타데이터에서 컨테이너 정보 찾기
@@ -196,28 +200,18 @@ def is_container_indexed(container_name: str) -> bool:
 		return False
 
 
+@cached("search.datasources_indexers", TOPOLOGY_CACHE_TTL_SECONDS, max_entries=1, should_cache=_has_results)
+@singleflight()
 def get_datasources_and_indexers():
 	"""데이터소스와 인덱서 정보를 가져오는 함수"""
 	try:
 		from azure.search.documents.indexes import SearchIndexerClient
-		from azure.identity import ClientSecretCredential, ManagedIdentityCredential
-		from azure.core.credentials import AzureKeyCredential
 		
 		if not SEARCH_ENDPOINT:
 			return [], []
 		
-		# 인증 설정
-		search_key = os.getenv("AZURE_SEARCH_KEY")
-		if search_key:
-			credential = AzureKeyCredential(search_key)
-		else:
-			client_id = os.getenv("AZURE_CLIENT_ID")
-			tenant_id = os.getenv("AZURE_TENANT_ID")
-			client_secret = os.getenv("AZURE_CLIENT_SECRET")
-			if client_id and tenant_id and client_secret:
-				credential = ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
-			else:
-				credential = ManagedIdentityCredential()
+		# 인증 설정 (API 키 또는 공유 Azure 자격 증명)
+		credential = get_search_credential()
 		
 		indexer_client = SearchIndexerClient(
 			endpoint=SEARCH_ENDPOINT,
@@ -227,7 +221,9 @@ def get_datasources_and_indexers():
 		# 데이터소스 목록 가져오기
 		datasources = []
 		try:
-			for ds in indexer_client.get_data_source_connections():
+			with span("search.list_datasources"):
+				connections = list(indexer_client.get_data_source_connections())
+			for ds in connections:
 				container_name = None
 				
 				# 컨테이너 정보 추출
@@ -251,7 +247,9 @@ def get_datasources_and_indexers():
 		# 인덱서 목록 가져오기
 		indexers = []
 		try:
-			for indexer in indexer_client.get_indexers():
+			with span("search.list_indexers"):
+				indexer_list = list(indexer_client.get_indexers())
+			for indexer in indexer_list:
 				indexers.append({
 					'name': indexer.name,
 					'data_source_name': indexer.data_source_name,
@@ -269,29 +267,18 @@ def get_datasources_and_indexers():
 		return [], []
 
 
+@cached("search.indexes", TOPOLOGY_CACHE_TTL_SECONDS, max_entries=1, should_cache=_has_results)
+@singleflight()
 def get_available_search_indexes():
 	"""사용 가능한 AI Search 인덱스 목록을 반환하는 함수"""
 	try:
 		from azure.search.documents.indexes import SearchIndexClient
-		from azure.identity import ClientSecretCredential, ManagedIdentityCredential
-		from azure.core.credentials import AzureKeyCredential
 		
 		if not SEARCH_ENDPOINT:
 			return []
 		
-		# 인증 설정
-		search_key = os.getenv("AZURE_SEARCH_KEY")
-		if search_key:
-			credential = AzureKeyCredential(search_key)
-		else:
-			# Service Principal 또는 Managed Identity 사용
-			client_id = os.getenv("AZURE_CLIENT_ID")
-			tenant_id = os.getenv("AZURE_TENANT_ID")
-			client_secret = os.getenv("AZURE_CLIENT_SECRET")
-			if client_id and tenant_id and client_secret:
-				credential = ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
-			else:
-				credential = ManagedIdentityCredential()
+		# 인증 설정 (API 키 또는 공유 Azure 자격 증명)
+		credential = get_search_credential()
 		
 		# SearchIndexClient로 인덱스 목록 가져오기
 		index_client = SearchIndexClient(
@@ -300,7 +287,9 @@ def get_available_search_indexes():
 		)
 		
 		indexes = []
-		for index in index_client.list_indexes():
+		with span("search.list_indexes"):
+			index_list = list(index_client.list_indexes())
+		for index in index_list:
 			indexes.append({
 				'name': index.name,
 				'fields_count': len(index.fields) if index.fields else 0,
@@ -317,6 +306,8 @@ def get_available_search_indexes():
 		return []
 
 
+@cached("search.container_indexes", TOPOLOGY_CACHE_TTL_SECONDS, max_entries=64, should_cache=_has_results)
+@singleflight()
 def get_indexes_for_container(container_name: str):
 	"""특정 컨테이너에 연결된 데이터소스-인덱서를 통해 인덱스 목록을 반환하는 함수"""
 	try:
@@ -380,6 +371,12 @@ def get_indexes_for_container(container_name: str):
 		return get_legacy_indexes_for_container(container_name, all_indexes)
 
 
+def invalidate_search_topology():
+	"""캐시된 인덱스/데이터소스/인덱서 목록을 모두 버려 다음 호출에서 새로 조회"""
+	for listing in (get_indexed_containers, get_datasources_and_indexers, get_available_search_indexes, get_indexes_for_container):
+		listing.invalidate()
+
+
 def get_indexes_from_indexers_only(container_name: str, indexers: list, all_indexes: list):
 	"""인덱서 정보만으로 컨테이너에 해당하는 인덱스 찾기"""
 	try:
@@ -453,14 +450,34 @@ def get_legacy_indexes_for_container(container_name: str, all_indexes: list):
 	return available_indexes
 
 
-def ask_question_with_container(query: str, container_name: str = None, search_index: str = None):
-	"""컨테이너별 인덱스를 사용하여 질문하는 함수"""
-	client = _get_client()
+def _create_completion(client, **kwargs):
+	"""동일한 요청 파라미터의 동시 chat completion 호출을 하나로 합쳐 실행"""
+	key = make_key("chat.completions.create", kwargs=kwargs)
+	with span("openai.chat.completions", model=kwargs.get("model"), data_source="extra_body" in kwargs) as current:
+		completion = singleflight_do(key, client.chat.completions.create, **kwargs)
+		current.set_attribute("total_tokens", _usage_to_dict(completion).get("total_tokens", 0))
+	return completion
+
 
+def _usage_to_dict(completion) -> dict:
+	"""completion의 토큰 사용량을 dict로 변환"""
+	usage = getattr(completion, "usage", None)
+	if usage is None:
+		return {}
+	return {
+		"prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+		"completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+		"total_tokens": getattr(usage, "total_tokens", 0) or 0,
+	}
+
+
+def _prepare_answer(query: str, container_name: str = None, search_index: str = None, retrieval_mode: str = None):
+	"""질문에 대한 chat completion 요청 인자와 응답 메타데이터(citations/index_used/container[/retrieval])를 준비
+	citations가 None이면 응답의 context(On Your Data)에서 인용을 읽는다. 일반/스트리밍 답변이 같은 경로를 사용한다.
+	"""
 	# Dynamic Azure Search auth: use api_key if available, else Managed Identity
-	search_key = os.getenv("AZURE_SEARCH_KEY")
-	if search_key:
-		search_auth = {"type": "api_key", "key": search_key}
+	if _settings.search_key:
+		search_auth = {"type": "api_key", "key": _settings.search_key}
 	else:
 		search_auth = {"type": "system_assigned_managed_identity"}
 
@@ -486,69 +503,164 @@ def ask_question_with_container(query: str, container_name: str = None, search_i
 		final_search_index = None
 		use_search = False
 
+	params = {
+		"model": DEPLOYMENT,
+		"messages": [{"role": "user", "content": query}],
+		"max_tokens": 1024,
+		"temperature": 0.7,
+		"top_p": 0.95,
+		"frequency_penalty": 0,
+		"presence_penalty": 0,
+	}
+
 	# AI Search를 사용하는 경우와 일반 질문인 경우 구분
-	if use_search and final_search_index:
-		completion = client.chat.completions.create(
-			model=DEPLOYMENT,
-			messages=[{"role": "user", "content": query}],
-			max_tokens=1024,
-			temperature=0.7,
-			top_p=0.95,
-			frequency_penalty=0,
-			presence_penalty=0,
-			extra_body={
-				"data_sources": [
-					{
-						"type": "azure_search",
-						"parameters": {
-							"endpoint": SEARCH_ENDPOINT,
-							"index_name": final_search_index,
-							"authentication": search_auth,
-						},
-					}
-				]
-			},
-		)
-		
-		# 인용 정보 추출
-		references = getattr(completion.choices[0].message, "context", None)
-		citations = []
-		if isinstance(references, dict) and "citations" in references:
-			citations = references["citations"]
-		
-		return {
-			"content": completion.choices[0].message.content,
-			"citations": citations,
+	if use_search and final_search_index and (retrieval_mode or RETRIEVAL_MODE) == "client":
+		# 검색을 직접 수행하여 청크 캐시, 컨텍스트 크기 제한, 검색 지연시간 측정이 가능하도록 함
+		from .retrieval import prepare_client_retrieval
+		prepared = prepare_client_retrieval(query, final_search_index)
+		params["messages"] = prepared["messages"]
+		return params, {
+			"citations": prepared["citations"],
 			"index_used": final_search_index,
-			"container": container_name
+			"container": container_name,
+			"retrieval": prepared["retrieval"],
 		}
+	elif use_search and final_search_index:
+		params["extra_body"] = {
+			"data_sources": [
+				{
+					"type": "azure_search",
+					"parameters": {
+						"endpoint": SEARCH_ENDPOINT,
+						"index_name": final_search_index,
+						"authentication": search_auth,
+					},
+				}
+			]
+		}
+		return params, {"citations": None, "index_used": final_search_index, "container": container_name}
+	elif search_index == "NO_INDEX":
+		# 반환값에서 미사용 케이스 구분
+		return params, {"citations": [], "index_used": "미사용", "container": container_name or "일반 질문"}
 	else:
 		# AI Search 없이 일반 OpenAI 답변
-		completion = client.chat.completions.create(
-			model=DEPLOYMENT,
-			messages=[{"role": "user", "content": query}],
-			max_tokens=1024,
-			temperature=0.7,
-			top_p=0.95,
-			frequency_penalty=0,
-			presence_penalty=0,
-		)
-		
-		# 반환값에서 미사용 케이스 구분
-		if search_index == "NO_INDEX":
-			return {
-				"content": completion.choices[0].message.content,
-				"citations": [],
-				"index_used": "미사용",
-				"container": container_name or "일반 질문"
-			}
-		else:
-			return {
-				"content": completion.choices[0].message.content,
-				"citations": [],
-				"index_used": None,
-				"container": "일반 질문"
-			}
+		return params, {"citations": [], "index_used": None, "container": "일반 질문"}
+
+
+def _context_citations(message_or_delta):
+	"""On Your Data 응답(또는 스트리밍 delta)의 context에서 인용 목록 추출 (없으면 None)"""
+	references = getattr(message_or_delta, "context", None)
+	if isinstance(references, dict) and "citations" in references:
+		return references["citations"]
+	return None
+
+
+def ask_question_with_container(query: str, container_name: str = None, search_index: str = None, retrieval_mode: str = None):
+	"""컨테이너별 인덱스를 사용하여 질문하는 함수
+	retrieval_mode: "extension"(On Your Data 확장, 기본값) 또는 "client"(SearchClient로 직접 검색 후 프롬프트 구성)
+	"""
+	client = _get_client()
+	params, meta = _prepare_answer(query, container_name, search_index, retrieval_mode)
+	completion = _create_completion(client, **params)
+
+	message = completion.choices[0].message
+	citations = meta["citations"]
+	if citations is None:
+		# 인용 정보 추출
+		citations = _context_citations(message) or []
+
+	result = {
+		"content": message.content,
+		"citations": citations,
+		"index_used": meta["index_used"],
+		"container": meta["container"],
+		"usage": _usage_to_dict(completion)
+	}
+	if "retrieval" in meta:
+		result["retrieval"] = meta["retrieval"]
+	return result
+
+
+def stream_question_with_container(query: str, container_name: str = None, search_index: str = None, retrieval_mode: str = None):
+	"""ask_question_with_container의 스트리밍 버전 - 이벤트 dict를 순서대로 yield 하는 제너레이터
+	{"type": "delta", "content": 조각}을 받는 대로 내보내고, 마지막에 {"type": "done", ...}으로
+	ask_question_with_container와 같은 필드(content/citations/index_used/container/usage[/retrieval])를 보낸다.
+	"""
+	client = _get_client()
+	params, meta = _prepare_answer(query, container_name, search_index, retrieval_mode)
+
+	parts = []
+	citations = meta["citations"]
+	usage = {}
+	# 제너레이터는 재개될 때마다 다른 스레드에서 실행될 수 있으므로 현재 span으로 설정하지 않음
+	with span("openai.chat.completions.stream", activate=False, model=params["model"],
+			data_source="extra_body" in params) as current:
+		# 스트리밍은 요청해야만 마지막 청크(choices가 빈 청크)에 토큰 사용량이 담김
+		stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **params)
+		for chunk in stream:
+			if getattr(chunk, "usage", None) is not None:
+				usage = _usage_to_dict(chunk)
+			# Azure는 콘텐츠 필터 결과만 담긴(choices가 빈) 청크를 먼저 보낼 수 있음
+			if not chunk.choices:
+				continue
+			delta = chunk.choices[0].delta
+			if citations is None:
+				citations = _context_citations(delta)
+			if delta.content:
+				if not parts:
+					current.set_attribute("first_token_ms", round((time.time_ns() - current.start_ns) / 1e6, 1))
+				parts.append(delta.content)
+				yield {"type": "delta", "content": delta.content}
+		current.set_attribute("total_tokens", usage.get("total_tokens", 0))
+
+	done = {
+		"type": "done",
+		"content": "".join(parts),
+		"citations": citations or [],
+		"index_used": meta["index_used"],
+		"container": meta["container"],
+		"usage": usage
+	}
+	if "retrieval" in meta:
+		done["retrieval"] = meta["retrieval"]
+	yield done
+
+
+def compare_indexes_for_question(query: str, container_name: str, max_workers: int = 8, retrieval_mode: str = None):
+	"""컨테이너에 연결된 모든 인덱스와 인덱스 미사용 경로에 같은 질문을 병렬로 보내 비교하는 함수
+	전체 소요 시간은 가장 느린 단일 호출과 비슷하다.
+	"""
+	from concurrent.futures import ThreadPoolExecutor
+
+	# 클라이언트를 먼저 만들어 두어 워커들이 초기화 경쟁을 하지 않도록 함
+	_get_client()
+
+	targets = ["NO_INDEX"] + [idx['name'] for idx in (get_indexes_for_container(container_name) or [])]
+
+	def _run(search_index):
+		start = time.perf_counter()
+		try:
+			result = ask_question_with_container(query, container_name, search_index, retrieval_mode)
+			error = None
+		except Exception as e:
+			result, error = None, str(e)
+		return {
+			"search_index": search_index,
+			"result": result,
+			"error": error,
+			"latency_ms": round((time.perf_counter() - start) * 1000, 1),
+		}
+
+	wall_start = time.perf_counter()
+	with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+		runs = list(executor.map(propagate(_run), targets))
+
+	return {
+		"query": query,
+		"container": container_name,
+		"runs": runs,
+		"wall_ms": round((time.perf_counter() - wall_start) * 1000, 1),
+	}
 
 
 def ask_question(query: str):
@@ -558,5 +670,12 @@ def ask_question(query: str):
 
 
 if __name__ == "__main__":
+	import sys
+
+	if len(sys.argv) > 1:
+		# 인자가 있으면 JSONL 배치 모드 (python -m azureai.aisearch questions.jsonl -c 8, 옵션은 azureai.batch 참고)
+		from .batch import main
+		sys.exit(main(sys.argv[1:]))
+
 	q = input("질문을 입력하세요: ")
 	print(ask_question(q))
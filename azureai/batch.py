@@ -0,0 +1,204 @@
+"""Concurrent batch question runner.
+Reads questions from a JSONL file or stdin, answers them through ask_question_with_container with bounded
+concurrency, writes each result as a JSONL line as soon as it completes, and reports throughput, latency
+percentiles and token totals at the end.
+
+	python -m azureai.batch questions.jsonl -o answers.jsonl --concurrency 8
+	echo '{"query": "...", "container": "docs"}' | python -m azureai.batch -
+
+Input lines are JSON objects ({"query", "container"?, "index"?, "retrieval_mode"?, "id"?}) or plain question text.
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .settings import RETRIEVAL_MODES
+
+TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def parse_question(line: str, line_number: int, defaults: dict):
+	"""입력 한 줄을 질문 dict로 변환 (빈 줄이면 None, 잘못된 JSON 객체면 ValueError)"""
+	text = line.strip()
+	if not text:
+		return None
+	if text.startswith("{"):
+		item = json.loads(text)
+		query = item.get("query") or item.get("question")
+		if not isinstance(query, str) or not query.strip():
+			raise ValueError(f"{line_number}번째 줄에 query가 없습니다.")
+	else:
+		item, query = {}, text
+	retrieval_mode = item.get("retrieval_mode", defaults.get("retrieval_mode"))
+	if retrieval_mode is not None and retrieval_mode not in RETRIEVAL_MODES:
+		# 오타가 기본 방식으로 조용히 실행되지 않도록 입력 오류로 처리
+		raise ValueError(f"{line_number}번째 줄의 retrieval_mode는 {', '.join(RETRIEVAL_MODES)} 중 하나여야 합니다: {retrieval_mode!r}")
+	return {
+		"id": item.get("id", line_number),
+		"line": line_number,
+		"query": query.strip(),
+		"container": item.get("container", defaults.get("container")),
+		"index": item.get("index", defaults.get("index")),
+		"retrieval_mode": retrieval_mode,
+	}
+
+
+def percentile(sorted_values, pct: float):
+	"""정렬된 값 목록의 백분위수 (최근접 순위, 값이 없으면 None)"""
+	if not sorted_values:
+		return None
+	rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+	return sorted_values[rank - 1]
+
+
+def _input_error_record(question: dict) -> dict:
+	"""읽지 못한 입력 줄의 결과 (ask를 호출하지 않았으므로 latency_ms는 None)"""
+	return {"id": question["id"], "line": question["line"], "query": question["query"],
+		"container": question["container"], "index_used": None, "content": None,
+		"citations": [], "usage": {}, "error": question["error"], "latency_ms": None}
+
+
+def _answer(question: dict, ask) -> dict:
+	start = time.perf_counter()
+	record = {"id": question["id"], "line": question["line"], "query": question["query"]}
+	try:
+		result = ask(question["query"], question["container"], question["index"], question["retrieval_mode"])
+		record.update({
+			"container": result.get("container"),
+			"index_used": result.get("index_used"),
+			"content": result.get("content"),
+			"citations": result.get("citations") or [],
+			"usage": result.get("usage") or {},
+			"error": None,
+		})
+	except Exception as e:
+		record.update({"container": question["container"], "index_used": None, "content": None,
+			"citations": [], "usage": {}, "error": str(e)})
+	record["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+	return record
+
+
+def run_batch(questions, output, ask=None, concurrency: int = 4) -> dict:
+	"""질문 iterable을 concurrency개씩 동시에 처리하며 완료되는 순서대로 output에 JSONL로 기록하고 통계 반환
+	입력은 필요한 만큼만 읽는다 (진행 중인 작업은 concurrency의 2배까지).
+	"""
+	if ask is None:
+		from .aisearch import ask_question_with_container, _get_client
+		# 클라이언트를 먼저 만들어 두어 워커들이 초기화 경쟁을 하지 않도록 함
+		_get_client()
+		ask = ask_question_with_container
+
+	latencies = []
+	tokens = dict.fromkeys(TOKEN_FIELDS, 0)
+	errors = 0
+	input_errors = 0
+	write_lock = threading.Lock()
+
+	def _record(record):
+		nonlocal errors, input_errors
+		with write_lock:
+			output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+			output.flush()
+		if record["latency_ms"] is None:
+			# 입력 오류는 질문을 보내지 않았으므로 지연시간/처리량에서 제외하고 따로 셈
+			input_errors += 1
+		else:
+			latencies.append(record["latency_ms"])
+		if record["error"]:
+			errors += 1
+		for field in TOKEN_FIELDS:
+			tokens[field] += record["usage"].get(field, 0) or 0
+
+	wall_start = time.perf_counter()
+	pending = set()
+	with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+		for question in questions:
+			if question.get("error"):
+				_record(_input_error_record(question))
+				continue
+			pending.add(executor.submit(_answer, question, ask))
+			if len(pending) >= concurrency * 2:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					_record(future.result())
+		while pending:
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				_record(future.result())
+	wall_seconds = time.perf_counter() - wall_start
+
+	latencies.sort()
+	return {
+		"questions": len(latencies) + input_errors,
+		"errors": errors,
+		"input_errors": input_errors,
+		"concurrency": concurrency,
+		"wall_seconds": round(wall_seconds, 2),
+		"throughput_qps": round(len(latencies) / wall_seconds, 2) if wall_seconds > 0 else None,
+		"latency_ms": {
+			"p50": percentile(latencies, 50),
+			"p90": percentile(latencies, 90),
+			"p99": percentile(latencies, 99),
+			"max": latencies[-1] if latencies else None,
+		},
+		"tokens": tokens,
+	}
+
+
+def _read_questions(stream, defaults: dict):
+	for line_number, line in enumerate(stream, 1):
+		try:
+			question = parse_question(line, line_number, defaults)
+		except ValueError as e:
+			# 잘못된 줄은 오류 결과로 기록하고 나머지 질문은 계속 처리
+			question = {"id": line_number, "line": line_number, "query": None, "container": None, "error": f"입력 오류: {e}"}
+		if question is not None:
+			yield question
+
+
+def format_stats(stats: dict) -> str:
+	latency = stats["latency_ms"]
+	tokens = stats["tokens"]
+	return "\n".join([
+		f"질문 {stats['questions']}개 (오류 {stats['errors']}개, 그중 입력 오류 {stats['input_errors']}개), 동시 실행 {stats['concurrency']}, 전체 {stats['wall_seconds']}초",
+		f"처리량 {stats['throughput_qps']} 질문/초 (입력 오류 제외)",
+		f"지연시간 p50 {latency['p50']} ms | p90 {latency['p90']} ms | p99 {latency['p99']} ms | 최대 {latency['max']} ms",
+		f"토큰 입력 {tokens['prompt_tokens']} | 출력 {tokens['completion_tokens']} | 합계 {tokens['total_tokens']}",
+	])
+
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description="JSONL 질문 파일을 동시에 처리해 답변을 JSONL로 기록합니다.")
+	parser.add_argument("input", nargs="?", default="-", help="질문 JSONL 파일 (기본값 '-': 표준 입력)")
+	parser.add_argument("-o", "--output", default="-", help="답변 JSONL 파일 (기본값 '-': 표준 출력)")
+	parser.add_argument("-c", "--concurrency", type=int, default=4, help="동시에 처리할 질문 수 (기본값 4)")
+	parser.add_argument("--container", help="줄에 container가 없을 때 사용할 컨테이너")
+	parser.add_argument("--index", help="줄에 index가 없을 때 사용할 인덱스 (NO_INDEX: 검색 미사용)")
+	parser.add_argument("--retrieval-mode", choices=RETRIEVAL_MODES, help="검색 방식 (기본값: 설정값)")
+	parser.add_argument("--stats-json", action="store_true", help="마지막 통계를 JSON으로 표준 오류에 출력")
+	args = parser.parse_args(argv)
+	if args.concurrency < 1:
+		parser.error("--concurrency는 1 이상이어야 합니다.")
+
+	defaults = {"container": args.container, "index": args.index, "retrieval_mode": args.retrieval_mode}
+	source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+	output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+	try:
+		stats = run_batch(_read_questions(source, defaults), output, concurrency=args.concurrency)
+	finally:
+		if source is not sys.stdin:
+			source.close()
+		if output is not sys.stdout:
+			output.close()
+
+	print(json.dumps(stats, ensure_ascii=False) if args.stats_json else format_stats(stats), file=sys.stderr)
+	return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
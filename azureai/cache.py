@@ -0,0 +1,182 @@
+"""Unified in-process cache for Azure fetchers.
+TTLCache provides per-key TTL, LRU size bounds, shared or per-session scope, explicit invalidation and
+hit/miss/latency counters. Every cache (and any object exposing stats()/invalidate(), such as SnapshotStore)
+is registered by name so metrics and invalidation are available from one place.
+"""
+
+import time
+import threading
+import functools
+from collections import OrderedDict
+
+from .singleflight import make_key
+
+SCOPE_SHARED = "shared"    # 프로세스 전체가 공유
+SCOPE_SESSION = "session"  # 사용자 세션별로 분리
+
+_registry = {}
+_registry_lock = threading.Lock()
+_MISSING = object()
+
+
+def _current_session_id():
+	"""현재 Streamlit 세션 id (스크립트 실행 컨텍스트 밖이면 None)"""
+	try:
+		from streamlit.runtime.scriptrunner import get_script_run_ctx
+	except ImportError:
+		return None
+	ctx = get_script_run_ctx(suppress_warning=True)
+	return ctx.session_id if ctx is not None else None
+
+
+class TTLCache:
+	"""키별 TTL과 LRU 크기 제한을 가진 스레드 안전 캐시"""
+
+	def __init__(self, name: str, ttl_seconds: float, max_entries: int = 128, scope: str = SCOPE_SHARED):
+		if scope not in (SCOPE_SHARED, SCOPE_SESSION):
+			raise ValueError(f"알 수 없는 캐시 범위입니다: {scope}")
+		self.name = name
+		self.ttl_seconds = ttl_seconds
+		self.max_entries = max_entries
+		self.scope = scope
+		self._entries = OrderedDict()  # 키 → (값, 만료 시각)
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+		self._expirations = 0
+		self._loads = 0
+		self._load_seconds = 0.0
+
+	def _scoped(self, key):
+		if self.scope == SCOPE_SESSION:
+			return (_current_session_id(), key)
+		return key
+
+	def get(self, key, default=None):
+		"""유효한 값이 있으면 반환 (없거나 만료되었으면 default)"""
+		scoped_key = self._scoped(key)
+		with self._lock:
+			entry = self._entries.get(scoped_key)
+			if entry is not None:
+				if time.monotonic() < entry[1]:
+					self._entries.move_to_end(scoped_key)
+					self._hits += 1
+					return entry[0]
+				del self._entries[scoped_key]
+				self._expirations += 1
+			self._misses += 1
+			return default
+
+	def set(self, key, value, ttl_seconds: float = None):
+		"""값 저장 (ttl_seconds로 이 키만 다른 유지 시간을 줄 수 있음)"""
+		expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+		scoped_key = self._scoped(key)
+		with self._lock:
+			self._entries[scoped_key] = (value, expires_at)
+			self._entries.move_to_end(scoped_key)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+				self._evictions += 1
+
+	def get_or_load(self, key, loader, ttl_seconds: float = None, should_cache=None):
+		"""캐시에 없으면 loader()로 가져와 저장 후 반환 (예외는 저장하지 않고 그대로 전달)
+		should_cache(값)가 False를 반환하면 결과를 저장하지 않는다.
+		"""
+		value = self.get(key, _MISSING)
+		if value is not _MISSING:
+			return value
+		start = time.perf_counter()
+		try:
+			value = loader()
+		finally:
+			with self._lock:
+				self._loads += 1
+				self._load_seconds += time.perf_counter() - start
+		if should_cache is None or should_cache(value):
+			self.set(key, value, ttl_seconds)
+		return value
+
+	def invalidate(self, key=_MISSING):
+		"""키 하나(범위 적용) 또는 전체 항목 제거"""
+		with self._lock:
+			if key is _MISSING:
+				self._entries.clear()
+			else:
+				self._entries.pop(self._scoped(key), None)
+
+	def __len__(self):
+		with self._lock:
+			return len(self._entries)
+
+	def stats(self) -> dict:
+		with self._lock:
+			lookups = self._hits + self._misses
+			return {
+				"name": self.name,
+				"scope": self.scope,
+				"size": len(self._entries),
+				"max_entries": self.max_entries,
+				"hits": self._hits,
+				"misses": self._misses,
+				"hit_rate": round(self._hits / lookups, 3) if lookups else None,
+				"evictions": self._evictions,
+				"expirations": self._expirations,
+				"loads": self._loads,
+				"avg_load_ms": round(self._load_seconds * 1000 / self._loads, 1) if self._loads else None,
+			}
+
+
+def register(name: str, cache):
+	"""stats()/invalidate()를 가진 캐시 객체를 이름으로 등록"""
+	with _registry_lock:
+		_registry[name] = cache
+	return cache
+
+
+def get_cache(name: str, ttl_seconds: float = 300, max_entries: int = 128, scope: str = SCOPE_SHARED) -> TTLCache:
+	"""이름으로 등록된 TTLCache 반환 (없으면 생성 후 등록)"""
+	with _registry_lock:
+		cache = _registry.get(name)
+		if cache is None:
+			cache = TTLCache(name, ttl_seconds, max_entries, scope)
+			_registry[name] = cache
+		return cache
+
+
+def invalidate(name: str = None):
+	"""이름으로 지정한 캐시(또는 등록된 모든 캐시) 비우기"""
+	with _registry_lock:
+		caches = [_registry[name]] if name else list(_registry.values())
+	for cache in caches:
+		cache.invalidate()
+
+
+def get_cache_stats() -> list:
+	"""등록된 모든 캐시의 통계 (이름순)"""
+	with _registry_lock:
+		caches = sorted(_registry.items())
+	return [dict(cache.stats(), name=name) for name, cache in caches]
+
+
+def cached(name: str, ttl_seconds: float = 300, max_entries: int = 128, scope: str = SCOPE_SHARED, should_cache=None):
+	"""함수 결과를 인자 기준으로 캐시하는 데코레이터
+	wrapper.cache로 캐시에, wrapper.invalidate()로 비우기에 접근할 수 있다.
+
+		@cached("search.indexes", ttl_seconds=300)
+		@singleflight()
+		def get_available_search_indexes(): ...
+	"""
+	cache = get_cache(name, ttl_seconds, max_entries, scope)
+
+	def decorator(fn):
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			key = make_key(name, args, kwargs)
+			return cache.get_or_load(key, lambda: fn(*args, **kwargs), should_cache=should_cache)
+
+		wrapper.cache = cache
+		wrapper.invalidate = cache.invalidate
+		return wrapper
+
+	return decorator
@@ -0,0 +1,164 @@
+"""Lightweight dependency health checks.
+Each dependency is probed with the cheapest call available, in parallel, and results are cached briefly.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .settings import get_settings, get_credential, get_search_credential
+from .tracing import span, propagate
+
+HEALTH_TTL_SECONDS = 30      # 결과 캐시 유지 시간
+HISTORY_LENGTH = 20          # 의존성별 지연시간 이력 개수
+PROBE_TIMEOUT_SECONDS = 10   # 개별 프로브 최대 대기 시간
+
+_lock = threading.Lock()
+_cached_results = None
+_cached_at = 0.0
+_latency_history = {}
+
+
+def _probe_openai():
+	"""1토큰 completion으로 배포 응답 여부 확인"""
+	from .aisearch import _get_client, DEPLOYMENT
+
+	_get_client().chat.completions.create(
+		model=DEPLOYMENT,
+		messages=[{"role": "user", "content": "ping"}],
+		max_tokens=1,
+		temperature=0,
+	)
+	return f"배포 `{DEPLOYMENT}` 응답"
+
+
+def _probe_search():
+	"""서비스 통계 조회로 AI Search 연결 확인"""
+	from azure.search.documents.indexes import SearchIndexClient
+
+	search_endpoint = get_settings().search_endpoint
+	if not search_endpoint:
+		return None
+	index_client = SearchIndexClient(endpoint=search_endpoint, credential=get_search_credential())
+	stats = index_client.get_service_statistics()
+	counters = stats.get("counters", {}) if isinstance(stats, dict) else {}
+	index_counter = (counters.get("index_counter") or counters.get("indexesCount") or {}) if isinstance(counters, dict) else {}
+	index_count = index_counter.get("usage")
+	return f"인덱스 {index_count}개" if index_count is not None else "서비스 통계 조회 성공"
+
+
+def _probe_blob():
+	"""계정 정보 조회로 Blob Storage 연결 확인"""
+	from azure.storage.blob import BlobServiceClient
+
+	storage_account_name = get_settings().storage_account_name
+	if not storage_account_name:
+		return None
+	blob_service_client = BlobServiceClient(
+		account_url=f"https://{storage_account_name}.blob.core.windows.net",
+		credential=get_credential(),
+	)
+	info = blob_service_client.get_account_information()
+	return f"{info.get('account_kind', 'Storage')} / {info.get('sku_name', '')}".strip(" /")
+
+
+def _probe_resource_graph():
+	"""count 쿼리로 Resource Graph 연결 확인"""
+	from azure.mgmt.resourcegraph import ResourceGraphClient
+	from azure.mgmt.resourcegraph.models import QueryRequest
+
+	subscription_id = get_settings().subscription_id
+	if not subscription_id:
+		return None
+	graph_client = ResourceGraphClient(get_credential())
+	response = graph_client.resources(QueryRequest(
+		subscriptions=[subscription_id],
+		query="Resources | where type =~ 'microsoft.portal/dashboards' | summarize count()",
+	))
+	return f"대시보드 {response.data[0].get('count_', 0)}개" if response.data else "쿼리 성공"
+
+
+# (key, 표시 이름, 프로브 함수)
+PROBES = [
+	("openai", "Azure OpenAI", _probe_openai),
+	("search", "Azure AI Search", _probe_search),
+	("blob", "Azure Blob Storage", _probe_blob),
+	("resource_graph", "Azure Resource Graph", _probe_resource_graph),
+]
+
+
+def _run_probe(key: str, label: str, probe):
+	start = time.perf_counter()
+	try:
+		with span(f"health.{key}"):
+			detail = probe()
+		status = "skipped" if detail is None else "ok"
+		if detail is None:
+			detail = "환경 변수 미설정"
+	except ImportError as e:
+		status, detail = "skipped", f"SDK 미설치: {e}"
+	except Exception as e:
+		status, detail = "error", str(e)
+	latency_ms = (time.perf_counter() - start) * 1000
+	return {
+		"key": key,
+		"label": label,
+		"status": status,
+		"latency_ms": round(latency_ms, 1),
+		"detail": detail,
+		"checked_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+	}
+
+
+def run_health_checks(force: bool = False):
+	"""모든 의존성을 병렬로 점검하고 결과 목록을 반환하는 함수 (TTL 동안 캐시)"""
+	global _cached_results, _cached_at
+
+	with _lock:
+		if not force and _cached_results is not None and (time.monotonic() - _cached_at) < HEALTH_TTL_SECONDS:
+			return _cached_results
+
+	results = []
+	# 느린 프로브가 전체 점검을 붙잡지 않도록 종료 시 대기하지 않음
+	executor = ThreadPoolExecutor(max_workers=len(PROBES))
+	try:
+		futures = [executor.submit(propagate(_run_probe), key, label, probe) for key, label, probe in PROBES]
+		deadline = time.monotonic() + PROBE_TIMEOUT_SECONDS
+		for (key, label, _), future in zip(PROBES, futures):
+			try:
+				results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+			except Exception:
+				results.append({
+					"key": key,
+					"label": label,
+					"status": "error",
+					"latency_ms": PROBE_TIMEOUT_SECONDS * 1000.0,
+					"detail": f"{PROBE_TIMEOUT_SECONDS}초 내 응답 없음",
+					"checked_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+				})
+	finally:
+		executor.shutdown(wait=False)
+
+	with _lock:
+		for result in results:
+			if result["status"] != "skipped":
+				history = _latency_history.setdefault(result["key"], deque(maxlen=HISTORY_LENGTH))
+				history.append(result["latency_ms"])
+		_cached_results = results
+		_cached_at = time.monotonic()
+	return results
+
+
+def get_latency_history():
+	"""의존성별 최근 지연시간(ms) 이력을 반환하는 함수"""
+	with _lock:
+		return {key: list(history) for key, history in _latency_history.items()}
+
+
+def health_cache_age():
+	"""캐시된 점검 결과의 경과 시간(초), 결과가 없으면 None"""
+	with _lock:
+		if _cached_results is None:
+			return None
+		return time.monotonic() - _cached_at
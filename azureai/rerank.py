@@ -0,0 +1,123 @@
+"""Local re-ranking and deduplicated context packing for retrieved chunks.
+Drops exact and near-duplicate chunks, scores the rest with a local BM25 lexical scorer and greedily packs the best into the budget.
+"""
+
+import re
+import math
+import hashlib
+from collections import Counter
+
+from .retrieval import estimate_tokens, pack_context
+
+SHINGLE_SIZE = 3                 # 단어 shingle 길이
+NEAR_DUPLICATE_THRESHOLD = 0.8   # Jaccard 유사도가 이 이상이면 중복으로 간주
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 0.5               # 제목 일치 점수 가중치
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _tokenize(text: str):
+	return _TOKEN_PATTERN.findall((text or "").lower())
+
+
+def _content_hash(text: str) -> str:
+	"""공백/대소문자를 정규화한 내용 해시"""
+	normalized = _WHITESPACE_PATTERN.sub(" ", (text or "").strip().lower())
+	return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _shingles(tokens) -> frozenset:
+	if len(tokens) < SHINGLE_SIZE:
+		return frozenset([tuple(tokens)]) if tokens else frozenset()
+	return frozenset(tuple(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+	if not a or not b:
+		return 0.0
+	return len(a & b) / len(a | b)
+
+
+def dedupe_chunks(chunks, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+	"""내용 해시와 shingle 유사도로 중복 청크를 제거하고 (남은 청크, 제거된 청크) 반환
+	검색 순위가 높은 청크를 먼저 남긴다.
+	"""
+	kept, dropped = [], []
+	seen_hashes = set()
+	kept_shingles = []
+	for chunk in chunks:
+		content_hash = _content_hash(chunk["content"])
+		if content_hash in seen_hashes:
+			dropped.append(chunk)
+			continue
+
+		shingles = _shingles(_tokenize(chunk["content"]))
+		if any(_jaccard(shingles, other) >= threshold for other in kept_shingles):
+			dropped.append(chunk)
+			continue
+
+		seen_hashes.add(content_hash)
+		kept_shingles.append(shingles)
+		kept.append(chunk)
+	return kept, dropped
+
+
+def lexical_scores(query: str, chunks):
+	"""검색된 청크 집합을 코퍼스로 하는 BM25 점수 (+ 제목 일치 가중치)"""
+	query_terms = set(_tokenize(query))
+	if not chunks or not query_terms:
+		return [0.0] * len(chunks)
+
+	documents = [_tokenize(chunk["content"]) for chunk in chunks]
+	average_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+	document_frequency = Counter(term for doc in documents for term in set(doc) & query_terms)
+
+	scores = []
+	for chunk, doc in zip(chunks, documents):
+		term_counts = Counter(doc)
+		score = 0.0
+		for term in query_terms:
+			frequency = term_counts.get(term, 0)
+			if not frequency:
+				continue
+			idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+			score += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / average_length))
+		title_terms = set(_tokenize(chunk.get("title", "")))
+		score += TITLE_WEIGHT * len(query_terms & title_terms)
+		scores.append(score)
+	return scores
+
+
+def select_context(query: str, chunks, token_budget: int, top: int = None):
+	"""중복 제거 → 로컬 재순위 → 토큰 예산 내 greedy 패킹(최대 top개)을 수행하고 (담긴 청크, 통계) 반환
+	chunks는 top보다 많은 후보일 수 있다. tokens_saved는 후보 상위 top개를 그대로 담았을 때 대비 줄어든 토큰 수이다.
+	"""
+	kept, dropped = dedupe_chunks(chunks)
+	scores = lexical_scores(query, kept)
+
+	# 점수가 같으면 원래 검색 순위를 유지
+	ranked = [chunk for _, _, chunk in sorted(
+		zip(scores, range(len(kept)), kept), key=lambda item: (-item[0], item[1])
+	)]
+
+	packed = []
+	used_tokens = 0
+	for chunk in ranked:
+		if top is not None and len(packed) >= top:
+			break
+		chunk_tokens = estimate_tokens(chunk["content"])
+		if not chunk_tokens or used_tokens + chunk_tokens > token_budget:
+			continue
+		packed.append(chunk)
+		used_tokens += chunk_tokens
+
+	# 재순위 없이 검색 순서 상위 top개를 담았을 때의 토큰 수와 비교
+	_, naive_tokens = pack_context(chunks if top is None else chunks[:top], token_budget)
+	return packed, {
+		"duplicates_removed": len(dropped),
+		"tokens_saved": max(0, naive_tokens - used_tokens),
+		"context_tokens": used_tokens,
+	}
@@ -0,0 +1,179 @@
+"""Client-side retrieval pipeline for RAG.
+Queries the index directly through SearchClient and packs retrieved chunks into the prompt under a token budget,
+as an alternative to the "On Your Data" (extra_body.data_sources) extension.
+"""
+
+import time
+import threading
+
+from .cache import get_cache
+from .settings import get_settings, get_search_credential
+from .singleflight import singleflight
+from .tracing import span
+
+_settings = get_settings()
+RETRIEVAL_TOP = _settings.retrieval_top
+CONTEXT_TOKEN_BUDGET = _settings.context_token_budget
+SEMANTIC_CONFIGURATION = _settings.semantic_configuration
+LOCAL_RERANK = _settings.local_rerank
+RERANK_CANDIDATE_MULTIPLIER = 2  # 로컬 재순위 시 중복 제거 여유분만큼 더 많이 검색
+RETRIEVAL_CACHE_TTL_SECONDS = 300
+RETRIEVAL_CACHE_MAX_ENTRIES = 256
+
+# 인덱스 스키마에 따라 다른 필드 이름 후보 (앞쪽이 우선)
+CONTENT_FIELDS = ("content", "chunk", "merged_content", "text")
+TITLE_FIELDS = ("title", "metadata_storage_name", "name")
+URL_FIELDS = ("url", "metadata_storage_path", "filepath")
+
+SYSTEM_PROMPT = (
+	"You are an assistant that answers using only the provided sources. "
+	"Cite sources inline as [doc1], [doc2], ... matching the source numbers. "
+	"If the sources do not contain the answer, say so."
+)
+
+_search_clients = {}
+_clients_lock = threading.Lock()
+_cache = get_cache("search.retrieve", RETRIEVAL_CACHE_TTL_SECONDS, RETRIEVAL_CACHE_MAX_ENTRIES)
+
+
+def estimate_tokens(text: str) -> int:
+	"""텍스트의 토큰 수를 근사 계산 (UTF-8 4바이트당 1토큰, 한글 1자 ≈ 0.75토큰)"""
+	if not text:
+		return 0
+	return max(1, len(text.encode("utf-8")) // 4)
+
+
+def _get_search_client(index_name: str):
+	"""인덱스별 SearchClient를 프로세스 단위로 재사용"""
+	with _clients_lock:
+		client = _search_clients.get(index_name)
+		if client is not None:
+			return client
+
+		from azure.search.documents import SearchClient
+
+		if not _settings.search_endpoint:
+			raise ValueError("AZURE_SEARCH_ENDPOINT 환경 변수가 설정되지 않았습니다.")
+
+		client = SearchClient(endpoint=_settings.search_endpoint, index_name=index_name, credential=get_search_credential())
+		_search_clients[index_name] = client
+		return client
+
+
+def _first_field(document: dict, candidates) -> str:
+	for field in candidates:
+		value = document.get(field)
+		if value:
+			return str(value)
+	return ""
+
+
+@singleflight("search.retrieve")
+def _search(index_name: str, query: str, top: int, select: tuple, semantic_configuration: str):
+	search_client = _get_search_client(index_name)
+	kwargs = {"search_text": query, "top": top}
+	if select:
+		kwargs["select"] = list(select)
+	if semantic_configuration:
+		kwargs["query_type"] = "semantic"
+		kwargs["semantic_configuration_name"] = semantic_configuration
+
+	chunks = []
+	with span("search.query", index=index_name, top=top, semantic=bool(semantic_configuration)) as current:
+		for document in search_client.search(**kwargs):
+			chunks.append({
+				"id": document.get("id") or document.get("chunk_id") or document.get("metadata_storage_path", ""),
+				"title": _first_field(document, TITLE_FIELDS) or "제목 없음",
+				"content": _first_field(document, CONTENT_FIELDS),
+				"url": _first_field(document, URL_FIELDS),
+				"score": document.get("@search.score"),
+				"reranker_score": document.get("@search.reranker_score"),
+			})
+		current.set_attribute("results", len(chunks))
+	return chunks
+
+
+def retrieve_chunks(query: str, index_name: str, top: int = RETRIEVAL_TOP, select=None,
+		semantic_configuration: str = SEMANTIC_CONFIGURATION, use_cache: bool = True):
+	"""인덱스를 직접 검색해 청크 목록과 검색 지연시간을 반환하는 함수 (결과는 TTL 캐시)"""
+	select = tuple(select) if select else ()
+	key = (index_name, query.strip(), top, select, semantic_configuration or "")
+
+	if use_cache:
+		chunks = _cache.get(key)
+		if chunks is not None:
+			return {"chunks": chunks, "latency_ms": 0.0, "cached": True}
+
+	start = time.perf_counter()
+	chunks = _search(index_name, query.strip(), top, select, semantic_configuration or "")
+	latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+	_cache.set(key, chunks)
+
+	return {"chunks": chunks, "latency_ms": latency_ms, "cached": False}
+
+
+def clear_retrieval_cache():
+	"""검색 결과 캐시 비우기"""
+	_cache.invalidate()
+
+
+def pack_context(chunks, token_budget: int = CONTEXT_TOKEN_BUDGET):
+	"""검색 순서대로 토큰 예산 안에 들어가는 청크만 담아 (담긴 청크, 사용 토큰) 반환"""
+	packed = []
+	used_tokens = 0
+	for chunk in chunks:
+		chunk_tokens = estimate_tokens(chunk["content"])
+		if not chunk_tokens or used_tokens + chunk_tokens > token_budget:
+			continue
+		packed.append(chunk)
+		used_tokens += chunk_tokens
+	return packed, used_tokens
+
+
+def build_messages(query: str, packed_chunks):
+	"""담긴 청크를 번호가 붙은 출처로 프롬프트에 삽입"""
+	sources = "\n\n".join(
+		f"[doc{number}] {chunk['title']}\n{chunk['content']}"
+		for number, chunk in enumerate(packed_chunks, 1)
+	)
+	return [
+		{"role": "system", "content": f"{SYSTEM_PROMPT}\n\nSources:\n{sources}"},
+		{"role": "user", "content": query},
+	]
+
+
+def prepare_client_retrieval(query: str, index_name: str, top: int = RETRIEVAL_TOP, token_budget: int = CONTEXT_TOKEN_BUDGET,
+		select=None, semantic_configuration: str = SEMANTIC_CONFIGURATION, rerank: bool = LOCAL_RERANK):
+	"""직접 검색한 청크로 프롬프트 메시지, 인용 목록, 검색 통계를 만드는 함수 (일반/스트리밍 답변 공용)
+	rerank가 켜져 있으면 중복 제거 + 로컬 재순위 후 패킹한다 (azureai.rerank).
+	"""
+	candidate_top = top * RERANK_CANDIDATE_MULTIPLIER if rerank else top
+	retrieval = retrieve_chunks(query, index_name, top=candidate_top, select=select, semantic_configuration=semantic_configuration)
+	if rerank:
+		from .rerank import select_context
+		packed, rerank_stats = select_context(query, retrieval["chunks"], token_budget, top)
+		context_tokens = rerank_stats["context_tokens"]
+	else:
+		packed, context_tokens = pack_context(retrieval["chunks"], token_budget)
+		rerank_stats = {"duplicates_removed": 0, "tokens_saved": 0}
+
+	citations = [
+		{"title": chunk["title"], "content": chunk["content"], "url": chunk["url"], "filepath": chunk["url"]}
+		for chunk in packed
+	]
+	return {
+		"messages": build_messages(query, packed),
+		"citations": citations,
+		"retrieval": {
+			"mode": "client",
+			"latency_ms": retrieval["latency_ms"],
+			"cached": retrieval["cached"],
+			"retrieved": len(retrieval["chunks"]),
+			"packed": len(packed),
+			"context_tokens": context_tokens,
+			"reranked": rerank,
+			"duplicates_removed": rerank_stats["duplicates_removed"],
+			"tokens_saved": rerank_stats["tokens_saved"],
+		},
+	}
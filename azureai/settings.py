@@ -0,0 +1,166 @@
+"""Process-wide application settings.
+The environment (and the project .env file) is read and validated once; every module consumes the same frozen
+Settings object instead of calling os.getenv on each request. The Azure credential for the resolved auth strategy
+is also created once and shared, so its token cache is reused across calls.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+AUTH_SERVICE_PRINCIPAL = "service_principal"
+AUTH_MANAGED_IDENTITY = "managed_identity"
+RETRIEVAL_MODES = ("extension", "client")
+TRACE_EXPORTERS = ("memory", "console", "file")
+
+_credential = None
+_credential_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Settings:
+	"""환경 변수에서 한 번 읽어 검증한 설정 값 (변경 불가)"""
+
+	# 인증 (Service Principal 값이 모두 있으면 service_principal, 아니면 managed_identity)
+	client_id: str
+	client_secret: str
+	tenant_id: str
+	subscription_id: str
+	auth_mode: str
+
+	# Azure OpenAI
+	openai_endpoint: str
+	openai_deployment: str
+	openai_api_version: str
+	openai_key: str
+
+	# Azure AI Search
+	search_endpoint: str
+	search_index: str
+	search_key: str
+	retrieval_mode: str
+	retrieval_top: int
+	context_token_budget: int
+	semantic_configuration: str
+	local_rerank: bool
+
+	# Storage / Resource Graph / 대시보드
+	storage_account_name: str
+	resource_graph_page_size: int
+	dashboard_snapshot_path: str
+
+	# HTTP API (api.py) - 동기 Azure SDK 호출을 실행하는 워커 스레드 수
+	api_worker_threads: int
+
+	# 트레이싱 (azureai.tracing) - 내보내기 대상과 file 내보내기 경로
+	trace_exporters: tuple
+	trace_file: str
+
+	@property
+	def has_service_principal(self) -> bool:
+		return self.auth_mode == AUTH_SERVICE_PRINCIPAL
+
+
+def _env(name: str, *fallback_names: str, default: str = None) -> str:
+	for key in (name,) + fallback_names:
+		value = os.getenv(key)
+		if value:
+			return value
+	return default
+
+
+def _env_int(name: str, default: int, minimum: int = 1, maximum: int = None) -> int:
+	raw = os.getenv(name)
+	if not raw:
+		return default
+	try:
+		value = int(raw)
+	except ValueError:
+		raise ValueError(f"{name} 환경 변수는 정수여야 합니다: {raw!r}")
+	if value < minimum:
+		raise ValueError(f"{name} 환경 변수는 {minimum} 이상이어야 합니다: {value}")
+	return min(value, maximum) if maximum else value
+
+
+def load_settings() -> Settings:
+	"""프로젝트 .env와 환경 변수에서 설정을 읽어 검증 (이미 설정된 환경 변수가 .env보다 우선)"""
+	load_dotenv(BASE_DIR / ".env")
+
+	client_id = _env("AZURE_CLIENT_ID")
+	client_secret = _env("AZURE_CLIENT_SECRET")
+	tenant_id = _env("AZURE_TENANT_ID")
+
+	trace_exporters = tuple(name.strip() for name in _env("TRACE_EXPORTERS", default="memory").split(",") if name.strip())
+	unknown_exporters = set(trace_exporters) - set(TRACE_EXPORTERS)
+	if unknown_exporters:
+		raise ValueError(f"TRACE_EXPORTERS는 {', '.join(TRACE_EXPORTERS)} 중에서 골라야 합니다: {', '.join(sorted(unknown_exporters))}")
+
+	retrieval_mode = _env("AZURE_SEARCH_RETRIEVAL_MODE", default="extension")
+	if retrieval_mode not in RETRIEVAL_MODES:
+		raise ValueError(f"AZURE_SEARCH_RETRIEVAL_MODE는 {', '.join(RETRIEVAL_MODES)} 중 하나여야 합니다: {retrieval_mode!r}")
+
+	return Settings(
+		client_id=client_id,
+		client_secret=client_secret,
+		tenant_id=tenant_id,
+		subscription_id=_env("AZURE_SUBSCRIPTION_ID"),
+		auth_mode=AUTH_SERVICE_PRINCIPAL if (client_id and client_secret and tenant_id) else AUTH_MANAGED_IDENTITY,
+		openai_endpoint=_env("AZURE_OPENAI_ENDPOINT", "ENDPOINT_URL", default="https://azureopenai-jmg.openai.azure.com/"),
+		openai_deployment=_env("AZURE_OPENAI_DEPLOYMENT", "DEPLOYMENT_NAME", default="gpt-4.1-mini"),
+		openai_api_version=_env("AZURE_OPENAI_API_VERSION", default="2024-05-01-preview"),
+		openai_key=_env("AZURE_OPENAI_KEY"),
+		search_endpoint=_env("AZURE_SEARCH_ENDPOINT"),
+		search_index=_env("AZURE_SEARCH_INDEX"),
+		search_key=_env("AZURE_SEARCH_KEY"),
+		retrieval_mode=retrieval_mode,
+		retrieval_top=_env_int("AZURE_SEARCH_RETRIEVAL_TOP", 5),
+		context_token_budget=_env_int("AZURE_SEARCH_CONTEXT_TOKENS", 3000),
+		semantic_configuration=_env("AZURE_SEARCH_SEMANTIC_CONFIG"),
+		local_rerank=_env("AZURE_SEARCH_LOCAL_RERANK", default="true").lower() in ("1", "true", "yes"),
+		storage_account_name=_env("AZURE_STORAGE_ACCOUNT_NAME"),
+		resource_graph_page_size=_env_int("AZURE_RESOURCE_GRAPH_PAGE_SIZE", 1000, maximum=1000),
+		dashboard_snapshot_path=_env("DASHBOARD_SNAPSHOT_PATH", default=str(BASE_DIR / "data" / "dashboard_snapshot.sqlite")),
+		api_worker_threads=_env_int("API_WORKER_THREADS", 64),
+		trace_exporters=trace_exporters,
+		trace_file=_env("TRACE_FILE", default=str(BASE_DIR / "data" / "traces.jsonl")),
+	)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+	"""프로세스 단위 설정 (처음 호출 시 한 번만 읽음)"""
+	return load_settings()
+
+
+def get_credential():
+	"""설정된 인증 방식의 Azure 자격 증명을 프로세스 단위로 한 번만 만들어 공유 (토큰 캐시 재사용)"""
+	global _credential
+	with _credential_lock:
+		if _credential is None:
+			settings = get_settings()
+			if settings.has_service_principal:
+				from azure.identity import ClientSecretCredential
+				_credential = ClientSecretCredential(
+					tenant_id=settings.tenant_id,
+					client_id=settings.client_id,
+					client_secret=settings.client_secret,
+				)
+			else:
+				from azure.identity import ManagedIdentityCredential
+				_credential = ManagedIdentityCredential()
+		return _credential
+
+
+def get_search_credential():
+	"""AI Search용 자격 증명 (API 키가 있으면 키, 없으면 공유 Azure 자격 증명)"""
+	settings = get_settings()
+	if settings.search_key:
+		from azure.core.credentials import AzureKeyCredential
+		return AzureKeyCredential(settings.search_key)
+	return get_credential()
@@ -0,0 +1,226 @@
+"""Process-wide immutable, versioned datasets shared by every session.
+Values are deep-frozen (FrozenDict / tuple / frozenset), so a session can keep a plain reference instead of its own
+copy and nobody can change shared data in place. Writers build a changed copy (thaw), persist it and publish it as a
+new version. A dataset backed by a file reloads when the file changes on disk (e.g. written by the API process).
+"""
+
+import sys
+import types
+import threading
+
+from .cache import register
+from .snapshot import Snapshot
+
+
+class FrozenDict(dict):
+	"""변경할 수 없는 dict (dict 하위 클래스이므로 json 직렬화와 읽기 인터페이스는 그대로)"""
+
+	__slots__ = ()
+
+	def _readonly(self, *args, **kwargs):
+		raise TypeError("공유 데이터는 변경할 수 없습니다. thaw()로 복사한 뒤 수정하세요.")
+
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+	def __reduce__(self):
+		# pickle/deepcopy가 __setitem__으로 항목을 채우지 않도록 dict 인자로 다시 만듦
+		return (FrozenDict, (dict(self),))
+
+	def __hash__(self):
+		return hash(frozenset(self.items()))
+
+
+def freeze(value):
+	"""dict/list/set을 재귀적으로 FrozenDict/tuple/frozenset으로 변환 (그 밖의 값은 그대로)"""
+	if isinstance(value, FrozenDict):
+		return value
+	if isinstance(value, dict):
+		return FrozenDict((key, freeze(item)) for key, item in value.items())
+	if isinstance(value, (list, tuple)):
+		return tuple(freeze(item) for item in value)
+	if isinstance(value, (set, frozenset)):
+		return frozenset(freeze(item) for item in value)
+	return value
+
+
+def thaw(value):
+	"""freeze()의 반대 - 수정용 dict/list 복사본 반환"""
+	if isinstance(value, dict):
+		return {key: thaw(item) for key, item in value.items()}
+	if isinstance(value, (list, tuple)):
+		return [thaw(item) for item in value]
+	if isinstance(value, frozenset):
+		return {thaw(item) for item in value}
+	return value
+
+
+_LEAF_TYPES = (str, bytes, int, float, bool, type(None), type, types.ModuleType, types.FunctionType, types.MethodType)
+
+
+def _children(value):
+	if isinstance(value, dict):
+		return [*value.keys(), *value.values()]
+	if isinstance(value, (list, tuple, set, frozenset)):
+		return list(value)
+	if isinstance(value, _LEAF_TYPES) or hasattr(value, "memory_usage"):
+		return []  # DataFrame 등은 __sizeof__가 내용까지 포함하며, 모듈/클래스/함수는 따라가지 않음
+	children = list(vars(value).values()) if hasattr(value, "__dict__") else []
+	for name in getattr(type(value), "__slots__", ()):
+		if hasattr(value, name):
+			children.append(getattr(value, name))
+	return children
+
+
+def deep_sizeof(value, exclude_ids=frozenset(), seen=None) -> int:
+	"""value가 참조하는 객체들의 대략적인 메모리 크기(bytes)
+	exclude_ids에 든 객체(공유 데이터 등)와 그 하위 객체는 세지 않으며, seen을 넘기면 여러 값에 걸쳐 중복을 한 번만 센다.
+	"""
+	seen = set() if seen is None else seen
+	total = 0
+	stack = [value]
+	while stack:
+		current = stack.pop()
+		object_id = id(current)
+		if object_id in seen or object_id in exclude_ids:
+			continue
+		seen.add(object_id)
+		try:
+			total += sys.getsizeof(current)
+		except TypeError:
+			continue
+		stack.extend(_children(current))
+	return total
+
+
+def _object_ids(value) -> frozenset:
+	"""value와 그 하위 컨테이너 객체들의 id"""
+	ids = set()
+	stack = [value]
+	while stack:
+		current = stack.pop()
+		if id(current) in ids:
+			continue
+		ids.add(id(current))
+		stack.extend(_children(current))
+	return frozenset(ids)
+
+
+class SharedDataset:
+	"""load() 결과를 얼린 Snapshot으로 보관하고 모든 세션이 같은 객체를 참조하도록 하는 데이터셋
+
+	- get()은 현재 Snapshot을 반환한다. source_token()이 주어지면 값이 바뀌었을 때(파일 수정 시각 등) 다시 읽는다.
+	- publish(data)는 수정된 데이터를 얼려 새 버전으로 교체한다 (저장 후 호출하면 다시 읽지 않음).
+	- Snapshot.version은 프로세스 내에서 유일하므로 세션/위젯 메모이즈 키로 쓸 수 있다.
+	"""
+
+	def __init__(self, name: str, load, source_token=None):
+		self.name = name
+		self._load_data = load
+		self._source_token = source_token
+		self._lock = threading.Lock()
+		self._load_lock = threading.Lock()
+		self._snapshot = None
+		self._token = None
+		self._hits = 0
+		self._misses = 0
+		self._loads = 0
+		self._measured = (None, 0, frozenset())  # (version, bytes, 객체 id 집합) - 버전마다 한 번만 계산
+
+	def _current_token(self):
+		return self._source_token() if self._source_token is not None else None
+
+	def get(self) -> Snapshot:
+		token = self._current_token()
+		with self._lock:
+			snapshot = self._snapshot
+			if snapshot is not None and token == self._token:
+				self._hits += 1
+				return snapshot
+			self._misses += 1
+		with self._load_lock:
+			# 기다리는 동안 다른 호출이 이미 읽었으면 그 결과 사용
+			token = self._current_token()
+			with self._lock:
+				if self._snapshot is not None and token == self._token:
+					return self._snapshot
+			data = self._load_data()
+			with self._lock:
+				self._loads += 1
+			return self.publish(data, token)
+
+	def publish(self, data, token=None) -> Snapshot:
+		"""data를 얼려 새 버전으로 교체하고 반환 (token을 생략하면 현재 source_token 값 사용)"""
+		snapshot = Snapshot(freeze(data))
+		with self._lock:
+			self._snapshot = snapshot
+			self._token = self._current_token() if token is None else token
+		return snapshot
+
+	def invalidate(self):
+		"""다음 get()이 다시 읽도록 현재 스냅샷을 버림"""
+		with self._lock:
+			self._snapshot = None
+
+	def _measure(self, snapshot):
+		version, size, ids = self._measured
+		if version != snapshot.version:
+			ids = _object_ids(snapshot.data)
+			size = deep_sizeof(snapshot.data)
+			self._measured = (snapshot.version, size, ids)
+		return size, ids
+
+	def object_ids(self) -> frozenset:
+		"""현재 버전 데이터에 속한 객체 id (세션 메모리 계산에서 공유분을 제외할 때 사용)"""
+		with self._lock:
+			snapshot = self._snapshot
+		return self._measure(snapshot)[1] if snapshot is not None else frozenset()
+
+	def stats(self) -> dict:
+		"""azureai.cache.get_cache_stats()와 같은 형식의 통계 + 버전/크기"""
+		with self._lock:
+			snapshot = self._snapshot
+			hits, misses, loads = self._hits, self._misses, self._loads
+		lookups = hits + misses
+		size_bytes = self._measure(snapshot)[0] if snapshot is not None else 0
+		return {
+			"name": self.name,
+			"scope": "shared",
+			"size": int(snapshot is not None),
+			"max_entries": 1,
+			"hits": hits,
+			"misses": misses,
+			"hit_rate": round(hits / lookups, 3) if lookups else None,
+			"loads": loads,
+			"avg_load_ms": None,
+			"version": snapshot.version if snapshot is not None else None,
+			"bytes": size_bytes,
+		}
+
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def shared_dataset(name: str, load, source_token=None) -> SharedDataset:
+	"""이름으로 SharedDataset을 만들어 등록 (azureai.cache 통계에도 표시, 같은 이름이면 기존 객체 반환)"""
+	with _datasets_lock:
+		dataset = _datasets.get(name)
+		if dataset is None:
+			dataset = SharedDataset(name, load, source_token)
+			_datasets[name] = dataset
+			register(name, dataset)
+		return dataset
+
+
+def get_shared_datasets() -> list:
+	"""등록된 공유 데이터셋 (이름순)"""
+	with _datasets_lock:
+		return [dataset for _, dataset in sorted(_datasets.items())]
+
+
+def shared_object_ids() -> frozenset:
+	"""모든 공유 데이터셋의 현재 버전에 속한 객체 id"""
+	ids = set()
+	for dataset in get_shared_datasets():
+		ids.update(dataset.object_ids())
+	return frozenset(ids)
@@ -0,0 +1,91 @@
+"""Single-flight request coalescing.
+Concurrent identical calls (same operation and arguments) share one in-flight upstream request.
+"""
+
+import json
+import threading
+import functools
+
+from .tracing import span
+
+
+class _Call:
+	"""진행 중인 호출 하나의 결과를 대기자들과 공유하기 위한 객체"""
+
+	def __init__(self):
+		self.done = threading.Event()
+		self.result = None
+		self.error = None
+		self.waiters = 0
+
+
+_lock = threading.Lock()
+_inflight = {}
+_stats = {"leaders": 0, "shared": 0}
+
+
+def make_key(operation: str, args=(), kwargs=None):
+	"""연산 이름과 인자로 합치기 키를 생성 (해시 불가능한 인자는 JSON 직렬화)"""
+	kwargs = kwargs or {}
+	try:
+		key = (operation, args, tuple(sorted(kwargs.items())))
+		hash(key)
+		return key
+	except TypeError:
+		return (operation, json.dumps([args, kwargs], sort_keys=True, default=repr, ensure_ascii=False))
+
+
+def do(key, fn, *args, **kwargs):
+	"""같은 key의 호출이 진행 중이면 그 결과를 기다려 공유하고, 없으면 직접 실행하는 함수
+	결과 객체는 모든 호출자가 공유하므로 호출자는 이를 변경하지 않아야 한다.
+	"""
+	with _lock:
+		call = _inflight.get(key)
+		if call is not None:
+			call.waiters += 1
+			_stats["shared"] += 1
+			leader = False
+		else:
+			call = _Call()
+			_inflight[key] = call
+			_stats["leaders"] += 1
+			leader = True
+
+	if not leader:
+		# 다른 호출자의 요청을 기다린 시간도 트레이스에 보이도록 함
+		with span("singleflight.wait", operation=str(key[0])):
+			call.done.wait()
+		if call.error is not None:
+			raise call.error
+		return call.result
+
+	try:
+		call.result = fn(*args, **kwargs)
+	except BaseException as e:
+		call.error = e
+		raise
+	finally:
+		# 완료 즉시 제거하여 이후 호출은 새 요청을 보내도록 함 (결과 캐시가 아님)
+		with _lock:
+			_inflight.pop(key, None)
+		call.done.set()
+	return call.result
+
+
+def singleflight(operation: str = None):
+	"""함수 호출을 연산 이름 + 인자 기준으로 합치는 데코레이터"""
+	def decorator(fn):
+		name = operation or f"{fn.__module__}.{fn.__qualname__}"
+
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			return do(make_key(name, args, kwargs), fn, *args, **kwargs)
+
+		return wrapper
+	return decorator
+
+
+def get_stats():
+	"""실행된 업스트림 호출 수(leaders)와 공유로 절약된 호출 수(shared)를 반환"""
+	with _lock:
+		return dict(_stats, inflight=len(_inflight))
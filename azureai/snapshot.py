@@ -0,0 +1,218 @@
+"""Process-wide versioned snapshots with stale-while-revalidate refresh.
+Every session reads the same immutable snapshot; a background thread replaces it when it goes stale.
+An optional persistence backend keeps the last good snapshot on disk for cold starts and offline fallback.
+"""
+
+import time
+import threading
+import itertools
+from datetime import datetime
+
+from .tracing import start_trace
+
+_versions = itertools.count(1)
+
+
+class Snapshot:
+	"""한 번 만들어지면 바뀌지 않는 데이터 묶음. version은 프로세스 내에서 유일하며 메모이즈 키로 사용한다.
+	restored는 디스크에 저장된 스냅샷을 불러온 경우 True이며, 이때 fetched_wall은 원래 조회 시각이다.
+	"""
+
+	__slots__ = ("data", "version", "fetched_at", "fetched_wall", "restored")
+
+	def __init__(self, data, fetched_wall: datetime = None, restored: bool = False):
+		object.__setattr__(self, "data", data)
+		object.__setattr__(self, "version", next(_versions))
+		object.__setattr__(self, "fetched_at", time.monotonic())
+		object.__setattr__(self, "fetched_wall", fetched_wall or datetime.now())
+		object.__setattr__(self, "restored", restored)
+
+	def __setattr__(self, name, value):
+		raise AttributeError("Snapshot은 변경할 수 없습니다.")
+
+	def age(self) -> float:
+		"""생성 후 경과 시간(초, 단조 시계 기준)"""
+		return time.monotonic() - self.fetched_at
+
+	def is_stale(self, ttl_seconds: float) -> bool:
+		"""ttl이 지났거나 디스크에서 불러온 스냅샷이면 True"""
+		return self.restored or self.age() >= ttl_seconds
+
+
+class SnapshotStore:
+	"""fetch 함수 결과를 프로세스 단위 Snapshot으로 보관하는 저장소
+
+	- 스냅샷이 없으면 호출자가 직접(동기) 가져온다. 동시에 들어온 호출은 하나의 fetch를 공유한다.
+	- ttl이 지나면 현재 스냅샷을 즉시 반환하고 백그라운드 스레드에서 새로 가져온다.
+	- 백그라운드 갱신이 실패하면 마지막 정상 스냅샷을 계속 제공하고 last_error에 기록한 뒤 ttl 후 재시도한다.
+	- refresh(이전 데이터)가 주어지면 백그라운드 갱신은 전체 fetch 대신 이를 사용한다 (증분 갱신).
+	  invalidate() 후의 로드는 항상 전체 fetch를 사용한다.
+	- persistence(load() -> (data, fetched_wall) 또는 None, save(data, fetched_wall))가 주어지면
+	  새로 가져온 스냅샷을 저장하고, 프로세스 시작 후 첫 get()은 저장된 스냅샷을 즉시 반환하면서 백그라운드에서 갱신한다.
+	"""
+
+	def __init__(self, name: str, fetch, ttl_seconds: float, refresh=None, persistence=None):
+		self.name = name
+		self._fetch = fetch
+		self._refresh = refresh
+		self._persistence = persistence
+		self._restore_attempted = persistence is None
+		self.ttl_seconds = ttl_seconds
+		self._lock = threading.Lock()
+		self._fetch_lock = threading.Lock()
+		self._snapshot = None
+		# invalidate()마다 증가 - 무효화 전에 시작한 백그라운드 갱신 결과를 버리는 데 사용
+		self._generation = 0
+		self._refreshing = False
+		self._retry_after = 0.0
+		self.last_error = None
+		self.last_persist_error = None
+		# 캐시 통계 (azureai.cache 레지스트리에서 조회)
+		self._hits = 0
+		self._stale_hits = 0
+		self._misses = 0
+		self._loads = 0
+		self._load_seconds = 0.0
+
+	def get(self) -> Snapshot:
+		"""현재 스냅샷 반환 (없으면 저장본 복원 또는 동기 로드, 오래되었으면 백그라운드 갱신 시작)"""
+		if not self._restore_attempted:
+			self._restore_once()
+		with self._lock:
+			snapshot = self._snapshot
+			if (snapshot is not None and snapshot.is_stale(self.ttl_seconds)
+					and not self._refreshing and time.monotonic() >= self._retry_after):
+				self._refreshing = True
+				threading.Thread(target=self._refresh_in_background, name=f"{self.name}-refresher", daemon=True).start()
+			if snapshot is None:
+				self._misses += 1
+			elif snapshot.is_stale(self.ttl_seconds):
+				self._stale_hits += 1
+			else:
+				self._hits += 1
+		if snapshot is not None:
+			return snapshot
+		return self._load()
+
+	def peek(self):
+		"""가져오기를 시도하지 않고 현재 스냅샷(또는 None) 반환"""
+		with self._lock:
+			return self._snapshot
+
+	def set(self, data, fetched_wall: datetime = None) -> Snapshot:
+		"""외부에서 만든 데이터로 스냅샷 교체"""
+		snapshot = Snapshot(data, fetched_wall)
+		with self._lock:
+			self._snapshot = snapshot
+		return snapshot
+
+	def load_persisted(self):
+		"""디스크에 저장된 마지막 정상 스냅샷을 (현재 스냅샷을 바꾸지 않고) 읽어 반환 (없으면 None)"""
+		if self._persistence is None:
+			return None
+		try:
+			stored = self._persistence.load()
+		except Exception as e:
+			self.last_persist_error = e
+			return None
+		if stored is None:
+			return None
+		data, fetched_wall = stored
+		return Snapshot(data, fetched_wall, restored=True)
+
+	def _restore_once(self):
+		with self._fetch_lock:
+			if self._restore_attempted:
+				return
+			self._restore_attempted = True
+			if self.peek() is not None:
+				return
+			snapshot = self.load_persisted()
+			if snapshot is not None:
+				with self._lock:
+					self._snapshot = snapshot
+
+	def _save(self, snapshot: Snapshot):
+		if self._persistence is None:
+			return
+		try:
+			self._persistence.save(snapshot.data, snapshot.fetched_wall)
+			self.last_persist_error = None
+		except Exception as e:
+			# 저장 실패는 화면 제공에 영향을 주지 않음
+			self.last_persist_error = e
+
+	def invalidate(self):
+		"""스냅샷을 버려 다음 get()이 새로 가져오도록 함 (진행 중인 백그라운드 갱신 결과도 반영하지 않음)"""
+		with self._lock:
+			self._snapshot = None
+			self._generation += 1
+
+	def is_refreshing(self) -> bool:
+		with self._lock:
+			return self._refreshing
+
+	def stats(self) -> dict:
+		"""azureai.cache.get_cache_stats()와 같은 형식의 통계 (오래된 스냅샷 반환도 적중으로 셈)"""
+		with self._lock:
+			hits = self._hits + self._stale_hits
+			lookups = hits + self._misses
+			return {
+				"name": self.name,
+				"scope": "shared",
+				"size": int(self._snapshot is not None),
+				"max_entries": 1,
+				"hits": hits,
+				"stale_hits": self._stale_hits,
+				"misses": self._misses,
+				"hit_rate": round(hits / lookups, 3) if lookups else None,
+				"loads": self._loads,
+				"avg_load_ms": round(self._load_seconds * 1000 / self._loads, 1) if self._loads else None,
+			}
+
+	def _timed(self, fn, *args):
+		start = time.perf_counter()
+		try:
+			return fn(*args)
+		finally:
+			with self._lock:
+				self._loads += 1
+				self._load_seconds += time.perf_counter() - start
+
+	def _load(self) -> Snapshot:
+		with self._fetch_lock:
+			# 기다리는 동안 다른 호출이 이미 가져왔으면 그 결과 사용
+			current = self.peek()
+			if current is not None:
+				return current
+			snapshot = self.set(self._timed(self._fetch))
+			self.last_error = None
+			self._save(snapshot)
+			return snapshot
+
+	def _refresh_in_background(self):
+		try:
+			with self._fetch_lock:
+				with self._lock:
+					previous, generation = self._snapshot, self._generation
+				with start_trace(f"{self.name}.refresh"):
+					if self._refresh is not None and previous is not None:
+						data = self._timed(self._refresh, previous.data)
+					else:
+						data = self._timed(self._fetch)
+				with self._lock:
+					# 갱신 중에 invalidate()되었으면 무효화 이전 데이터이므로 교체/저장하지 않음 (다음 get()이 새로 가져옴)
+					if self._generation != generation:
+						return
+					snapshot = Snapshot(data)
+					self._snapshot = snapshot
+				self.last_error = None
+				self._save(snapshot)
+		except Exception as e:
+			self.last_error = e
+			# 장애 중 매 요청마다 재시도하지 않도록 ttl 만큼 대기 후 다시 시도
+			with self._lock:
+				self._retry_after = time.monotonic() + self.ttl_seconds
+		finally:
+			with self._lock:
+				self._refreshing = False
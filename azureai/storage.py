@@ -0,0 +1,39 @@
+"""Azure Blob Storage container listing shared by the Streamlit pages and the HTTP API.
+Results are cached process-wide (azureai.cache) as immutable values and concurrent identical listings share one
+upstream call.
+"""
+
+from .cache import cached
+from .settings import get_credential
+from .shared import freeze
+from .singleflight import singleflight
+from .tracing import span
+
+# 컨테이너 목록 캐시 유지 시간 (초, 모든 세션이 공유)
+CONTAINERS_CACHE_TTL_SECONDS = 300
+
+
+@cached("blob.containers", ttl_seconds=CONTAINERS_CACHE_TTL_SECONDS, max_entries=8)
+@singleflight("blob.list_containers")
+def list_storage_containers(storage_account_name: str):
+	"""Blob Storage 계정의 컨테이너 목록을 조회하는 함수 (세션 간 공유 캐시 + 동시 호출 합치기 적용)"""
+	from azure.storage.blob import BlobServiceClient
+
+	# Storage Account URL 생성
+	account_url = f"https://{storage_account_name}.blob.core.windows.net"
+
+	# BlobServiceClient 생성 (공유 자격 증명 사용)
+	blob_service_client = BlobServiceClient(account_url=account_url, credential=get_credential())
+
+	containers = []
+	with span("blob.list_containers", account=storage_account_name) as current:
+		for container in blob_service_client.list_containers():
+			containers.append({
+				"name": container.name,
+				"last_modified": container.last_modified,
+				"metadata": container.metadata or {},
+				"public_access": container.public_access,
+			})
+		current.set_attribute("count", len(containers))
+	# 캐시된 목록을 모든 세션이 그대로 참조하므로 변경할 수 없는 형태로 반환
+	return freeze(containers)
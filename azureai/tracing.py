@@ -0,0 +1,233 @@
+"""Lightweight tracing for Azure SDK calls.
+Spans follow the OpenTelemetry data model (trace/span ids, parent id, start/end in unix nanoseconds, attributes,
+status) and are grouped into traces, one per Streamlit rerun (start_trace) or per standalone call. Finished spans
+go to the configured local exporters (in-memory ring for the debug waterfall, console log, JSONL file). When the
+opentelemetry API is installed, every span is mirrored to the globally configured OTel tracer as well.
+"""
+
+import json
+import time
+import logging
+import secrets
+import threading
+import contextvars
+import contextlib
+import functools
+from collections import deque
+
+from .settings import get_settings, TRACE_EXPORTERS
+
+logger = logging.getLogger(__name__)
+
+EXPORTER_MEMORY, EXPORTER_CONSOLE, EXPORTER_FILE = TRACE_EXPORTERS
+
+RECENT_TRACES = 50  # 메모리 내보내기에 보관할 최근 트레이스 수
+
+_current_span = contextvars.ContextVar("azureai_current_span", default=None)
+_recent_traces = deque(maxlen=RECENT_TRACES)
+_recent_lock = threading.Lock()
+_file_lock = threading.Lock()
+_otel_tracer = None
+_otel_resolved = False
+
+
+def _otel():
+	"""opentelemetry API가 설치되어 있으면 tracer 반환 (없으면 None, 한 번만 확인)"""
+	global _otel_tracer, _otel_resolved
+	if not _otel_resolved:
+		try:
+			from opentelemetry import trace as otel_trace
+			_otel_tracer = otel_trace.get_tracer("azureai")
+		except ImportError:
+			_otel_tracer = None
+		_otel_resolved = True
+	return _otel_tracer
+
+
+class Trace:
+	"""한 번의 rerun(또는 단독 호출)에 속한 span 묶음"""
+
+	def __init__(self, name: str):
+		self.name = name
+		self.trace_id = secrets.token_hex(16)
+		self.spans = []
+		self._lock = threading.Lock()
+
+	def add(self, span):
+		with self._lock:
+			self.spans.append(span)
+
+	def waterfall(self) -> list:
+		"""완료된 span을 시작 시각 순으로 정렬해 트레이스 시작 기준 오프셋(ms), 소요 시간(ms), 깊이와 함께 반환"""
+		with self._lock:
+			spans = [span for span in self.spans if span.end_ns is not None]
+		if not spans:
+			return []
+		origin = min(span.start_ns for span in spans)
+		depth_by_id = {}
+		rows = []
+		for span in sorted(spans, key=lambda s: s.start_ns):
+			depth = depth_by_id.get(span.parent_id, -1) + 1
+			depth_by_id[span.span_id] = depth
+			rows.append({
+				"name": span.name,
+				"offset_ms": round((span.start_ns - origin) / 1e6, 1),
+				"duration_ms": span.duration_ms,
+				"depth": depth,
+				"status": span.status,
+				"thread": span.thread,
+				"attributes": dict(span.attributes),
+			})
+		return rows
+
+
+class Span:
+	__slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error", "thread")
+
+	def __init__(self, trace: Trace, name: str, parent_id: str = None, attributes: dict = None):
+		self.trace = trace
+		self.name = name
+		self.span_id = secrets.token_hex(8)
+		self.parent_id = parent_id
+		self.start_ns = time.time_ns()
+		self.end_ns = None
+		self.attributes = dict(attributes or {})
+		self.status = "UNSET"
+		self.error = None
+		self.thread = threading.current_thread().name
+
+	def set_attribute(self, key: str, value):
+		self.attributes[key] = value
+
+	@property
+	def duration_ms(self):
+		return round((self.end_ns - self.start_ns) / 1e6, 1) if self.end_ns is not None else None
+
+	def to_dict(self) -> dict:
+		"""OTLP JSON과 같은 필드 이름의 dict"""
+		return {
+			"traceId": self.trace.trace_id,
+			"spanId": self.span_id,
+			"parentSpanId": self.parent_id or "",
+			"name": self.name,
+			"startTimeUnixNano": self.start_ns,
+			"endTimeUnixNano": self.end_ns,
+			"attributes": self.attributes,
+			"status": {"code": self.status, "message": self.error or ""},
+			"resource": {"trace.name": self.trace.name, "thread.name": self.thread},
+		}
+
+
+def _export(span: Span):
+	exporters = get_settings().trace_exporters
+	if EXPORTER_CONSOLE in exporters:
+		logger.info("span %s %.1f ms [%s] %s", span.name, span.duration_ms, span.status, span.attributes or "")
+	if EXPORTER_FILE in exporters:
+		line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+		try:
+			with _file_lock, open(get_settings().trace_file, "a", encoding="utf-8") as f:
+				f.write(line + "\n")
+		except OSError as e:
+			logger.warning("트레이스 파일 기록 실패: %s", e)
+
+
+def _remember(trace: Trace):
+	if EXPORTER_MEMORY in get_settings().trace_exporters:
+		with _recent_lock:
+			_recent_traces.append(trace)
+
+
+@contextlib.contextmanager
+def span(name: str, activate: bool = True, **attributes):
+	"""SDK 호출 하나를 감싸는 span (진행 중인 트레이스가 없으면 새 트레이스를 시작)
+	activate=False이면 현재 span으로 설정하지 않는다. yield를 사이에 둔 제너레이터 안처럼
+	다음 재개가 다른 컨텍스트(스레드)에서 일어날 수 있는 곳에서 사용한다.
+	"""
+	parent = _current_span.get()
+	if parent is None:
+		trace, parent_id = Trace(name), None
+	else:
+		trace, parent_id = parent.trace, parent.span_id
+	current = Span(trace, name, parent_id, attributes)
+	token = _current_span.set(current) if activate else None
+	tracer = _otel()
+	otel_cm = (tracer.start_as_current_span(name, attributes=_otel_attributes(attributes))
+		if tracer and activate else contextlib.nullcontext())
+	try:
+		with otel_cm:
+			yield current
+		current.status = "OK"
+	except GeneratorExit:
+		# 스트리밍 소비자가 중간에 멈춘 경우 (오류 아님)
+		current.status = "OK"
+		current.attributes["closed_early"] = True
+		raise
+	except Exception as e:
+		current.status = "ERROR"
+		current.error = f"{type(e).__name__}: {e}"
+		raise
+	finally:
+		current.end_ns = time.time_ns()
+		if token is not None:
+			_current_span.reset(token)
+		trace.add(current)
+		_export(current)
+		if parent is None:
+			_remember(trace)
+
+
+def _otel_attributes(attributes: dict) -> dict:
+	# OTel 속성 값은 str/bool/int/float만 허용
+	return {key: value if isinstance(value, (str, bool, int, float)) else str(value) for key, value in attributes.items()}
+
+
+@contextlib.contextmanager
+def start_trace(name: str, **attributes):
+	"""새 트레이스를 시작하고 루트 span 안에서 실행 (Streamlit rerun 한 번 = 트레이스 하나)
+	기존 span 안에서 호출해도 항상 새 트레이스가 된다. with 블록의 값은 Trace 객체이다.
+	"""
+	token = _current_span.set(None)
+	try:
+		with span(name, **attributes) as root:
+			yield root.trace
+	finally:
+		_current_span.reset(token)
+
+
+def traced(name: str = None, **attributes):
+	"""함수 호출 전체를 span으로 감싸는 데코레이터"""
+	def decorator(fn):
+		span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			with span(span_name, **attributes):
+				return fn(*args, **kwargs)
+		return wrapper
+	return decorator
+
+
+def propagate(fn):
+	"""호출 시점의 현재 span을 다른 스레드(ThreadPoolExecutor 등)에서도 부모로 쓰도록 감싼 함수 반환"""
+	parent = _current_span.get()
+
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		token = _current_span.set(parent)
+		try:
+			return fn(*args, **kwargs)
+		finally:
+			_current_span.reset(token)
+	return wrapper
+
+
+def current_trace():
+	"""현재 실행 중인 트레이스 (없으면 None)"""
+	current = _current_span.get()
+	return current.trace if current is not None else None
+
+
+def get_recent_traces() -> list:
+	"""메모리 내보내기에 보관된 최근 트레이스 (오래된 것부터)"""
+	with _recent_lock:
+		return list(_recent_traces)
@@ -0,0 +1,155 @@
+"""대시보드 정규화 마이크로 벤치마크
+
+행 단위 변환(이전 구현, 행마다 정규식 처리)과 modules.dashboard.normalize_dashboards(행 단위 루프 +
+이름 정리만 일괄 벡터 연산), 테이블 생성(행 단위 vs 벡터 연산)을 같은 합성 Resource Graph 결과로 비교한다.
+Azure 연결은 필요하지 않다.
+
+    python benchmarks/bench_dashboard_normalize.py --rows 100000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+import pandas as pd  # noqa: E402
+
+from azureai.snapshot import Snapshot  # noqa: E402
+from modules.dashboard import normalize_dashboards, generate_dashboard_url, _dashboard_frame  # noqa: E402
+
+TENANT_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def make_rows(count, seed=0):
+    """표시 이름 우선순위의 모든 경우가 섞인 합성 결과 행 생성"""
+    rng = random.Random(seed)
+    subscriptions = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(20)]
+    rows = []
+    for i in range(count):
+        kind = i % 4
+        name = f"team-{i % 97}-dashboard-{uuid.UUID(int=rng.getrandbits(128))}" if kind == 3 else f"dash_{i}"
+        rows.append({
+            'id': f"/subscriptions/{subscriptions[i % 20]}/resourceGroups/rg-{i % 50}/providers/Microsoft.Portal/dashboards/{name}",
+            'name': name,
+            'resourceGroup': f"rg-{i % 50}",
+            'location': 'koreacentral',
+            'subscriptionId': subscriptions[i % 20],
+            'tags': {'hidden-title': f"Hidden {i}"} if kind == 0 else {},
+            'hiddenTitle': f"Hidden {i}" if kind == 0 else '',
+            'modelTitle': f"Model {i}" if kind == 1 else '',
+            'propertiesDisplayName': f"Display {i}" if kind == 2 else '',
+            'created': '2025-01-01T00:00:00Z',
+            'modified': '2025-09-30T00:00:00Z' if i % 5 else '',
+        })
+    return rows, {sub_id: f"구독 {n}" for n, sub_id in enumerate(subscriptions)}
+
+
+def normalize_row_by_row(rows, subscription_names):
+    """이전 구현: 행마다 정규식을 다시 컴파일하고 dict를 하나씩 생성"""
+    result = []
+    for dashboard in rows:
+        import re
+        display_name = 'Unknown Dashboard'
+        if dashboard.get('hiddenTitle'):
+            display_name = dashboard['hiddenTitle']
+        elif dashboard.get('modelTitle'):
+            display_name = dashboard['modelTitle']
+        elif dashboard.get('propertiesDisplayName'):
+            display_name = dashboard['propertiesDisplayName']
+        else:
+            resource_name = dashboard.get('name', 'Unknown')
+            if resource_name and resource_name != 'Unknown':
+                cleaned_name = re.sub(r'-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', '', resource_name, flags=re.IGNORECASE)
+                cleaned_name = cleaned_name.replace('-', ' ').replace('_', ' ').title()
+                display_name = cleaned_name if cleaned_name.strip() else resource_name
+        subscription_id = dashboard.get('subscriptionId')
+        result.append({
+            'id': dashboard.get('id', ''),
+            'name': dashboard.get('name', 'Unknown'),
+            'displayName': display_name,
+            'resourceGroup': dashboard.get('resourceGroup', 'N/A'),
+            'location': dashboard.get('location', 'global'),
+            'subscriptionId': subscription_id,
+            'subscriptionName': subscription_names.get(subscription_id, subscription_id),
+            'tags': dashboard.get('tags') or {},
+            'isShared': True,
+            'created': dashboard.get('created') or 'N/A',
+            'modified': dashboard.get('modified') or 'N/A',
+        })
+    return result
+
+
+def build_table_row_by_row(dashboards, tenant_id):
+    """이전 구현: 재실행마다 대시보드별 URL과 행 dict를 만들어 DataFrame 생성"""
+    table_data = []
+    for dashboard in dashboards:
+        dashboard_url = generate_dashboard_url(dashboard['id'], tenant_id)
+        table_data.append({
+            'URL': dashboard_url if dashboard_url else "N/A",
+            '대시보드 이름': f"🚀 {dashboard['displayName']}" if dashboard_url else f"❌ {dashboard['displayName']}",
+            '리소스 그룹': dashboard['resourceGroup'],
+            '구독': dashboard.get('subscriptionName', 'N/A'),
+        })
+    return pd.DataFrame(table_data)
+
+
+def build_table_vectorized(snapshot, tenant_id):
+    _dashboard_frame.cache_clear()
+    return _dashboard_frame(snapshot, tenant_id)
+
+
+def best_of(fn, repeat):
+    """timeit과 같이 GC를 끄고 repeat회 중 최솟값(초) 반환"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows, subscription_names = make_rows(args.rows)
+    expected = normalize_row_by_row(rows, subscription_names)
+    actual = normalize_dashboards(rows, subscription_names)
+    if expected != actual:
+        mismatch = next(i for i, (a, b) in enumerate(zip(expected, actual)) if a != b)
+        raise SystemExit(f"결과 불일치 (행 {mismatch}): {expected[mismatch]} != {actual[mismatch]}")
+
+    snapshot = Snapshot({'dashboards': tuple(actual)})
+    expected_table = build_table_row_by_row(actual, TENANT_ID)
+    actual_table = build_table_vectorized(snapshot, TENANT_ID)
+    if expected_table.astype(object).values.tolist() != actual_table.astype(object).values.tolist():
+        raise SystemExit("테이블 결과 불일치")
+
+    results = [
+        ("normalize", "row-by-row", best_of(lambda: normalize_row_by_row(rows, subscription_names), args.repeat)),
+        ("normalize", "batched names", best_of(lambda: normalize_dashboards(rows, subscription_names), args.repeat)),
+        ("table", "row-by-row", best_of(lambda: build_table_row_by_row(actual, TENANT_ID), args.repeat)),
+        ("table", "vectorized", best_of(lambda: build_table_vectorized(snapshot, TENANT_ID), args.repeat)),
+        ("table", "memoized rerun", best_of(lambda: _dashboard_frame(snapshot, TENANT_ID), args.repeat)),
+    ]
+    print(f"rows={args.rows:,} repeat={args.repeat}")
+    baselines = {stage: seconds for stage, variant, seconds in results if variant == "row-by-row"}
+    for stage, variant, seconds in results:
+        print(f"{stage:<10} {variant:<15} {seconds * 1000:9.2f} ms ({baselines[stage] / seconds:8.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""동시 세션 부하 테스트 / 세션당 메모리 측정
+
+Azure 호출을 bench_startup의 스텁(실제와 같은 공유 캐시/동시 호출 합치기, 호출마다 --latency-ms 지연)으로 바꾼
+로컬 Streamlit 서버(= 복제본 하나)를 띄우고, 웹소켓 클라이언트 N개가 브라우저처럼 위젯 상태를 보내며
+대시보드 → 공지사항 → AI 질문(컨테이너 선택, 질문하기) 순서로 페이지를 조작한다.
+fragment 안의 위젯은 브라우저와 같이 해당 fragment만 다시 실행하도록 요청한다.
+
+처리량, 페이지 조작별 지연시간(p50/p90/p99/최대), 세션을 모두 연결해 둔 상태의 서버 RSS 증가량(세션당)을 보고한다.
+
+    python benchmarks/bench_sessions.py --sessions 50 --concurrency 10 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from bench_startup import _child_env, _install_stubs, _git_commit, append_history
+
+DEFAULT_HISTORY_FILE = Path(__file__).resolve().parent / "results" / "sessions_history.jsonl"
+
+PAGE_LABEL = "메뉴를 선택하세요"
+CONTAINER_LABEL = "질문할 내용과 관련된 컨테이너를 선택하세요"
+QUESTION_LABEL = "질문을 입력하세요"
+ASK_LABEL = "질문하기"
+
+
+# --- 서버 ------------------------------------------------------------------------
+
+def serve(port, dashboard_count, latency_ms):
+    """(하위 프로세스) 스텁을 설치하고 app.py를 Streamlit 서버로 실행"""
+    _install_stubs(dashboard_count, latency_ms=latency_ms)
+    from streamlit.web import bootstrap
+
+    flag_options = {
+        "server.port": port,
+        "server.headless": True,
+        "browser.gatherUsageStats": False,
+        "server.fileWatcherType": "none",
+    }
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(str(BASE_DIR / "app.py"), False, [], flag_options)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_healthy(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Streamlit 서버가 시작 중 종료되었습니다 (코드 {process.returncode}).")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"Streamlit 서버가 {timeout}초 안에 준비되지 않았습니다.")
+
+
+def process_rss_mb(pid):
+    """프로세스 RSS (MB) - /proc이 없는 환경에서는 None"""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# --- 웹소켓 세션 -------------------------------------------------------------------
+
+class _Session:
+    """브라우저 대신 위젯 상태를 보내고 rerun이 끝날 때까지 화면 변경(ForwardMsg)을 받는 최소 클라이언트"""
+
+    def __init__(self, websocket, timeout):
+        self.websocket = websocket
+        self.timeout = timeout
+        self.widgets = {}  # (요소 종류, 레이블) → (위젯 id, 선택지, fragment id)
+        self.states = {}  # 위젯 id → 다음 rerun에도 보낼 WidgetState
+
+    def options(self, kind, label):
+        return self._widget(kind, label)[1]
+
+    def _widget(self, kind, label):
+        try:
+            return self.widgets[(kind, label)]
+        except KeyError:
+            raise LookupError(f"화면에 {kind} '{label}'이(가) 없습니다.") from None
+
+    async def interact(self, values=None, click=None):
+        """위젯 값을 바꾸거나 버튼을 누르고 rerun이 끝날 때까지 대기 (오류 메시지 목록 반환)
+        바꾼 위젯이 모두 같은 fragment 안에 있으면 그 fragment만 다시 실행한다.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        fragment_ids = set()
+        for (kind, label), value in (values or {}).items():
+            widget_id, _, fragment_id = self._widget(kind, label)
+            self.states[widget_id] = WidgetState(id=widget_id, string_value=value)
+            fragment_ids.add(fragment_id)
+
+        message = BackMsg()
+        rerun = message.rerun_script
+        rerun.query_string = ""
+        rerun.widget_states.widgets.extend(self.states.values())
+        if click is not None:
+            widget_id, _, fragment_id = self._widget(*click)
+            rerun.widget_states.widgets.append(WidgetState(id=widget_id, trigger_value=True))
+            fragment_ids.add(fragment_id)
+        if len(fragment_ids) == 1:
+            rerun.fragment_id = fragment_ids.pop()
+
+        await self.websocket.send(message.SerializeToString())
+        return await asyncio.wait_for(self._receive(), self.timeout)
+
+    async def _receive(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        errors = []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                # 전체 rerun 시작 - 화면을 새로 그리므로 위젯 목록을 비움
+                self.widgets = {}
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+                    continue
+                widget = getattr(element, element_type)
+                widget_id = getattr(widget, "id", "")
+                if widget_id and hasattr(widget, "label"):
+                    options = list(widget.options) if hasattr(widget, "options") else []
+                    self.widgets[(element_type, widget.label)] = (widget_id, options, message.delta.fragment_id)
+            elif kind == "script_finished":
+                if message.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue  # st.rerun() - 이어지는 실행까지 기다림
+                if message.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("스크립트 컴파일 오류")
+                if message.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    # 전체 rerun 뒤 화면에서 사라진 위젯의 상태는 더 보내지 않음
+                    current = {widget_id for widget_id, _, _ in self.widgets.values()}
+                    self.states = {key: state for key, state in self.states.items() if key in current}
+                return errors
+
+
+def _select_container(session, session_number):
+    containers = session.options("selectbox", CONTAINER_LABEL)[1:]  # 첫 선택지는 일반 질문
+    if not containers:
+        raise LookupError("스텁 컨테이너 목록이 비어 있습니다.")
+    return session.interact(values={("selectbox", CONTAINER_LABEL): containers[session_number % len(containers)]})
+
+
+def scenario(questions):
+    """(조작 이름, 함수(세션, 세션 번호) → awaitable) 목록 - 세션 하나가 차례로 수행"""
+    steps = [
+        ("dashboard:open", lambda session, n: session.interact()),
+        ("notice:open", lambda session, n: session.interact(values={("radio", PAGE_LABEL): "공지사항"})),
+        ("chat:open", lambda session, n: session.interact(values={("radio", PAGE_LABEL): "AI에게 질문하기"})),
+        ("chat:select_container", _select_container),
+    ]
+    for i in range(questions):
+        steps.append(("chat:ask", lambda session, n, i=i: session.interact(
+            values={("text_area", QUESTION_LABEL): f"세션 {n} 질문 {i + 1}: 배포 방법을 알려주세요"},
+            click=("button", ASK_LABEL),
+        )))
+    return steps
+
+
+async def run_session(url, session_number, steps, timeout, connections):
+    """세션 하나를 연결해 시나리오를 실행하고 [(조작, ms, 오류)] 반환 (연결은 connections에 남겨 둠)"""
+    from websockets.asyncio.client import connect
+
+    websocket = await connect(url, subprotocols=["streamlit"], max_size=None)
+    connections.append(websocket)
+    session = _Session(websocket, timeout)
+    timings = []
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            error = "; ".join(await step(session, session_number)) or None
+        except asyncio.TimeoutError:
+            error = f"{timeout}초 안에 rerun이 끝나지 않음"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        timings.append((name, round((time.perf_counter() - start) * 1000, 1), error))
+        if error:
+            break  # 이후 조작은 화면 상태가 달라 의미가 없음
+    return timings
+
+
+async def run_load(url, pid, sessions, concurrency, questions, timeout, settle_seconds=1.0):
+    from azureai.batch import percentile
+
+    steps = scenario(questions)
+    connections = []
+    try:
+        # 워밍업: import, 공유 캐시/스냅샷을 채운 세션 하나를 연결해 둔 상태의 RSS를 기준으로 삼는다
+        warmup = await run_session(url, -1, steps, timeout, connections)
+        warmup_errors = [error for _, _, error in warmup if error]
+        if warmup_errors:
+            raise SystemExit(f"워밍업 세션 실패: {warmup_errors[0]}")
+        await asyncio.sleep(settle_seconds)
+        baseline_rss = process_rss_mb(pid)
+        peak_rss = baseline_rss
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(session_number):
+            async with semaphore:
+                return await run_session(url, session_number, steps, timeout, connections)
+
+        async def sample_rss():
+            nonlocal peak_rss
+            while True:
+                await asyncio.sleep(0.2)
+                rss = process_rss_mb(pid)
+                if rss is not None:
+                    peak_rss = max(peak_rss, rss)
+
+        sampler = asyncio.create_task(sample_rss())
+        wall_start = time.perf_counter()
+        results = await asyncio.gather(*(limited(n) for n in range(sessions)))
+        wall_seconds = time.perf_counter() - wall_start
+        sampler.cancel()
+        await asyncio.sleep(settle_seconds)
+        final_rss = process_rss_mb(pid)
+    finally:
+        for websocket in connections:
+            await websocket.close()
+
+    by_action = {}
+    errors = []
+    for timings in results:
+        for name, elapsed_ms, error in timings:
+            by_action.setdefault(name, []).append(elapsed_ms)
+            if error:
+                errors.append({"action": name, "error": error})
+
+    actions = sum(len(samples) for samples in by_action.values())
+    latency = {}
+    for name, samples in by_action.items():
+        samples.sort()
+        latency[name] = {
+            "count": len(samples),
+            "p50": percentile(samples, 50),
+            "p90": percentile(samples, 90),
+            "p99": percentile(samples, 99),
+            "max": samples[-1],
+        }
+    measured = baseline_rss is not None and final_rss is not None
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall_seconds, 2),
+        "sessions_per_second": round(sessions / wall_seconds, 2) if wall_seconds > 0 else None,
+        "actions_per_second": round(actions / wall_seconds, 2) if wall_seconds > 0 else None,
+        "latency_ms": latency,
+        "errors": errors,
+        "rss_mb": {
+            "baseline": round(baseline_rss, 1) if measured else None,
+            "peak": round(max(peak_rss, final_rss), 1) if measured else None,
+            "final": round(final_rss, 1) if measured else None,
+            "per_session": round((final_rss - baseline_rss) / sessions, 2) if measured else None,
+        },
+    }
+
+
+# --- 실행 / 보고 -------------------------------------------------------------------
+
+def format_report(result):
+    lines = [
+        f"세션 {result['sessions']}개, 동시 실행 {result['concurrency']}, 전체 {result['wall_seconds']}초",
+        f"처리량 {result['sessions_per_second']} 세션/초 | {result['actions_per_second']} 조작/초",
+        "조작별 지연시간 (ms)",
+    ]
+    for name, values in result["latency_ms"].items():
+        lines.append(
+            f"  {name:<24} {values['count']:4d}회 | p50 {values['p50']:8.1f} | p90 {values['p90']:8.1f}"
+            f" | p99 {values['p99']:8.1f} | 최대 {values['max']:8.1f}"
+        )
+    rss = result["rss_mb"]
+    if rss["baseline"] is None:
+        lines.append("서버 RSS: 측정 불가 (/proc 없음)")
+    else:
+        lines.append(
+            f"서버 RSS 기준 {rss['baseline']} MB → 최대 {rss['peak']} MB → 종료 {rss['final']} MB"
+            f" (세션당 약 {rss['per_session']} MB)"
+        )
+    if result["errors"]:
+        first = result["errors"][0]
+        lines.append(f"⚠️ 오류 {len(result['errors'])}건 (첫 오류: {first['action']} - {first['error']})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="시뮬레이션할 세션 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 조작하는 세션 수")
+    parser.add_argument("--questions", type=int, default=1, help="세션마다 보낼 질문 수")
+    parser.add_argument("--latency-ms", type=float, default=100, help="스텁 Azure 호출 하나의 지연시간")
+    parser.add_argument("--dashboards", type=int, default=500, help="스텁 Resource Graph가 반환할 대시보드 수")
+    parser.add_argument("--timeout", type=float, default=120, help="조작 하나(rerun 완료까지)의 제한 시간(초)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_FILE)
+    parser.add_argument("--no-record", action="store_true", help="기록 파일에 결과를 추가하지 않음")
+    parser.add_argument("--json", action="store_true", help="보고서 대신 결과를 JSON으로 출력")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.dashboards, args.latency_ms)
+        return
+    if args.sessions < 1 or args.concurrency < 1:
+        parser.error("--sessions와 --concurrency는 1 이상이어야 합니다.")
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        raise SystemExit("웹소켓 클라이언트가 필요합니다: pip install websockets")
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(port),
+             "--dashboards", str(args.dashboards), "--latency-ms", str(args.latency_ms)],
+            cwd=BASE_DIR, env=_child_env(snapshot_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_until_healthy(port, server)
+            result = asyncio.run(run_load(
+                f"ws://127.0.0.1:{port}/_stcore/stream", server.pid,
+                args.sessions, args.concurrency, args.questions, args.timeout
+            ))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "latency_ms_stub": args.latency_ms,
+        "dashboards": args.dashboards,
+        **result,
+    }
+    if not args.no_record:
+        append_history(args.history, record)
+    print(json.dumps(record, ensure_ascii=False) if args.json else format_report(result))
+    if result["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""import 시간 / 첫 화면 렌더링 벤치마크
+
+1) python -X importtime 으로 app.py 시작 import, azureai.aisearch, 각 페이지 모듈(modules.router.PAGES)의
+   누적 import 시간을 새 프로세스에서 측정한다.
+2) Streamlit AppTest로 페이지마다 새 프로세스에서 첫 렌더링 시간을 측정한다.
+   Azure 클라이언트는 스텁으로 대체하므로 네트워크나 인증 정보가 필요하지 않다.
+
+결과는 기록 파일(JSONL)에 누적되며, startup_thresholds.json의 한도나
+최근 기록 중앙값 대비 회귀 비율을 넘으면 종료 코드 1로 알린다.
+
+    python benchmarks/bench_startup.py --repeat 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+THRESHOLDS_FILE = Path(__file__).resolve().parent / "startup_thresholds.json"
+DEFAULT_HISTORY_FILE = Path(__file__).resolve().parent / "results" / "startup_history.jsonl"
+
+# app.py가 시작 시 import 하는 모듈 (페이지 모듈은 modules.router가 선택 시 import)
+APP_STARTUP_IMPORTS = ("streamlit", "modules.router")
+
+
+def _child_env(snapshot_dir):
+    """벤치마크 하위 프로세스 환경 - 더미 인증 정보와 임시 스냅샷 경로 사용"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(BASE_DIR),
+        "AZURE_CLIENT_ID": "benchmark-client",
+        "AZURE_CLIENT_SECRET": "benchmark-secret",
+        "AZURE_TENANT_ID": "00000000-0000-0000-0000-000000000000",
+        "AZURE_STORAGE_ACCOUNT_NAME": "benchmark",
+        "DASHBOARD_SNAPSHOT_PATH": str(Path(snapshot_dir) / "dashboard_snapshot.sqlite"),
+    })
+    return env
+
+
+# --- import 시간 -----------------------------------------------------------------
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → {모듈 이름: 누적 시간(ms)} (가장 바깥 수준 import만)"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue
+        totals[name.strip()] = totals.get(name.strip(), 0) + int(cumulative) / 1000
+    return totals
+
+
+def measure_importtime(modules, env):
+    """새 프로세스에서 modules를 차례로 import 하고 {모듈: 누적 ms} 반환
+    앞선 모듈이 이미 불러온 의존성은 뒤 모듈의 시간에 포함되지 않는다.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    totals = parse_importtime(result.stderr)
+    return {module: round(totals.get(module, 0.0), 1) for module in modules}
+
+
+def import_targets():
+    """측정 대상: (이름, 먼저 import 할 모듈들, 측정 모듈)"""
+    from modules.router import PAGES
+
+    targets = [("app.py", (), None)]
+    targets.append(("azureai.aisearch", ("streamlit",), "azureai.aisearch"))
+    for module_name, _ in PAGES.values():
+        targets.append((module_name, ("streamlit",), module_name))
+    return targets
+
+
+def run_importtime(repeat, env):
+    results = {}
+    for name, preload, module in import_targets():
+        samples = []
+        for _ in range(repeat):
+            if module is None:
+                samples.append(sum(measure_importtime(APP_STARTUP_IMPORTS, env).values()))
+            else:
+                samples.append(measure_importtime(preload + (module,), env)[module])
+        results[name] = round(statistics.median(samples), 1)
+    return results
+
+
+# --- 첫 렌더링 ---------------------------------------------------------------------
+
+class _FakeGraphClient:
+    """Resource Graph 클라이언트 스텁 - 합성 대시보드 행을 한 페이지로 반환"""
+
+    def __init__(self, rows, latency_ms=0):
+        self.rows = rows
+        self.latency_ms = latency_ms
+
+    def resources(self, request):
+        from types import SimpleNamespace
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return SimpleNamespace(data=list(self.rows), skip_token=None)
+
+
+def _install_stubs(dashboard_count, latency_ms=0):
+    """페이지 모듈이 import 되는 시점에 Azure 호출 함수를 스텁으로 교체하는 import 훅 설치
+    모듈을 미리 import 하지 않으므로 import 비용은 그대로 렌더링 시간에 포함된다.
+    목록 스텁은 실제 함수와 같은 이름의 공유 캐시/동시 호출 합치기를 거치며, 업스트림 호출마다 latency_ms만큼 지연된다.
+    """
+    import importlib.abc
+    import importlib.machinery
+
+    subscription_id = "00000000-0000-0000-0000-000000000001"
+    rows = [
+        {
+            "id": f"/subscriptions/{subscription_id}/resourceGroups/rg-{i % 20}/providers/Microsoft.Portal/dashboards/dash-{i}",
+            "name": f"dash-{i}",
+            "resourceGroup": f"rg-{i % 20}",
+            "location": "koreacentral",
+            "subscriptionId": subscription_id,
+            "tags": {"env": "prod" if i % 2 else "dev"},
+            "hiddenTitle": f"Dashboard {i}" if i % 3 else "",
+            "modelTitle": "",
+            "propertiesDisplayName": "",
+            "created": "2025-01-01T00:00:00Z",
+            "modified": "2025-09-30T00:00:00Z",
+        }
+        for i in range(dashboard_count)
+    ]
+
+    def backend(cache_name, fn, **cache_options):
+        """지연을 흉내 낸 스텁을 실제 목록 함수처럼 공유 캐시 + 동시 호출 합치기로 감쌈"""
+        from azureai.cache import cached
+        from azureai.singleflight import singleflight
+
+        def slow(*args):
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            return fn(*args)
+        slow.__name__ = fn.__name__
+        return cached(cache_name, **cache_options)(singleflight(f"stub.{cache_name}")(slow))
+
+    def fake_containers(storage_account_name):
+        from azureai.shared import freeze
+        return freeze([
+            {"name": f"container-{i}", "last_modified": None, "metadata": {}, "public_access": None}
+            for i in range(5)
+        ])
+
+    def fake_container_indexes(container_name):
+        return [{
+            "name": f"{container_name}-index",
+            "data_source": f"{container_name}-datasource",
+            "indexer": f"{container_name}-indexer",
+            "fields_count": 8,
+        }]
+
+    def fake_ask(query, container_name=None, search_index=None, retrieval_mode=None):
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return {
+            "content": f"'{query}'에 대한 스텁 답변입니다.",
+            "citations": [],
+            "index_used": search_index if search_index and search_index != "NO_INDEX" else "미사용",
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def patch_dashboard(module):
+        module.get_resource_graph_clients = lambda: (_FakeGraphClient(rows, latency_ms), {subscription_id: "벤치마크 구독"})
+
+    def patch_ai_chat(module):
+        module._list_storage_containers = backend("blob.containers", fake_containers, ttl_seconds=300, max_entries=8)
+
+    def patch_aisearch(module):
+        module.get_indexed_containers = backend("search.indexed_containers", lambda: [], max_entries=1)
+        module.get_available_search_indexes = backend("search.indexes", lambda: [], max_entries=1)
+        module.get_indexes_for_container = backend("search.container_indexes", fake_container_indexes, max_entries=64)
+        module.ask_question_with_container = fake_ask
+
+    patches = {
+        "modules.dashboard": patch_dashboard,
+        "modules.ai_chat": patch_ai_chat,
+        "azureai.aisearch": patch_aisearch,
+    }
+
+    class _PatchingLoader(importlib.abc.Loader):
+        def __init__(self, loader, patch):
+            self.loader = loader
+            self.patch = patch
+
+        def create_module(self, spec):
+            return self.loader.create_module(spec)
+
+        def exec_module(self, module):
+            self.loader.exec_module(module)
+            self.patch(module)
+
+    class _PatchingFinder(importlib.abc.MetaPathFinder):
+        def find_spec(self, fullname, path, target=None):
+            if fullname not in patches:
+                return None
+            spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+            if spec is not None:
+                spec.loader = _PatchingLoader(spec.loader, patches[fullname])
+            return spec
+
+    sys.meta_path.insert(0, _PatchingFinder())
+
+
+def render_page_once(page, dashboard_count):
+    """(하위 프로세스) 스텁을 설치하고 AppTest로 page를 한 번 렌더링한 결과를 JSON으로 출력"""
+    _install_stubs(dashboard_count)
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(BASE_DIR / "app.py"), default_timeout=120)
+    app.session_state["page"] = page
+    start = time.perf_counter()
+    app.run()
+    render_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({
+        "render_ms": round(render_ms, 1),
+        "exception": [str(exception.value) for exception in app.exception],
+    }))
+
+
+def run_first_render(repeat, env, dashboard_count):
+    from modules.router import PAGES
+
+    results = {}
+    for page in PAGES:
+        render_samples = []
+        process_samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, __file__, "--render-page", page, "--dashboards", str(dashboard_count)],
+                cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+            )
+            process_samples.append((time.perf_counter() - start) * 1000)
+            output = json.loads(completed.stdout.strip().splitlines()[-1])
+            if output["exception"]:
+                raise SystemExit(f"'{page}' 렌더링 중 예외: {output['exception']}")
+            render_samples.append(output["render_ms"])
+        results[page] = {
+            "render_ms": round(statistics.median(render_samples), 1),
+            "process_ms": round(statistics.median(process_samples), 1),
+        }
+    return results
+
+
+# --- 기록 / 한도 -------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(history_file):
+    if not history_file.exists():
+        return []
+    with open(history_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(history_file, record):
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _flatten(record):
+    """기록 → {지표 이름: ms}"""
+    metrics = {f"importtime:{name}": value for name, value in record.get("importtime_ms", {}).items()}
+    for page, values in record.get("first_render", {}).items():
+        for key, value in values.items():
+            metrics[f"first_render:{page}:{key}"] = value
+    return metrics
+
+
+def check_regressions(record, history, thresholds):
+    """한도 초과와 최근 기록 중앙값 대비 회귀를 (지표, 값, 기준, 사유) 목록으로 반환"""
+    flags = []
+    current = _flatten(record)
+
+    limits = {f"importtime:{name}": value for name, value in thresholds.get("importtime_ms", {}).items()}
+    for page, value in thresholds.get("first_render_ms", {}).items():
+        limits[f"first_render:{page}:render_ms"] = value
+    for metric, limit in limits.items():
+        if metric in current and current[metric] > limit:
+            flags.append((metric, current[metric], limit, "한도 초과"))
+
+    window = thresholds.get("baseline_window", 5)
+    ratio = thresholds.get("regression_ratio", 1.25)
+    # 잡음이 큰 아주 짧은 지표는 비율 비교에서 제외
+    min_ms = thresholds.get("regression_min_ms", 20)
+    previous = [_flatten(entry) for entry in history[-window:]]
+    for metric, value in current.items():
+        samples = [entry[metric] for entry in previous if metric in entry]
+        if not samples:
+            continue
+        baseline = statistics.median(samples)
+        if value >= min_ms and value > baseline * ratio:
+            flags.append((metric, value, round(baseline * ratio, 1), f"최근 {len(samples)}회 중앙값 대비 회귀"))
+    return flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dashboards", type=int, default=500, help="스텁 Resource Graph가 반환할 대시보드 수")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_FILE)
+    parser.add_argument("--no-record", action="store_true", help="기록 파일에 결과를 추가하지 않음")
+    parser.add_argument("--skip-render", action="store_true", help="import 시간만 측정")
+    parser.add_argument("--render-page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render_page:
+        render_page_once(args.render_page, args.dashboards)
+        return
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        env = _child_env(snapshot_dir)
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+            "importtime_ms": run_importtime(args.repeat, env),
+        }
+        if not args.skip_render:
+            record["dashboards"] = args.dashboards
+            record["first_render"] = run_first_render(args.repeat, env, args.dashboards)
+
+    print("import 시간 (누적, 중앙값)")
+    for name, value in record["importtime_ms"].items():
+        print(f"  {name:<28} {value:9.1f} ms")
+    if "first_render" in record:
+        print(f"첫 렌더링 (AppTest, 스텁 대시보드 {args.dashboards}개, 중앙값)")
+        for page, values in record["first_render"].items():
+            print(f"  {page:<28} 렌더링 {values['render_ms']:9.1f} ms | 프로세스 전체 {values['process_ms']:9.1f} ms")
+
+    with open(THRESHOLDS_FILE, "r", encoding="utf-8") as f:
+        thresholds = json.load(f)
+    flags = check_regressions(record, load_history(args.history), thresholds)
+    if not args.no_record:
+        append_history(args.history, record)
+
+    if flags:
+        print("⚠️ 회귀 감지")
+        for metric, value, limit, reason in flags:
+            print(f"  {metric}: {value:.1f} ms > {limit:.1f} ms ({reason})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
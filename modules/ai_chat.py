@@ -1,31 +1,26 @@
 import streamlit as st
 import time
-import os
 import sys
+import functools
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
 
 # 프로젝트 루트 디렉토리를 sys.path에 추가 
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(BASE_DIR))
 
-# .env 파일 로드
-env_path = BASE_DIR / '.env'
-load_dotenv(env_path)
+from azureai.settings import get_settings
+from modules.trace_view import traced_fragment
+from azureai.storage import list_storage_containers as _list_storage_containers
 
 def get_azure_storage_containers():
     """Azure Storage 계정의 컨테이너 목록을 가져오는 함수"""
     try:
-        from azure.identity import ClientSecretCredential
-        from azure.storage.blob import BlobServiceClient
+        # 프로세스 시작 시 한 번 읽은 설정 사용
+        settings = get_settings()
+        storage_account_name = settings.storage_account_name
         
-        # 환경 변수에서 인증 정보 읽기
-        client_id = os.getenv('AZURE_CLIENT_ID')
-        client_secret = os.getenv('AZURE_CLIENT_SECRET') 
-        tenant_id = os.getenv('AZURE_TENANT_ID')
-        storage_account_name = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
-        
-        if not all([client_id, client_secret, tenant_id]):
+        if not settings.has_service_principal:
             st.warning("⚠️ Azure 인증 정보가 .env 파일에 없습니다.")
             return None
             
@@ -34,47 +29,8 @@ def get_azure_storage_containers():
             st.info("💡 .env 파일에 다음 항목을 추가해주세요: `AZURE_STORAGE_ACCOUNT_NAME=your-storage-account-name`")
             return None
             
-        # 캐시 확인 (5분간 유효)
-        cache_key = "storage_containers_cache"
-        time_key = "containers_fetch_time"
-        
-        if cache_key in st.session_state and time_key in st.session_state:
-            if (time.time() - st.session_state[time_key]) < 300:  # 5분
-                return st.session_state[cache_key]
-        
-        # Azure 인증
-        credential = ClientSecretCredential(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            client_secret=client_secret
-        )
-        
-        # Storage Account URL 생성
-        account_url = f"https://{storage_account_name}.blob.core.windows.net"
-        
-        # BlobServiceClient 생성
-        blob_service_client = BlobServiceClient(
-            account_url=account_url, 
-            credential=credential
-        )
-        
-        # 컨테이너 목록 가져오기
-        containers = []
-        container_list = blob_service_client.list_containers()
-        
-        for container in container_list:
-            containers.append({
-                'name': container.name,
-                'last_modified': container.last_modified,
-                'metadata': container.metadata or {},
-                'public_access': container.public_access
-            })
-        
-        # 캐시 저장
-        st.session_state[cache_key] = containers
-        st.session_state[time_key] = time.time()
-        
-        return containers
+        # 5분간 모든 세션이 공유하는 캐시 사용, 동시 세션의 동일한 목록 요청은 하나의 업스트림 호출로 합쳐짐
+        return _list_storage_containers(storage_account_name)
         
     except ImportError as e:
         st.error(f"❌ Azure Storage SDK가 설치되지 않았습니다: {str(e)}")
@@ -83,8 +39,141 @@ def get_azure_storage_containers():
         st.error(f"❌ Azure Storage 연결 실패: {str(e)}")
         return None
 
+def _render_index_comparison(comparison):
+    """인덱스별 답변 비교 결과를 나란히 표시하는 함수"""
+    runs = comparison.get("runs", [])
+    if not runs:
+        return
+
+    st.subheader("🆚 인덱스별 답변 비교")
+    slowest_ms = max(run["latency_ms"] for run in runs)
+    st.caption(
+        f"질문: {comparison['query'][:80]} | 전체 소요: {comparison['wall_ms']:.0f} ms "
+        f"(가장 느린 단일 호출: {slowest_ms:.0f} ms)"
+    )
+
+    # 한 줄에 최대 3개씩 배치
+    columns_per_row = 3
+    for row_start in range(0, len(runs), columns_per_row):
+        row_runs = runs[row_start:row_start + columns_per_row]
+        columns = st.columns(len(row_runs))
+        for column, run in zip(columns, row_runs):
+            with column:
+                title = "💬 인덱스 미사용" if run["search_index"] == "NO_INDEX" else f"📊 {run['search_index']}"
+                st.markdown(f"**{title}**")
+                if run["error"]:
+                    st.error(f"❌ {run['error']}")
+                    st.caption(f"⏱️ {run['latency_ms']:.0f} ms")
+                    continue
+
+                result = run["result"]
+                usage = result.get("usage") or {}
+                st.caption(
+                    f"⏱️ {run['latency_ms']:.0f} ms | 🔢 토큰 {usage.get('total_tokens', 0)} "
+                    f"(입력 {usage.get('prompt_tokens', 0)} / 출력 {usage.get('completion_tokens', 0)})"
+                )
+                st.markdown(result["content"] or "")
+
+                citations = result.get("citations", [])
+                if citations:
+                    with st.expander(f"🔗 출처 {len(citations)}건"):
+                        for cite in citations:
+                            if isinstance(cite, dict):
+                                title = cite.get('title', cite.get('id', '제목 없음'))
+                                url = cite.get('url', cite.get('filepath', ''))
+                                st.write(f"- [{title}]({url})" if url else f"- {title}")
+                            else:
+                                st.write(f"- {cite}")
+
+GENERAL_STORAGE_OPTION = "기본 Storage (일반 질문)"
+NO_INDEX_OPTION = "미선택 (일반 OpenAI 질문)"
+# 검색 방식 라디오 라벨 → azureai.settings.RETRIEVAL_MODES 값
+RETRIEVAL_MODE_OPTIONS = {"On Your Data 확장": "extension", "직접 검색 (SearchClient)": "client"}
+
+def _memoize_last(fn):
+    """마지막 호출과 같은 객체(공유 캐시가 돌려준 동일 목록)로 다시 호출되면 이전 결과를 재사용하는 데코레이터
+    반환값은 세션 간에 공유되므로 변경하지 않는 튜플/읽기 전용 값이어야 한다.
+    """
+    lock = threading.Lock()
+    last = [None]  # (인자 튜플, 결과) - 인자를 붙잡아 두어 id가 재사용되지 않도록 함
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        with lock:
+            entry = last[0]
+        if entry is not None and len(entry[0]) == len(args) and all(a is b for a, b in zip(entry[0], args)):
+            return entry[1]
+        result = fn(*args)
+        with lock:
+            last[0] = (args, result)
+        return result
+    return wrapper
+
+def _is_indexed(container_name, indexed_containers):
+    return any(
+        indexed_container in container_name.lower() or container_name.lower() in indexed_container
+        for indexed_container in indexed_containers
+    )
+
+@_memoize_last
+def _container_options(containers, indexed_containers):
+    """컨테이너 목록 → (선택지 튜플, 인덱스된 컨테이너 수)"""
+    container_options = [GENERAL_STORAGE_OPTION]
+    indexed_count = 0
+    for container in containers:
+        container_name = container['name']
+        container_info = f"{container_name}"
+        
+        # 인덱스 상태 표시 (인덱스된 컨테이너에 🔍 표시)
+        if _is_indexed(container_name, indexed_containers):
+            container_info += " 🔍"  # 인덱스된 컨테이너 표시
+            indexed_count += 1
+        
+        if container['metadata']:
+            # 메타데이터가 있으면 설명 추가
+            description = container['metadata'].get('description', '')
+            if description:
+                container_info += f" ({description})"
+        
+        container_options.append(container_info)
+    return tuple(container_options), indexed_count
+
+@_memoize_last
+def _index_options(available_indexes):
+    """인덱스 목록 → (선택지 튜플, 선택지 → 인덱스 정보)"""
+    index_options = [NO_INDEX_OPTION]
+    index_details = {}
+    
+    for idx in available_indexes:
+        option_text = f"{idx['name']}"
+        
+        # 데이터소스-인덱서 정보가 있으면 표시
+        if idx.get('data_source') and idx.get('indexer'):
+            option_text += f" (데이터소스: {idx['data_source']}, 인덱서: {idx['indexer']})"
+        elif idx.get('description'):
+            option_text += f" - {idx['description']}"
+        
+        if idx.get('fields_count', 0) > 0:
+            option_text += f" [{idx['fields_count']}개 필드]"
+        
+        index_options.append(option_text)
+        index_details[option_text] = idx
+    return tuple(index_options), index_details
+
+def _get_chat_target():
+    """컨테이너/인덱스 선택 fragment가 기록한 현재 질문 대상"""
+    return st.session_state.get("chat_target") or {
+        "storage": GENERAL_STORAGE_OPTION, "container_name": None, "search_index": None
+    }
+
+def _update_chat_target(**changes):
+    st.session_state["chat_target"] = dict(_get_chat_target(), **changes)
+
 def render_ai_chat():
-    """AI에게 질문하기 페이지"""
+    """AI에게 질문하기 페이지
+    각 영역은 독립적으로 다시 실행되는 fragment로 나뉜다. 질문 입력/이력 조작은 질문 영역만,
+    인덱스 선택은 인덱스 영역만 다시 실행하므로 Azure 목록 조회가 반복되지 않는다.
+    """
     st.title("🤖 AI에게 질문하기")
     st.write("Azure OpenAI를 통해 질문하고 답변을 받아보세요.")
 
@@ -92,6 +181,18 @@ def render_ai_chat():
     if "chat_history" not in st.session_state:
         st.session_state["chat_history"] = []
 
+    _render_source_selector()
+    _render_question_and_history()
+
+    # Azure Search 연결 진단 (옵션)
+    _render_diagnostics()
+
+@st.fragment
+@traced_fragment("source_selector")
+def _render_source_selector():
+    """컨테이너 선택 영역 (선택한 컨테이너의 인덱스 선택 fragment 포함)"""
+    previous_target = st.session_state.get("chat_target")
+
     # Azure Blob Storage 선택
     st.subheader("📁 Azure Blob Storage 컨테이너 선택")
     
@@ -99,10 +200,10 @@ def render_ai_chat():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🔄 새로고침", help="컨테이너 목록을 다시 불러옵니다"):
-            # 캐시 클리어
-            for key in ["storage_containers_cache", "containers_fetch_time"]:
-                if key in st.session_state:
-                    del st.session_state[key]
+            # 캐시 클리어 (컨테이너 목록과 AI Search 인덱스 구성)
+            _list_storage_containers.invalidate()
+            from azureai.aisearch import invalidate_search_topology
+            invalidate_search_topology()
             st.rerun()
     
     # 실제 Azure Storage 컨테이너 목록 가져오기
@@ -112,15 +213,15 @@ def render_ai_chat():
     if containers is None:
         # 오류 시 기본 옵션 제공
         st.warning("⚠️ Azure Storage에 연결할 수 없습니다. 기본 옵션을 사용합니다.")
-        storage_options = ["기본 Storage (일반 질문)"]
         selected_storage = st.selectbox(
             "질문할 내용과 관련된 컨테이너를 선택하세요",
-            storage_options,
-            index=0
+            (GENERAL_STORAGE_OPTION,),
+            index=0,
+            key="chat_container_offline"
         )
         st.info("💡 일반적인 Azure 관련 질문을 할 수 있습니다.")
     else:
-        # 인덱스된 컨테이너 목록 가져오기 (상태 표시용)
+        # 인덱스된 컨테이너 목록 가져오기 (상태 표시용, 공유 캐시)
         indexed_containers = []
         try:
             from azureai.aisearch import get_indexed_containers
@@ -128,48 +229,26 @@ def render_ai_chat():
         except Exception as e:
             pass  # 에러 시 빈 목록으로 처리
         
-        # 실제 컨테이너 목록으로 옵션 생성
-        container_options = ["기본 Storage (일반 질문)"]
-        
         if containers:
-            for container in containers:
-                container_name = container['name']
-                container_info = f"{container_name}"
-                
-                # 인덱스 상태 표시 (인덱스된 컨테이너에 🔍 표시)
-                is_indexed = any(
-                    indexed_container in container_name.lower() or container_name.lower() in indexed_container
-                    for indexed_container in indexed_containers
-                )
-                if is_indexed:
-                    container_info += " 🔍"  # 인덱스된 컨테이너 표시
-                
-                if container['metadata']:
-                    # 메타데이터가 있으면 설명 추가
-                    description = container['metadata'].get('description', '')
-                    if description:
-                        container_info += f" ({description})"
-                
-                container_options.append(container_info)
+            # 실제 컨테이너 목록으로 옵션 생성 (같은 목록이면 이전 결과 재사용)
+            container_options, indexed_count = _container_options(containers, indexed_containers)
             
             # 결과 메시지
-            indexed_count = sum(1 for c in containers if any(
-                ic in c['name'].lower() or c['name'].lower() in ic for ic in indexed_containers
-            ))
             st.success(f"✅ {len(containers)}개의 컨테이너를 발견했습니다! (인덱스됨: {indexed_count}개 🔍)")
         else:
             st.info("📋 현재 Storage 계정에 컨테이너가 없습니다.")
-            container_options = ["기본 Storage (일반 질문)"]
+            container_options = (GENERAL_STORAGE_OPTION,)
         
         selected_storage = st.selectbox(
             "질문할 내용과 관련된 컨테이너를 선택하세요",
             container_options,
             index=0,
+            key="chat_container",
             help="선택한 컨테이너에 따라 AI가 관련 문서나 데이터를 참조하여 더 정확한 답변을 제공합니다."
         )
         
         # 선택된 컨테이너 정보 표시
-        if selected_storage == "기본 Storage (일반 질문)":
+        if selected_storage == GENERAL_STORAGE_OPTION:
             st.info("💡 일반적인 Azure 관련 질문을 할 수 있습니다.")
         else:
             container_name = selected_storage.split(" 🔍")[0].split(" (")[0]  # 인덱스 아이콘 제거
@@ -206,100 +285,143 @@ def render_ai_chat():
                         except Exception:
                             st.write("**AI Search 인덱스**: 매핑 정보 확인 불가")
 
-    # AI Search 인덱스 선택 (컨테이너가 선택된 경우에만 표시)
+    if selected_storage == GENERAL_STORAGE_OPTION:
+        _update_chat_target(storage=selected_storage, container_name=None, search_index=None)
+    else:
+        container_name = selected_storage.split(" 🔍")[0].split(" (")[0]
+        _update_chat_target(storage=selected_storage, container_name=container_name)
+        # AI Search 인덱스 선택 (컨테이너가 선택된 경우에만 표시)
+        _render_index_selector(container_name)
+
+    # 일반 질문 ↔ 컨테이너 질문이 바뀌면 질문 영역의 비교 모드/검색 방식 표시도 달라지므로 전체를 다시 그림
+    if previous_target is not None and bool(previous_target["container_name"]) != bool(_get_chat_target()["container_name"]):
+        st.rerun()
+
+@st.fragment
+@traced_fragment("index_selector")
+def _render_index_selector(container_name):
+    """선택한 컨테이너의 AI Search 인덱스 선택 영역 (인덱스 변경 시 이 영역만 다시 실행)"""
     selected_search_index = None
-    if selected_storage != "기본 Storage (일반 질문)":
-        st.subheader("🔍 AI Search 인덱스 선택")
+    st.subheader("🔍 AI Search 인덱스 선택")
+    
+    try:
+        from azureai.aisearch import get_indexes_for_container, invalidate_search_topology
         
-        container_name = selected_storage.split(" 🔍")[0].split(" (")[0]
+        # 해당 컨테이너에서 사용 가능한 인덱스 목록 가져오기 (공유 캐시)
+        with st.spinner(f"🔍 '{container_name}' 컨테이너의 데이터소스-인덱서 연결을 확인 중..."):
+            available_indexes = get_indexes_for_container(container_name)
         
-        try:
-            from azureai.aisearch import get_indexes_for_container, get_available_search_indexes
+        if available_indexes:
+            # 인덱스 선택 옵션 생성 (같은 목록이면 이전 결과 재사용)
+            index_options, index_details = _index_options(available_indexes)
             
-            # 해당 컨테이너에서 사용 가능한 인덱스 목록 가져오기
-            with st.spinner(f"🔍 '{container_name}' 컨테이너의 데이터소스-인덱서 연결을 확인 중..."):
-                available_indexes = get_indexes_for_container(container_name)
+            selected_index_option = st.selectbox(
+                f"'{container_name}' 컨테이너 관련 AI Search 인덱스를 선택하세요",
+                options=index_options,
+                index=0,
+                key=f"chat_index_{container_name}",
+                help="미선택 시 AI Search 없이 일반 OpenAI로 질문합니다. 특정 인덱스 선택 시 해당 인덱스의 문서를 참조하여 답변합니다."
+            )
             
-            if available_indexes:
-                # 인덱스 선택 옵션 생성
-                index_options = ["미선택 (일반 OpenAI 질문)"]
-                index_details = {}
+            # 선택된 인덱스 정보 표시
+            if selected_index_option == NO_INDEX_OPTION:
+                st.info("💡 AI Search 없이 일반 OpenAI로 질문합니다. 문서 참조 기능이 사용되지 않습니다.")
+                selected_search_index = "NO_INDEX"  # 인덱스 미사용 표시
+            else:
+                selected_idx_info = index_details[selected_index_option]
+                selected_search_index = selected_idx_info['name']
                 
-                for idx in available_indexes:
-                    option_text = f"{idx['name']}"
-                    
-                    # 데이터소스-인덱서 정보가 있으면 표시
-                    if idx.get('data_source') and idx.get('indexer'):
-                        option_text += f" (데이터소스: {idx['data_source']}, 인덱서: {idx['indexer']})"
-                    elif idx.get('description'):
-                        option_text += f" - {idx['description']}"
-                    
-                    if idx.get('fields_count', 0) > 0:
-                        option_text += f" [{idx['fields_count']}개 필드]"
-                    
-                    index_options.append(option_text)
-                    index_details[option_text] = idx
+                # 선택된 인덱스 상세 정보
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.success(f"✅ 선택된 인덱스: **{selected_search_index}**")
+                with col2:
+                    if st.button("🔄 인덱스 새로고침", help="인덱스 목록을 다시 불러옵니다"):
+                        # 인덱스 구성 캐시를 비우면 이 영역이 다시 실행될 때 새로 조회됨
+                        invalidate_search_topology()
+                        st.rerun()
                 
-                selected_index_option = st.selectbox(
-                    f"'{container_name}' 컨테이너 관련 AI Search 인덱스를 선택하세요",
-                    options=index_options,
-                    index=0,
-                    help="미선택 시 AI Search 없이 일반 OpenAI로 질문합니다. 특정 인덱스 선택 시 해당 인덱스의 문서를 참조하여 답변합니다."
-                )
-                
-                # 선택된 인덱스 정보 표시
-                if selected_index_option == "미선택 (일반 OpenAI 질문)":
-                    st.info("💡 AI Search 없이 일반 OpenAI로 질문합니다. 문서 참조 기능이 사용되지 않습니다.")
-                    selected_search_index = "NO_INDEX"  # 인덱스 미사용 표시
-                else:
-                    selected_idx_info = index_details[selected_index_option]
-                    selected_search_index = selected_idx_info['name']
+                # 인덱스 상세 정보
+                with st.expander("📋 선택된 인덱스 상세 정보"):
+                    st.write(f"**인덱스 이름**: {selected_idx_info['name']}")
                     
-                    # 선택된 인덱스 상세 정보
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.success(f"✅ 선택된 인덱스: **{selected_search_index}**")
-                    with col2:
-                        if st.button("🔄 인덱스 새로고침", help="인덱스 목록을 다시 불러옵니다"):
-                            st.rerun()
+                    # 데이터소스-인덱서 연결 정보 표시
+                    if selected_idx_info.get('data_source') and selected_idx_info.get('indexer'):
+                        st.write("**데이터 흐름**:")
+                        st.write(f"  📁 컨테이너: `{container_name}`")
+                        st.write(f"  🔗 데이터소스: `{selected_idx_info['data_source']}`")
+                        st.write(f"  ⚙️ 인덱서: `{selected_idx_info['indexer']}`")
+                        st.write(f"  📊 인덱스: `{selected_idx_info['name']}`")
                     
-                    # 인덱스 상세 정보
-                    with st.expander("📋 선택된 인덱스 상세 정보"):
-                        st.write(f"**인덱스 이름**: {selected_idx_info['name']}")
-                        
-                        # 데이터소스-인덱서 연결 정보 표시
-                        if selected_idx_info.get('data_source') and selected_idx_info.get('indexer'):
-                            st.write("**데이터 흐름**:")
-                            st.write(f"  📁 컨테이너: `{container_name}`")
-                            st.write(f"  🔗 데이터소스: `{selected_idx_info['data_source']}`")
-                            st.write(f"  ⚙️ 인덱서: `{selected_idx_info['indexer']}`")
-                            st.write(f"  📊 인덱스: `{selected_idx_info['name']}`")
-                        
-                        if selected_idx_info.get('description'):
-                            st.write(f"**설명**: {selected_idx_info['description']}")
-                        if selected_idx_info.get('fields_count', 0) > 0:
-                            st.write(f"**필드 수**: {selected_idx_info['fields_count']}개")
-            else:
-                st.warning(f"⚠️ '{container_name}' 컨테이너와 관련된 AI Search 인덱스를 찾을 수 없습니다.")
-                st.info("💡 일반 질문 모드로 진행되거나 다른 컨테이너를 선택해보세요.")
-                
-        except Exception as e:
-            st.warning(f"⚠️ 인덱스 목록을 가져올 수 없습니다: {str(e)}")
-            st.info("💡 기본 인덱스가 자동으로 사용됩니다.")
+                    if selected_idx_info.get('description'):
+                        st.write(f"**설명**: {selected_idx_info['description']}")
+                    if selected_idx_info.get('fields_count', 0) > 0:
+                        st.write(f"**필드 수**: {selected_idx_info['fields_count']}개")
+        else:
+            st.warning(f"⚠️ '{container_name}' 컨테이너와 관련된 AI Search 인덱스를 찾을 수 없습니다.")
+            st.info("💡 일반 질문 모드로 진행되거나 다른 컨테이너를 선택해보세요.")
+            
+    except Exception as e:
+        st.warning(f"⚠️ 인덱스 목록을 가져올 수 없습니다: {str(e)}")
+        st.info("💡 기본 인덱스가 자동으로 사용됩니다.")
+
+    _update_chat_target(search_index=selected_search_index)
+
+@st.fragment
+@traced_fragment("question")
+def _render_question_and_history():
+    """질문 입력, 답변 생성, 이력 영역 (입력/이력 조작은 이 영역만 다시 실행하며 Azure 목록을 조회하지 않음)"""
+    target = _get_chat_target()
+    selected_storage = target["storage"]
+    selected_search_index = target["search_index"]
 
     st.divider()
 
     # 질문 입력 (여러 줄 가능)
     user_question = st.text_area(
-        "질문을 입력하세요", 
+        "질문을 입력하세요",
+        key="chat_question",
         placeholder="예: Azure App Service 배포 방법을 알려주세요\n\n여러 줄로 자세한 질문을 작성할 수 있습니다.",
         height=120,
         help="긴 질문이나 복잡한 시나리오를 여러 줄로 작성할 수 있습니다."
     )
 
+    # 인덱스 비교 모드 / 검색 방식 (컨테이너가 선택된 경우에만)
+    compare_mode = False
+    retrieval_mode = None
+    if target["container_name"]:
+        col1, col2 = st.columns(2)
+        with col1:
+            compare_mode = st.checkbox(
+                "🆚 인덱스 비교 모드",
+                key="chat_compare_mode",
+                help="같은 질문을 컨테이너의 모든 인덱스와 인덱스 미사용 경로에 병렬로 보내 답변을 나란히 비교합니다."
+            )
+        with col2:
+            retrieval_label = st.radio(
+                "검색 방식",
+                tuple(RETRIEVAL_MODE_OPTIONS),
+                # 기본 선택은 AZURE_SEARCH_RETRIEVAL_MODE 설정을 따름
+                index=list(RETRIEVAL_MODE_OPTIONS.values()).index(get_settings().retrieval_mode),
+                key="chat_retrieval_mode",
+                horizontal=True,
+                help="직접 검색은 인덱스를 SearchClient로 조회한 뒤 토큰 예산 안에서 청크를 프롬프트에 담습니다. 검색 결과가 캐시되고 검색 지연시간이 별도로 표시됩니다."
+            )
+            retrieval_mode = RETRIEVAL_MODE_OPTIONS[retrieval_label]
+
     # 질문하기 버튼
     if st.button("질문하기"):
-        if user_question and user_question.strip():
+        if compare_mode and user_question and user_question.strip():
+            container_name = target["container_name"]
+            with st.spinner(f"'{container_name}' 컨테이너의 인덱스별 답변을 병렬로 생성 중..."):
+                try:
+                    from azureai.aisearch import compare_indexes_for_question
+                    st.session_state["index_comparison"] = compare_indexes_for_question(
+                        user_question.strip(), container_name, retrieval_mode=retrieval_mode
+                    )
+                except Exception as e:
+                    st.error(f"AI 오류: {e}")
+        elif user_question and user_question.strip():
             with st.spinner("AI 응답 생성 중..."):
                 try:
                     # 실제 Azure OpenAI + AI Search 연동
@@ -313,12 +435,14 @@ def render_ai_chat():
                         result = ask_question_with_container(
                             user_question.strip(), 
                             selected_storage, 
-                            selected_search_index
+                            selected_search_index,
+                            retrieval_mode
                         )
                         
                         answer = result["content"]
                         citations = result.get("citations", [])
                         index_used = result.get("index_used")
+                        retrieval_info = result.get("retrieval")
                         
                         # 사용된 인덱스 정보 추가
                         if index_used == "미사용":
@@ -330,10 +454,23 @@ def render_ai_chat():
                                 storage_info = f"📊 **사용된 인덱스**: {index_used} (자동 선택)"
                         else:
                             storage_info = "💬 **일반 질문**: AI Search 없이 답변"
+                        
+                        # 직접 검색 모드인 경우 검색 단계 지표 추가
+                        if retrieval_info:
+                            cache_text = "캐시" if retrieval_info["cached"] else f"{retrieval_info['latency_ms']:.0f} ms"
+                            storage_info += (
+                                f"  \n🔎 **직접 검색**: 청크 {retrieval_info['packed']}/{retrieval_info['retrieved']}개 사용, "
+                                f"컨텍스트 약 {retrieval_info['context_tokens']} 토큰, 검색 {cache_text}"
+                            )
+                            if retrieval_info.get("reranked"):
+                                storage_info += (
+                                    f", 중복 청크 {retrieval_info['duplicates_removed']}개 제거로 "
+                                    f"약 {retrieval_info['tokens_saved']} 토큰 절약"
+                                )
                             
                     except ImportError:
                         # aisearch 모듈을 찾을 수 없는 경우 시뮬레이션
-                        storage_context = f"(참조 Storage: {selected_storage})" if selected_storage != "기본 Storage (일반 질문)" else ""
+                        storage_context = f"(참조 Storage: {selected_storage})" if selected_storage != GENERAL_STORAGE_OPTION else ""
                         
                         if selected_search_index == "NO_INDEX":
                             index_context = "(인덱스 미사용 - 일반 OpenAI)"
@@ -364,13 +501,16 @@ def render_ai_chat():
                         "timestamp": time.strftime('%Y-%m-%d %H:%M:%S')
                     })
                     st.success("답변을 생성했습니다!")
-                    # 질문 후 페이지 새로고침으로 입력란 비우기
-                    st.rerun()
+                    # 아래 이력 영역이 같은 fragment 안에 있으므로 별도 rerun 없이 새 답변이 표시됨
                 except Exception as e:
                     st.error(f"AI 오류: {e}")
         else:
             st.warning("⚠️ 질문을 입력해주세요.")
 
+    # 인덱스 비교 결과 출력
+    if compare_mode and st.session_state.get("index_comparison"):
+        _render_index_comparison(st.session_state["index_comparison"])
+
     # 이력 출력
     if st.session_state["chat_history"]:
         st.subheader("💬 질문/답변 이력")
@@ -397,7 +537,7 @@ def render_ai_chat():
                 # 선택된 Storage 정보 표시
                 if chat.get('storage'):
                     storage_display = chat['storage']
-                    if storage_display != "기본 Storage (일반 질문)":
+                    if storage_display != GENERAL_STORAGE_OPTION:
                         st.markdown(f"**📁 선택된 컨테이너**: {storage_display}")
                     else:
                         st.markdown(f"**📁 선택된 컨테이너**: 일반 질문")
@@ -434,7 +574,10 @@ def render_ai_chat():
                 
                 st.caption(f"시간: {chat.get('timestamp', 'N/A')}")
 
-    # Azure Search 연결 진단 (옵션)
+@st.fragment
+@traced_fragment("diagnostics")
+def _render_diagnostics():
+    """Azure OpenAI + AI Search 연결 진단 영역"""
     with st.expander("🔧 Azure OpenAI + AI Search 연결 진단"):
         st.info("Azure OpenAI와 Azure Search 연동 상태를 확인합니다.")
         
@@ -442,26 +585,45 @@ def render_ai_chat():
         with col1:
             if st.button("🔍 연결 상태 확인"):
                 try:
-                    from azureai.aisearch import ask_question_with_container
-                    
-                    # 현재 선택된 설정으로 테스트 질문
-                    test_storage = selected_storage if 'selected_storage' in locals() else "기본 Storage (일반 질문)"
-                    test_index = selected_search_index if 'selected_search_index' in locals() and selected_search_index else None
-                    
-                    test_result = ask_question_with_container("테스트 질문입니다", test_storage, test_index)
-                    st.success("✅ Azure OpenAI 연결 성공!")
-                    st.write(f"**응답**: {test_result['content'][:100]}...")
-                    
-                    if test_result.get('index_used'):
-                        st.info(f"📊 사용된 인덱스: {test_result['index_used']}")
-                    
+                    from azureai.health import run_health_checks, get_latency_history, health_cache_age
+
+                    # 의존성별 최소 비용 프로브를 병렬 실행 (짧은 TTL 동안 캐시)
+                    with st.spinner("의존성 상태를 점검 중..."):
+                        health_results = run_health_checks()
+
+                    status_icons = {"ok": "✅", "error": "❌", "skipped": "⚪"}
+                    for result in health_results:
+                        icon = status_icons.get(result["status"], "❔")
+                        message = f"{icon} **{result['label']}** ({result['latency_ms']:.0f} ms): {result['detail']}"
+                        if result["status"] == "ok":
+                            st.success(message)
+                        elif result["status"] == "error":
+                            st.error(message)
+                        else:
+                            st.info(message)
+
+                    cache_age = health_cache_age()
+                    if cache_age is not None:
+                        st.caption(f"점검 시각: {health_results[0]['checked_at']} (캐시 경과 {cache_age:.0f}초)")
+
+                    # 의존성별 지연시간 이력
+                    latency_history = get_latency_history()
+                    if latency_history:
+                        import pandas as pd
+                        labels = {result["key"]: result["label"] for result in health_results}
+                        history_df = pd.DataFrame({
+                            labels.get(key, key): pd.Series(values) for key, values in latency_history.items()
+                        })
+                        st.write("**지연시간 이력 (ms)**")
+                        st.line_chart(history_df)
+
                 except Exception as e:
                     st.error(f"❌ 연결 실패: {str(e)}")
         
         with col2:
             if st.button("📋 데이터소스-인덱서 연결 확인"):
                 try:
-                    from azureai.aisearch import get_available_search_indexes, get_datasources_and_indexers, get_index_for_container
+                    from azureai.aisearch import get_available_search_indexes, get_datasources_and_indexers, get_indexes_for_container
                     
                     # 데이터소스와 인덱서 정보 표시
                     datasources, indexers = get_datasources_and_indexers()
@@ -497,11 +659,12 @@ def render_ai_chat():
                     
                     st.divider()
                     
-                    # 현재 컨테이너들에 대한 연결된 인덱스 확인
+                    # 현재 컨테이너들에 대한 연결된 인덱스 확인 (공유 캐시에서 조회)
+                    containers = get_azure_storage_containers()
                     if containers:
                         st.write("**컨테이너별 연결된 인덱스:**")
                         for container in containers[:5]:  # 처음 5개만 표시
-                            container_indexes = get_index_for_container(container['name'])
+                            container_indexes = get_indexes_for_container(container['name'])
                             if container_indexes:
                                 index_names = [idx['name'] for idx in container_indexes]
                                 st.write(f"- `{container['name']}` → {', '.join([f'`{name}`' for name in index_names])}")
@@ -516,21 +679,25 @@ def render_ai_chat():
         # 환경 변수 확인
         st.subheader("🔧 환경 설정 확인")
         env_status = []
+        # 시작 시 한 번 읽은 설정 사용 (ENDPOINT_URL/DEPLOYMENT_NAME 같은 대체 변수명과 기본값이 반영된 값)
+        settings = get_settings()
         
-        required_vars = [
-            "AZURE_OPENAI_ENDPOINT",
-            "AZURE_OPENAI_DEPLOYMENT", 
-            "AZURE_SEARCH_ENDPOINT",
-            "AZURE_SEARCH_INDEX",
-            "AZURE_STORAGE_ACCOUNT_NAME"
+        required_settings = [
+            ("AZURE_OPENAI_ENDPOINT", settings.openai_endpoint),
+            ("AZURE_OPENAI_DEPLOYMENT", settings.openai_deployment),
+            ("AZURE_SEARCH_ENDPOINT", settings.search_endpoint),
+            ("AZURE_SEARCH_INDEX", settings.search_index),
+            ("AZURE_STORAGE_ACCOUNT_NAME", settings.storage_account_name)
         ]
         
-        for var in required_vars:
-            value = os.getenv(var)
+        for var, value in required_settings:
             if value:
                 env_status.append(f"✅ {var}: 설정됨")
             else:
                 env_status.append(f"❌ {var}: 미설정")
         
+        # 시작 시 결정된 인증 방식
+        env_status.append(f"🔑 인증 방식: {settings.auth_mode}")
+        
         for status in env_status:
             st.write(status)
\ No newline at end of file
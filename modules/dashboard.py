@@ -1,197 +1,561 @@
 ﻿import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import sys
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 import json
+import time
 import base64
+import threading
+from types import SimpleNamespace
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
 # 프로젝트 루트 디렉토리를 sys.path에 추가 
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(BASE_DIR))
 
-# .env 파일 로드
-env_path = BASE_DIR / '.env'
-load_dotenv(env_path)
+from azureai.cache import register as register_cache
+from azureai.settings import get_settings, get_credential
+from azureai.tracing import span, propagate
+from azureai.snapshot import Snapshot, SnapshotStore
+from modules.dashboard_persistence import DashboardSnapshotFile
 
-def get_azure_dashboards():
-    """Azure Portal 대시보드 정보를 가져오는 함수"""
-    try:
-        from azure.identity import ClientSecretCredential
-        from azure.mgmt.subscription import SubscriptionClient
-        from azure.mgmt.resourcegraph import ResourceGraphClient
-        from azure.mgmt.resourcegraph.models import QueryRequest
-        
-        # 환경 변수에서 인증 정보 읽기
-        client_id = os.getenv('AZURE_CLIENT_ID')
-        client_secret = os.getenv('AZURE_CLIENT_SECRET') 
-        tenant_id = os.getenv('AZURE_TENANT_ID')
-        subscription_id = os.getenv('AZURE_SUBSCRIPTION_ID')
-        
-        if not all([client_id, client_secret, tenant_id, subscription_id]):
-            st.warning("⚠️ Azure 인증 정보가 .env 파일에서 로드되지 않았습니다.")
-            return None, None
-            
-        # 캐시 확인 (5분간 유효)
-        cache_key = "azure_dashboards_cache"
-        time_key = "last_fetch_time"
-        
-        if cache_key in st.session_state and time_key in st.session_state:
-            if (datetime.now() - st.session_state[time_key]).seconds < 300:
-                return st.session_state[cache_key], st.session_state.get("subscription_info")
-        
-        # Azure 인증
-        credential = ClientSecretCredential(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            client_secret=client_secret
-        )
-        
-        # 구독 정보 가져오기
-        subscription_client = SubscriptionClient(credential)
-        subscription_info = subscription_client.subscriptions.get(subscription_id)
-        
-        # Resource Graph를 통해 대시보드 조회
-        graph_client = ResourceGraphClient(credential)
-        
-        # Portal 대시보드 조회 - 간단한 쿼리 사용
-        query = QueryRequest(
-            query="Resources | where type =~ 'microsoft.portal/dashboards' | project id, name, resourceGroup, location, subscriptionId, tags, properties"
-        )
-        
-        try:
-            query_response = graph_client.resources(query)
-            
-            if not query_response or not hasattr(query_response, 'data'):
-                st.warning("⚠️ 대시보드 데이터를 가져올 수 없습니다.")
-                return [], subscription_info
-                
-        except Exception as query_error:
-            st.error(f"❌ Resource Graph 쿼리 실행 실패: {str(query_error)}")
-            return [], subscription_info
-        
-        dashboards = []
-        for dashboard in query_response.data:
-            # 대시보드 메타데이터 추출
-            properties = dashboard.get('properties', {})
-            metadata = properties.get('metadata', {}) if properties else {}
-            model = metadata.get('model', {}) if metadata else {}
-            tags = dashboard.get('tags', {})
-            
-            # 대시보드 표시 이름 결정 (우선순위에 따라)
-            display_name = 'Unknown Dashboard'
-            
-            # 1순위: tags['hidden-title'] (Azure Portal 대시보드의 실제 이름)
-            if tags and 'hidden-title' in tags and tags['hidden-title']:
-                display_name = tags['hidden-title']
-            # 2순위: model.title (대시보드의 메타데이터 제목)
-            elif model and 'title' in model and model['title']:
-                display_name = model['title']
-            # 3순위: properties.displayName (대시보드의 표시 이름)
-            elif properties and 'displayName' in properties and properties['displayName']:
-                display_name = properties['displayName']
-            # 4순위: 리소스 이름을 읽기 쉽게 변환
+# Resource Graph 페이지 크기 ($top, 최대 1000)
+RESOURCE_GRAPH_PAGE_SIZE = get_settings().resource_graph_page_size
+# Resource Graph 요청 하나에 지정할 수 있는 최대 구독 수
+RESOURCE_GRAPH_MAX_SUBSCRIPTIONS = 1000
+# 동시에 실행할 Resource Graph 배치 요청 수
+RESOURCE_GRAPH_MAX_CONCURRENCY = 4
+# 구독 id → 이름 매핑 캐시 유지 시간
+SUBSCRIPTION_CACHE_SECONDS = 3600
+# 지연 조회한 대시보드 properties 보관 개수 (프로세스 단위)
+DASHBOARD_PROPERTIES_CACHE_SIZE = 64
+# 공유 대시보드 스냅샷 유지 시간 (단조 시계 기준)
+DASHBOARD_TTL_SECONDS = 300
+# 마지막 정상 스냅샷 저장 파일 (재시작 직후 표시 및 오프라인 대체 데이터)
+DASHBOARD_SNAPSHOT_PATH = get_settings().dashboard_snapshot_path
+# resourcechanges 보존 기간 (이보다 오래된 스냅샷은 전체 조회)
+CHANGE_TRACKING_RETENTION_DAYS = 14
+# 변경 이벤트 수집 지연을 감안해 이전 조회 시점보다 앞당겨 조회하는 시간
+CHANGE_TRACKING_OVERLAP_SECONDS = 300
+# 변경된 대시보드를 id 목록으로 다시 조회할 때 쿼리 하나에 담을 id 수
+CHANGE_FETCH_BATCH_SIZE = 200
+
+# 목록 화면에 필요한 필드만 투영 (타일 JSON이 담긴 properties 전체는 상세 보기에서 지연 조회)
+DASHBOARD_LIST_QUERY = (
+    "Resources | where type =~ 'microsoft.portal/dashboards' "
+    "| project id, name, resourceGroup, location, subscriptionId, tags, "
+    "hiddenTitle = tostring(tags['hidden-title']), "
+    "modelTitle = tostring(properties.metadata.model.title), "
+    "propertiesDisplayName = tostring(properties.displayName), "
+    "created = tostring(properties.metadata.created), "
+    "modified = tostring(properties.metadata.modified)"
+)
+
+# 리소스 이름 끝의 GUID (8-4-4-4-12 형태)와 단어 구분자
+# 인라인 플래그를 쓴 문자열 패턴이어야 pandas가 pyarrow 문자열 커널(RE2)로 처리한다 (컴파일된 패턴은 행 단위 re.sub로 대체됨)
+_GUID_SUFFIX_PATTERN = r'(?i)-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+_NAME_SEPARATOR_PATTERN = r'[-_]'
+
+# Azure Portal 대시보드 URL 형식 (ARM 리소스 ID를 URL 경로로 사용)
+DASHBOARD_URL_PREFIX = "https://portal.azure.com/#@{tenant_id}/dashboard/arm"
+
+_subscription_lock = threading.Lock()
+_subscription_names = {}
+_subscription_names_fetched_at = 0.0
+
+@lru_cache(maxsize=1)
+def _get_management_clients():
+    """공유 자격 증명으로 만든 (Resource Graph, Subscription) 클라이언트 (프로세스 단위로 재사용)"""
+    from azure.mgmt.subscription import SubscriptionClient
+    from azure.mgmt.resourcegraph import ResourceGraphClient
+    
+    credential = get_credential()
+    return ResourceGraphClient(credential), SubscriptionClient(credential)
+
+def get_resource_graph_clients():
+    """Resource Graph 클라이언트와 접근 가능한 구독 id → 이름 매핑을 반환"""
+    graph_client, subscription_client = _get_management_clients()
+    
+    # 접근 가능한 구독 목록 (id → 이름, 프로세스 단위 캐시)
+    subscription_names = _get_subscription_names(subscription_client)
+    # 구독 목록 조회가 불가능할 때 사용하는 기본 구독 (선택)
+    default_subscription_id = get_settings().subscription_id
+    if not subscription_names and default_subscription_id:
+        subscription_names = {default_subscription_id: default_subscription_id}
+    
+    return graph_client, subscription_names
+
+def _query_dashboards(graph_client, query, subscription_names):
+    """구독을 요청당 한도 단위로 나눠 배치별로 동시에 쿼리하고 (대시보드 목록, 실패 배치 수, 전체 배치 수, 마지막 오류) 반환"""
+    subscription_ids = list(subscription_names)
+    batches = [
+        subscription_ids[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+        for i in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS)
+    ]
+    
+    def _fetch_batch(batch):
+        # 페이지 단위로 변환해 원본 행은 한 페이지만 메모리에 유지
+        batch_dashboards = []
+        for page in iter_resource_graph_pages(graph_client, query, subscriptions=batch):
+            batch_dashboards.extend(normalize_dashboards(page, subscription_names))
+        return batch_dashboards
+    
+    dashboards = []
+    failed_batches = 0
+    last_error = None
+    with ThreadPoolExecutor(max_workers=max(1, min(len(batches), RESOURCE_GRAPH_MAX_CONCURRENCY))) as executor:
+        for future in [executor.submit(propagate(_fetch_batch), batch) for batch in batches]:
+            try:
+                dashboards.extend(future.result())
+            except Exception as query_error:
+                failed_batches += 1
+                last_error = query_error
+    return dashboards, failed_batches, len(batches), last_error
+
+def _fetch_azure_dashboards():
+    """Azure에서 대시보드 목록 전체를 새로 가져오는 함수
+    Streamlit을 호출하지 않으므로 백그라운드 갱신 스레드에서도 실행된다.
+    화면에 표시할 경고는 messages에 (레벨, 문구) 형태로 담아 반환한다.
+    """
+    fetched_utc = datetime.now(timezone.utc)
+    graph_client, subscription_names = get_resource_graph_clients()
+    if not subscription_names:
+        return {
+            'dashboards': (),
+            'subscription_info': None,
+            'messages': (("warning", "⚠️ 접근 가능한 Azure 구독이 없습니다."),),
+            'fetched_utc': fetched_utc,
+            'refresh_stats': {'mode': 'full', 'total': 0}
+        }
+    
+    # Portal 대시보드 조회 - 구독을 요청당 한도 단위로 나눠 배치별로 동시에 실행
+    dashboards, failed_batches, batch_count, last_error = _query_dashboards(graph_client, DASHBOARD_LIST_QUERY, subscription_names)
+    
+    messages = []
+    if failed_batches:
+        if not dashboards:
+            # 전부 실패하면 예외로 알려 마지막 정상 스냅샷이 유지되도록 함
+            raise RuntimeError(f"Resource Graph 쿼리 실행 실패: {str(last_error)}")
+        messages.append(("error", f"❌ Resource Graph 쿼리 실행 실패 ({failed_batches}/{batch_count}개 배치): {str(last_error)}"))
+        messages.append(("warning", f"⚠️ 일부 대시보드({len(dashboards)}개)만 불러왔습니다."))
+    
+    return {
+        'dashboards': tuple(dashboards),
+        'subscription_info': _summarize_subscriptions(subscription_names),
+        'messages': tuple(messages),
+        'fetched_utc': fetched_utc,
+        # 일부 배치가 실패한 스냅샷은 증분 갱신의 기준으로 쓰지 않음
+        'complete': not failed_batches,
+        'refresh_stats': {'mode': 'full', 'total': len(dashboards)}
+    }
+
+def _changed_dashboard_ids(graph_client, subscription_names, since_utc):
+    """resourcechanges에서 since_utc 이후 변경된 대시보드를 조회해 (추가/수정된 id 집합, 삭제된 id 집합) 반환"""
+    since = (since_utc - timedelta(seconds=CHANGE_TRACKING_OVERLAP_SECONDS)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    query = (
+        "resourcechanges "
+        "| extend changeTime = todatetime(properties.changeAttributes.timestamp), "
+        "targetResourceId = tolower(tostring(properties.targetResourceId)), "
+        "targetResourceType = tostring(properties.targetResourceType), "
+        "changeType = tostring(properties.changeType) "
+        f"| where targetResourceType =~ 'microsoft.portal/dashboards' and changeTime > datetime({since}) "
+        "| summarize arg_max(changeTime, changeType) by targetResourceId "
+        # Resource Graph는 결과에 id 컬럼이 있어야 skip_token을 반환하므로 id로 투영 (없으면 첫 페이지 이후 변경이 누락됨)
+        "| project id = targetResourceId, changeType"
+    )
+    
+    upserted, deleted = set(), set()
+    subscription_ids = list(subscription_names)
+    for i in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+        batch = subscription_ids[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+        for row in _iter_resource_graph_rows(graph_client, query, subscriptions=batch):
+            if row.get('changeType') == 'Delete':
+                deleted.add(row['id'])
             else:
-                resource_name = dashboard.get('name', 'Unknown')
-                if resource_name and resource_name != 'Unknown':
-                    # 대시보드 이름에서 불필요한 GUID 부분 제거하고 읽기 쉽게 만들기
-                    import re
-                    cleaned_name = resource_name
-                    # GUID 패턴 제거 (8-4-4-4-12 형태)
-                    cleaned_name = re.sub(r'-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', '', cleaned_name, flags=re.IGNORECASE)
-                    # 남은 하이픈들을 공백으로 변경하고 제목 형태로 변환
-                    cleaned_name = cleaned_name.replace('-', ' ').replace('_', ' ').title()
-                    display_name = cleaned_name if cleaned_name.strip() else resource_name
-            
-            # 공유 여부 판단 
-            # Resource Graph API로 조회되는 대시보드는 모두 공유 대시보드입니다
-            # (개인 대시보드는 Azure 리소스가 아니므로 API로 조회 불가)
-            is_shared = True  # Resource Graph로 조회되는 것은 모두 공유 대시보드
-            
-
-            
-            dashboard_info = {
-                'id': dashboard.get('id', ''),
-                'name': dashboard.get('name', 'Unknown'),
-                'displayName': display_name,
-                'resourceGroup': dashboard.get('resourceGroup', 'N/A'),
-                'location': dashboard.get('location', 'global'),
-                'subscriptionId': dashboard.get('subscriptionId', subscription_id),
-                'subscriptionName': subscription_info.display_name,
-                'tags': tags,
-                'isShared': is_shared,
-                'properties': properties,
-                'created': metadata.get('created', 'N/A') if metadata else 'N/A',
-                'modified': metadata.get('modified', 'N/A') if metadata else 'N/A'
-            }
-            dashboards.append(dashboard_info)
-        
-        # 캐시 저장
-        st.session_state[cache_key] = dashboards
-        st.session_state[time_key] = datetime.now()
-        st.session_state["subscription_info"] = subscription_info
-        
-        return dashboards, subscription_info
-        
+                upserted.add(row['id'])
+    return upserted, deleted
+
+def _modified_dashboard_ids(graph_client, subscription_names, previous_dashboards):
+    """change tracking을 쓸 수 없을 때 id와 modified만 조회해 이전 스냅샷과 비교하는 방식"""
+    query = (
+        "Resources | where type =~ 'microsoft.portal/dashboards' "
+        "| project id = tolower(id), modified = tostring(properties.metadata.modified)"
+    )
+    previous_modified = {d['id'].lower(): d.get('modified') for d in previous_dashboards}
+    
+    current_ids = set()
+    upserted = set()
+    subscription_ids = list(subscription_names)
+    for i in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+        batch = subscription_ids[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+        for row in _iter_resource_graph_rows(graph_client, query, subscriptions=batch):
+            dashboard_id = row['id']
+            current_ids.add(dashboard_id)
+            if previous_modified.get(dashboard_id, object()) != (row.get('modified') or 'N/A'):
+                upserted.add(dashboard_id)
+    return upserted, set(previous_modified) - current_ids
+
+def _refresh_azure_dashboards(previous):
+    """이전 스냅샷 이후 추가/수정/삭제된 대시보드만 조회해 반영하는 증분 갱신
+    갱신 비용이 전체 대시보드 수가 아닌 변경량에 비례한다. 기준으로 삼을 수 없는 경우 전체 조회로 대체한다.
+    """
+    fetched_utc = datetime.now(timezone.utc)
+    previous_utc = previous.get('fetched_utc')
+    if (not previous.get('complete')
+            or previous_utc is None
+            or fetched_utc - previous_utc > timedelta(days=CHANGE_TRACKING_RETENTION_DAYS)):
+        return _fetch_azure_dashboards()
+    
+    graph_client, subscription_names = get_resource_graph_clients()
+    previous_info = previous.get('subscription_info')
+    if not subscription_names or previous_info is None or set(subscription_names) != set(previous_info.subscription_ids):
+        # 구독 구성이 바뀌면 전체 조회
+        return _fetch_azure_dashboards()
+    
+    try:
+        upserted, deleted = _changed_dashboard_ids(graph_client, subscription_names, previous_utc)
+        mode = 'incremental'
+    except Exception:
+        upserted, deleted = _modified_dashboard_ids(graph_client, subscription_names, previous['dashboards'])
+        mode = 'incremental-modified'
+    
+    # 변경된 대시보드만 목록 쿼리로 다시 조회
+    changed = {}
+    upserted_ids = sorted(upserted - deleted)
+    for i in range(0, len(upserted_ids), CHANGE_FETCH_BATCH_SIZE):
+        id_list = ", ".join("'" + dashboard_id.replace("'", "\\'") + "'" for dashboard_id in upserted_ids[i:i + CHANGE_FETCH_BATCH_SIZE])
+        query = f"{DASHBOARD_LIST_QUERY} | where tolower(id) in ({id_list})"
+        dashboards, failed_batches, _, last_error = _query_dashboards(graph_client, query, subscription_names)
+        if failed_batches:
+            raise RuntimeError(f"변경된 대시보드 조회 실패: {str(last_error)}")
+        for dashboard in dashboards:
+            changed[dashboard['id'].lower()] = dashboard
+    
+    # 이전 목록에 패치 (기존 순서 유지, 새 대시보드는 뒤에 추가)
+    patched = []
+    modified_count = 0
+    for dashboard in previous['dashboards']:
+        key = dashboard['id'].lower()
+        if key in deleted:
+            continue
+        if key in changed:
+            patched.append(changed.pop(key))
+            modified_count += 1
+        else:
+            patched.append(dashboard)
+    removed_count = len(previous['dashboards']) - len(patched)
+    patched.extend(changed.values())
+    
+    return {
+        'dashboards': tuple(patched),
+        'subscription_info': previous_info,
+        'messages': (),
+        'fetched_utc': fetched_utc,
+        'complete': True,
+        'refresh_stats': {
+            'mode': mode,
+            'total': len(patched),
+            'added': len(changed),
+            'modified': modified_count,
+            'deleted': removed_count
+        }
+    }
+
+# 모든 세션이 공유하는 대시보드 스냅샷 (TTL이 지나면 마지막 스냅샷을 바로 제공하면서 백그라운드에서 증분 갱신)
+# 마지막 정상 스냅샷은 로컬 파일에도 저장해 재시작 직후 즉시 표시하고 Azure 장애 시 대체 데이터로 사용
+_dashboard_snapshot_file = DashboardSnapshotFile(DASHBOARD_SNAPSHOT_PATH)
+_dashboard_store = SnapshotStore(
+    "dashboards", _fetch_azure_dashboards, DASHBOARD_TTL_SECONDS,
+    refresh=_refresh_azure_dashboards, persistence=_dashboard_snapshot_file
+)
+# 다른 캐시와 함께 적중률/로드 시간 통계를 조회하고 이름으로 무효화할 수 있도록 등록
+register_cache("dashboards", _dashboard_store)
+
+def invalidate_dashboard_cache():
+    """공유 대시보드 스냅샷을 버려 다음 조회 시 새로 가져오도록 함"""
+    _dashboard_store.invalidate()
+
+def _get_offline_snapshot():
+    """로컬 파일에 저장된 마지막 정상 스냅샷 (파일이 바뀌지 않으면 같은 Snapshot 객체를 재사용)"""
+    try:
+        modified_ns = os.stat(DASHBOARD_SNAPSHOT_PATH).st_mtime_ns
+    except OSError:
+        return None
+    return _load_offline_snapshot(modified_ns)
+
+@lru_cache(maxsize=1)
+def _load_offline_snapshot(modified_ns):
+    return _dashboard_store.load_persisted()
+
+def get_dashboard_snapshot():
+    """공유 대시보드 스냅샷을 반환하는 함수
+    snapshot.version은 스냅샷마다 유일하므로 화면 렌더링 결과를 메모이즈하는 키로 사용할 수 있다.
+    Azure에 연결할 수 없으면 로컬에 저장된 마지막 스냅샷(snapshot.restored)을, 그것도 없으면
+    인증 정보/SDK 문제일 때 None, 연결 실패일 때 샘플 스냅샷을 반환한다.
+    """
+    if not get_settings().has_service_principal:
+        st.warning("⚠️ Azure 인증 정보가 .env 파일에서 로드되지 않았습니다.")
+        return _get_offline_snapshot()
+    
+    try:
+        snapshot = _dashboard_store.get()
     except ImportError as e:
         st.error(f"❌ 필요한 Azure SDK 패키지가 설치되지 않았습니다: {str(e)}")
-        return None, None
+        return _get_offline_snapshot()
     except Exception as e:
         st.error(f"❌ Azure 연결 실패: {str(e)}")
         
-        # 오류 발생 시 샘플 데이터 반환
+        # 오류 발생 시 저장된 마지막 스냅샷, 없으면 샘플 데이터 반환
+        offline_snapshot = _get_offline_snapshot()
+        if offline_snapshot is not None:
+            return offline_snapshot
         st.info("📋 샘플 대시보드 데이터를 표시합니다.")
-        sample_dashboards = [
-            {
-                'id': '/subscriptions/sample/resourceGroups/rg-monitoring/providers/Microsoft.Portal/dashboards/sample-dashboard-001',
-                'name': 'sample-dashboard-001',
-                'displayName': 'Azure 모니터링 대시보드',
-                'resourceGroup': 'rg-monitoring',
-                'location': 'global',
-                'subscriptionId': 'sample-subscription-id',
-                'subscriptionName': '샘플 구독',
-                'tags': {'Environment': 'Production'},
-                'isShared': True,
-                'properties': {},
-                'created': '2025-01-01',
-                'modified': '2025-09-30'
-            },
-            {
-                'id': '/subscriptions/sample/resourceGroups/rg-personal/providers/Microsoft.Portal/dashboards/my-dashboard',
-                'name': 'my-dashboard',
-                'displayName': '개인 대시보드',
-                'resourceGroup': 'rg-personal',
-                'location': 'global',
-                'subscriptionId': 'sample-subscription-id',
-                'subscriptionName': '샘플 구독',
-                'tags': {'hidden-title': 'MyDashboard'},
-                'isShared': False,
-                'properties': {},
-                'created': '2025-02-01',
-                'modified': '2025-09-29'
-            }
-        ]
+        return _get_sample_snapshot()
+    
+    for level, message in snapshot.data['messages']:
+        getattr(st, level)(message)
+    if _dashboard_store.last_error is not None:
+        st.warning(f"⚠️ 대시보드 갱신 실패로 이전 데이터를 표시합니다: {str(_dashboard_store.last_error)}")
+    return snapshot
+
+def get_azure_dashboards():
+    """Azure Portal 대시보드 정보를 가져오는 함수 (공유 스냅샷의 대시보드 목록, 구독 정보)"""
+    snapshot = get_dashboard_snapshot()
+    if snapshot is None:
+        return None, None
+    return snapshot.data['dashboards'], snapshot.data['subscription_info']
+
+def load_dashboard_snapshot():
+    """화면 출력 없이 공유 대시보드 스냅샷을 반환하는 함수 (HTTP API 등 Streamlit 밖에서 사용)
+    Azure 조회가 실패하면 로컬에 저장된 마지막 스냅샷을 반환하고, 그것도 없으면 예외를 그대로 전달한다.
+    """
+    if not get_settings().has_service_principal:
+        snapshot = _get_offline_snapshot()
+        if snapshot is None:
+            raise RuntimeError("Azure 인증 정보가 없고 저장된 대시보드 스냅샷도 없습니다.")
+        return snapshot
+    try:
+        return _dashboard_store.get()
+    except Exception:
+        snapshot = _get_offline_snapshot()
+        if snapshot is None:
+            raise
+        return snapshot
+
+@lru_cache(maxsize=1)
+def _get_sample_snapshot():
+    """Azure 연결 실패 시 표시할 샘플 스냅샷"""
+    sample_dashboards = (
+        {
+            'id': '/subscriptions/sample/resourceGroups/rg-monitoring/providers/Microsoft.Portal/dashboards/sample-dashboard-001',
+            'name': 'sample-dashboard-001',
+            'displayName': 'Azure 모니터링 대시보드',
+            'resourceGroup': 'rg-monitoring',
+            'location': 'global',
+            'subscriptionId': 'sample-subscription-id',
+            'subscriptionName': '샘플 구독',
+            'tags': {'Environment': 'Production'},
+            'isShared': True,
+            'created': '2025-01-01',
+            'modified': '2025-09-30'
+        },
+        {
+            'id': '/subscriptions/sample/resourceGroups/rg-personal/providers/Microsoft.Portal/dashboards/my-dashboard',
+            'name': 'my-dashboard',
+            'displayName': '개인 대시보드',
+            'resourceGroup': 'rg-personal',
+            'location': 'global',
+            'subscriptionId': 'sample-subscription-id',
+            'subscriptionName': '샘플 구독',
+            'tags': {'hidden-title': 'MyDashboard'},
+            'isShared': False,
+            'created': '2025-02-01',
+            'modified': '2025-09-29'
+        }
+    )
+    return Snapshot({
+        'dashboards': sample_dashboards,
+        'subscription_info': SimpleNamespace(display_name="샘플 구독"),
+        'messages': ()
+    })
+
+def _list_subscriptions(subscription_client):
+    with span("subscriptions.list"):
+        return list(subscription_client.subscriptions.list())
+
+def _get_subscription_names(subscription_client):
+    """접근 가능한 구독의 id → 이름 매핑을 반환 (SUBSCRIPTION_CACHE_SECONDS 동안 프로세스 단위 캐시)"""
+    global _subscription_names, _subscription_names_fetched_at
+    
+    with _subscription_lock:
+        if _subscription_names and (time.monotonic() - _subscription_names_fetched_at) < SUBSCRIPTION_CACHE_SECONDS:
+            return _subscription_names
+    
+    names = {
+        subscription.subscription_id: subscription.display_name
+        for subscription in _list_subscriptions(subscription_client)
+        if getattr(subscription, 'state', 'Enabled') in (None, 'Enabled')
+    }
+    
+    with _subscription_lock:
+        _subscription_names = names
+        _subscription_names_fetched_at = time.monotonic()
+    return names
+
+def _summarize_subscriptions(subscription_names):
+    """여러 구독을 화면 표시용 요약 객체로 변환 (display_name 속성 제공)"""
+    names = sorted(subscription_names.values())
+    if len(names) == 1:
+        display_name = names[0]
+    else:
+        display_name = f"{names[0]} 외 {len(names) - 1}개"
+    return SimpleNamespace(
+        display_name=display_name,
+        subscription_ids=list(subscription_names),
+        subscription_names=dict(subscription_names)
+    )
+
+def iter_resource_graph_pages(graph_client, query, subscriptions=None, page_size=None):
+    """Resource Graph 쿼리 결과를 skip_token을 따라가며 한 페이지(행 목록)씩 반환하는 제너레이터"""
+    from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+
+    page_size = page_size or RESOURCE_GRAPH_PAGE_SIZE
+    skip_token = None
+    while True:
+        request = QueryRequest(
+            query=query,
+            subscriptions=subscriptions,
+            options=QueryRequestOptions(
+                top=page_size,
+                skip_token=skip_token,
+                result_format="objectArray"
+            )
+        )
+        with span("resource_graph.resources", subscriptions=len(subscriptions or ()), page_size=page_size,
+                  continuation=skip_token is not None) as current:
+            response = graph_client.resources(request)
+            current.set_attribute("rows", len(getattr(response, 'data', None) or []))
+        if not response or not hasattr(response, 'data'):
+            return
         
-        # 가짜 subscription_info 객체 생성
-        class SampleSubscription:
-            def __init__(self):
-                self.display_name = "샘플 구독"
+        yield response.data or []
         
-        return sample_dashboards, SampleSubscription()
+        skip_token = getattr(response, 'skip_token', None)
+        if not skip_token:
+            return
+
+def _iter_resource_graph_rows(graph_client, query, subscriptions=None, page_size=None):
+    """Resource Graph 쿼리 결과를 페이지 단위로 받아 한 행씩 반환하는 제너레이터"""
+    for page in iter_resource_graph_pages(graph_client, query, subscriptions=subscriptions, page_size=page_size):
+        yield from page
+
+def readable_dashboard_names(names):
+    """리소스 이름 Series를 읽기 쉬운 이름으로 한 번에 변환 (끝의 GUID 제거, 하이픈/밑줄을 공백으로, 제목 형태)"""
+    names = names.fillna('Unknown').astype('string[pyarrow]')
+    cleaned = (
+        names
+        .str.replace(_GUID_SUFFIX_PATTERN, '', regex=True)
+        .str.replace(_NAME_SEPARATOR_PATTERN, ' ', regex=True)
+        .str.title()
+    )
+    # 정리 후 비어 있으면 원래 이름 사용
+    cleaned = cleaned.where(cleaned.str.strip().astype(bool), names)
+    return cleaned.where(names.ne('') & names.ne('Unknown'), 'Unknown Dashboard')
+
+def normalize_dashboards(rows, subscription_names):
+    """Resource Graph 결과 행들(DASHBOARD_LIST_QUERY 투영)을 화면 표시용 대시보드 정보 목록으로 변환
+    표시 이름 우선순위와 결과 dict 생성은 행 단위 루프로 처리한다 (결과가 dict 목록이므로 DataFrame을 거치면 오히려 느림).
+    제목 필드가 모두 비어 있는 대시보드의 이름 정리(GUID 제거 등)만 모아서 벡터 연산으로 처리한다.
+    """
+    dashboards = []
+    fallback_positions = []
+    for position, row in enumerate(rows):
+        # 1순위 tags['hidden-title'] → 2순위 model.title → 3순위 properties.displayName
+        display_name = row.get('hiddenTitle') or row.get('modelTitle') or row.get('propertiesDisplayName')
+        if not display_name:
+            fallback_positions.append(position)
+        subscription_id = row.get('subscriptionId')
+        # Resource Graph로 조회되는 대시보드는 모두 공유 대시보드 (개인 대시보드는 Azure 리소스가 아니므로 API로 조회 불가)
+        dashboards.append({
+            'id': row.get('id', ''),
+            'name': row.get('name', 'Unknown'),
+            'displayName': display_name,
+            'resourceGroup': row.get('resourceGroup', 'N/A'),
+            'location': row.get('location', 'global'),
+            'subscriptionId': subscription_id,
+            'subscriptionName': subscription_names.get(subscription_id, subscription_id),
+            'tags': row.get('tags') or {},
+            'isShared': True,
+            'created': row.get('created') or 'N/A',
+            'modified': row.get('modified') or 'N/A'
+        })
+    
+    # 4순위: 리소스 이름을 읽기 쉽게 변환
+    if fallback_positions:
+        names = pd.Series([dashboards[position]['name'] for position in fallback_positions], dtype=object)
+        for position, display_name in zip(fallback_positions, readable_dashboard_names(names).tolist()):
+            dashboards[position]['displayName'] = display_name
+    return dashboards
+
+def get_dashboard_properties(dashboard_id, modified=None):
+    """대시보드 하나의 전체 properties(lenses/타일 JSON)를 필요할 때 조회하는 함수
+    modified가 바뀌면 캐시가 자동으로 무효화된다.
+    """
+    return _fetch_dashboard_properties(dashboard_id, modified)
+
+@lru_cache(maxsize=DASHBOARD_PROPERTIES_CACHE_SIZE)
+def _fetch_dashboard_properties(dashboard_id, modified):
+    graph_client, _ = _get_management_clients()
+    
+    # 리소스 ID에서 구독 추출: /subscriptions/{id}/resourceGroups/...
+    parts = dashboard_id.split('/')
+    subscriptions = [parts[2]] if len(parts) > 2 and parts[1].lower() == 'subscriptions' else None
+    escaped_id = dashboard_id.replace("'", "\\'")
+    query = f"Resources | where type =~ 'microsoft.portal/dashboards' and id =~ '{escaped_id}' | project properties"
+    
+    for row in _iter_resource_graph_rows(graph_client, query, subscriptions=subscriptions, page_size=1):
+        return row.get('properties') or {}
+    return {}
+
+def fetch_dashboard_properties_batch(dashboard_ids):
+    """여러 대시보드의 전체 properties를 id 목록 쿼리로 한 번에 조회해 {소문자 id: properties} 반환"""
+    graph_client, subscription_names = get_resource_graph_clients()
+    if not subscription_names:
+        return {}
+    
+    properties_by_id = {}
+    dashboard_ids = sorted({dashboard_id.lower() for dashboard_id in dashboard_ids})
+    for i in range(0, len(dashboard_ids), CHANGE_FETCH_BATCH_SIZE):
+        id_list = ", ".join("'" + dashboard_id.replace("'", "\\'") + "'" for dashboard_id in dashboard_ids[i:i + CHANGE_FETCH_BATCH_SIZE])
+        query = (
+            "Resources | where type =~ 'microsoft.portal/dashboards' "
+            f"| where tolower(id) in ({id_list}) "
+            "| project id = tolower(id), properties"
+        )
+        subscription_ids = list(subscription_names)
+        for j in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+            batch = subscription_ids[j:j + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+            for row in _iter_resource_graph_rows(graph_client, query, subscriptions=batch):
+                properties_by_id[row['id']] = row.get('properties') or {}
+    return properties_by_id
 
 def generate_dashboard_url(dashboard_id, tenant_id):
     """대시보드 URL 생성"""
     if not dashboard_id or not tenant_id:
         return None
     
-    # Azure Portal 대시보드 URL 형식
-    base_url = "https://portal.azure.com"
-    # ARM 리소스 ID를 URL 경로로 변환
-    dashboard_path = f"/#@{tenant_id}/dashboard/arm{dashboard_id}"
-    return f"{base_url}{dashboard_path}"
+    return DASHBOARD_URL_PREFIX.format(tenant_id=tenant_id) + dashboard_id
+
+def generate_dashboard_urls(dashboard_ids, tenant_id):
+    """generate_dashboard_url의 벡터 버전 - id Series 전체의 URL을 한 번에 생성 (생성할 수 없으면 None)"""
+    if not tenant_id:
+        return pd.Series(None, index=dashboard_ids.index, dtype=object)
+    urls = DASHBOARD_URL_PREFIX.format(tenant_id=tenant_id) + dashboard_ids.fillna('').astype(str)
+    return urls.where(dashboard_ids.fillna('').astype(bool), None)
 
 def display_dashboard_preview(dashboard_url):
     """대시보드 미리보기 표시 (제한적)"""
@@ -207,6 +571,159 @@ def display_dashboard_preview(dashboard_url):
     else:
         st.warning("⚠️ 대시보드 URL을 생성할 수 없습니다.")
 
+def _render_dashboard_details(dashboards):
+    """선택한 대시보드의 타일 구성을 필요할 때만 불러와 표시"""
+    with st.expander("🔎 대시보드 상세 보기", expanded=False):
+        options = {f"{d['displayName']} ({d['resourceGroup']})": d for d in dashboards}
+        selected_label = st.selectbox(
+            "상세 정보를 볼 대시보드를 선택하세요",
+            ["선택 안 함"] + list(options),
+            index=0
+        )
+        if selected_label == "선택 안 함":
+            return
+        
+        dashboard = options[selected_label]
+        with st.spinner("대시보드 구성을 불러오는 중..."):
+            try:
+                properties = get_dashboard_properties(dashboard['id'], dashboard.get('modified'))
+            except Exception as e:
+                st.error(f"❌ 대시보드 상세 정보를 불러올 수 없습니다: {str(e)}")
+                return
+        
+        lenses = properties.get('lenses', {}) if properties else {}
+        lens_list = list(lenses.values()) if isinstance(lenses, dict) else list(lenses or [])
+        part_count = 0
+        for lens in lens_list:
+            parts = lens.get('parts', {}) if isinstance(lens, dict) else {}
+            part_count += len(parts)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🧩 렌즈", len(lens_list))
+        with col2:
+            st.metric("🧱 타일", part_count)
+        with col3:
+            st.metric("🕐 수정", dashboard.get('modified', 'N/A'))
+        
+        if dashboard.get('tags'):
+            st.write("**태그**:")
+            for key, value in dashboard['tags'].items():
+                st.write(f"  - {key}: {value}")
+        st.json(properties, expanded=False)
+
+def _render_tile_analytics(snapshot):
+    """대시보드 타일 인덱스 기반 분석 (타일 유형별 개수, 리소스를 차트로 쓰는 대시보드 검색)"""
+    with st.expander("🧩 타일 분석", expanded=False):
+        st.caption("대시보드의 lenses/parts를 펼친 타일 인덱스로 분석합니다. 변경된 대시보드만 다시 불러옵니다.")
+        if not st.checkbox("타일 인덱스 사용", key="use_tile_index"):
+            return
+        
+        from modules.dashboard_tiles import get_tile_index
+        with st.spinner("타일 인덱스를 갱신하는 중..."):
+            try:
+                tile_index = get_tile_index(snapshot, fetch_dashboard_properties_batch)
+            except Exception as e:
+                st.error(f"❌ 타일 인덱스를 만들 수 없습니다: {str(e)}")
+                return
+        
+        frame = tile_index.frame
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🧱 전체 타일", len(frame))
+        with col2:
+            st.metric("🏷️ 타일 유형", frame['tile_type'].nunique())
+        with col3:
+            st.metric("🖥️ 참조 리소스", frame['resource_id'].nunique())
+        
+        if len(frame):
+            st.write("**타일 유형별 개수**")
+            st.bar_chart(tile_index.tiles_per_type())
+        
+        resource_query = st.text_input(
+            "리소스 ID로 대시보드 찾기",
+            placeholder="/subscriptions/.../resourceGroups/.../providers/Microsoft.Compute/virtualMachines/my-vm"
+        )
+        if resource_query:
+            dashboard_ids = set(tile_index.dashboards_for_resource(resource_query))
+            matched = [d for d in snapshot.data['dashboards'] if d['id'].lower() in dashboard_ids]
+            if matched:
+                st.write(f"**{len(matched)}개 대시보드가 이 리소스를 참조합니다:**")
+                for dashboard in matched:
+                    st.write(f"- {dashboard['displayName']} ({dashboard['resourceGroup']})")
+            else:
+                st.info("이 리소스를 참조하는 대시보드가 없습니다.")
+
+@lru_cache(maxsize=4)
+def _dashboard_frame(snapshot, tenant_id):
+    """스냅샷의 대시보드 목록을 표시용 컬럼(URL, 링크 이름 포함)을 갖춘 DataFrame으로 한 번만 변환
+    스냅샷은 변경되지 않으므로 버전(=스냅샷 객체)별로 메모이즈된다.
+    """
+    dashboards = snapshot.data['dashboards']
+    frame = pd.DataFrame.from_records(
+        [(d['id'], d['displayName'], d['resourceGroup'], d.get('subscriptionName', 'N/A')) for d in dashboards],
+        columns=['id', 'displayName', 'resourceGroup', 'subscriptionName']
+    )
+    urls = generate_dashboard_urls(frame['id'], tenant_id)
+    # 대시보드 이름을 클릭 가능 여부 표시와 함께 생성
+    link_icons = urls.notna().map({True: "🚀 ", False: "❌ "})
+    return pd.DataFrame({
+        'URL': urls.fillna("N/A"),
+        '대시보드 이름': link_icons + frame['displayName'].astype(str),
+        '리소스 그룹': frame['resourceGroup'],
+        '구독': frame['subscriptionName'].fillna('N/A')
+    })
+
+# 패싯 필터 위젯 (패싯 키, 라벨)
+FACET_FILTERS = (
+    ('resourceGroup', "📁 리소스 그룹"),
+    ('location', "📍 위치"),
+    ('subscription', "🔑 구독"),
+    ('tag', "🏷️ 태그"),
+)
+
+@lru_cache(maxsize=32)
+def _build_dashboard_table(snapshot, selections, search_text, tenant_id):
+    """스냅샷과 필터 조건별 (필터된 대시보드, 표시용 DataFrame) 생성
+    selections는 ((패싯, (값, ...)), ...) 형태이며, 스냅샷별 패싯 인덱스의 위치 배열로 필터링한다.
+    """
+    from modules.dashboard_facets import get_facet_index
+
+    dashboards = snapshot.data['dashboards']
+    frame = _dashboard_frame(snapshot, tenant_id)
+    
+    if not search_text and not any(selected for _, selected in selections):
+        return dashboards, frame
+    
+    positions = get_facet_index(snapshot).search(dict(selections), search_text)
+    filtered_dashboards = tuple(dashboards[position] for position in positions)
+    return filtered_dashboards, frame.iloc[positions].reset_index(drop=True)
+
+def _render_facet_filters(facet_index):
+    """검색어와 패싯 필터 위젯을 그리고 (선택 조건, 검색어) 반환
+    각 패싯의 건수는 다른 패싯 선택과 검색어를 적용한 결과 기준으로 표시한다.
+    """
+    search_text = st.text_input("🔎 대시보드 이름 검색", key="dashboard_search", placeholder="이름의 단어(접두사)로 검색")
+    
+    # 위젯보다 먼저 현재 선택값을 읽어 건수 계산에 사용
+    current = {facet: tuple(st.session_state.get(f"dashboard_facet_{facet}", ())) for facet, _ in FACET_FILTERS}
+    
+    selections = {}
+    columns = st.columns(len(FACET_FILTERS))
+    for column, (facet, label) in zip(columns, FACET_FILTERS):
+        counts = facet_index.counts(facet, current, search_text)
+        # 건수가 0인 값은 숨기되 이미 선택한 값은 유지
+        options = [value for value in facet_index.values(facet) if counts[value] or value in current[facet]]
+        with column:
+            selected = st.multiselect(
+                label,
+                options,
+                key=f"dashboard_facet_{facet}",
+                format_func=lambda value, counts=counts: f"{value} ({counts.get(value, 0)})"
+            )
+        selections[facet] = tuple(sorted(selected))
+    return tuple(selections.items()), search_text.strip()
+
 def render_dashboard():
     """Azure Dashboard Hub 메인 페이지"""
     st.title("🌐 Azure Dashboard Hub")
@@ -221,20 +738,27 @@ def render_dashboard():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🔄 새로고침", help="대시보드 목록을 다시 불러옵니다"):
-            # 캐시 클리어
-            for key in ["azure_dashboards_cache", "last_fetch_time"]:
-                if key in st.session_state:
-                    del st.session_state[key]
+            # 공유 스냅샷 무효화
+            invalidate_dashboard_cache()
             st.rerun()
-    
-    with col2:
-        st.caption(f"마지막 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    # 대시보드 데이터 로드
+    # 대시보드 데이터 로드 (모든 세션이 공유하는 스냅샷)
     with st.spinner("🔍 Azure 대시보드를 검색 중..."):
-        dashboards, subscription_info = get_azure_dashboards()
+        snapshot = get_dashboard_snapshot()
+    
+    with col2:
+        if snapshot is not None:
+            refresh_note = " (백그라운드 갱신 중...)" if _dashboard_store.is_refreshing() else ""
+            stats = snapshot.data.get('refresh_stats') or {}
+            if stats.get('mode', '').startswith('incremental'):
+                refresh_note += f" | 증분 갱신: 추가 {stats['added']} · 수정 {stats['modified']} · 삭제 {stats['deleted']}"
+            if snapshot.restored:
+                # 디스크에서 불러온 스냅샷 - 갱신이 끝나면 다음 재실행에서 최신 데이터로 바뀜
+                st.caption(f"💾 {snapshot.fetched_wall.strftime('%Y-%m-%d %H:%M:%S')} 기준 저장된 데이터{refresh_note}")
+            else:
+                st.caption(f"마지막 업데이트: {snapshot.fetched_wall.strftime('%Y-%m-%d %H:%M:%S')}{refresh_note}")
 
-    if dashboards is None:
+    if snapshot is None:
         st.error("❌ Azure 대시보드를 불러올 수 없습니다. 인증 정보를 확인해주세요.")
         
         # 샘플 데이터 표시
@@ -260,12 +784,15 @@ def render_dashboard():
         st.dataframe(df, width='stretch')
         return
 
+    dashboards = snapshot.data['dashboards']
+    subscription_info = snapshot.data['subscription_info']
+
     # 성공적으로 로드된 경우
     if subscription_info:
         st.success(f"✅ 구독 '{subscription_info.display_name}' 연결 성공")
 
     if not dashboards:
-        st.info("📋 현재 구독에서 공유 대시보드를 찾을 수 없습니다.")
+        st.info("📋 접근 가능한 구독에서 공유 대시보드를 찾을 수 없습니다.")
         st.markdown("""
         **공유 대시보드가 없는 이유:**
         - 대부분의 대시보드는 개인용(private)으로 생성됩니다
@@ -274,28 +801,28 @@ def render_dashboard():
         """)
         return
 
+    # 스냅샷별 패싯 인덱스 (통계와 필터에 공통 사용)
+    from modules.dashboard_facets import get_facet_index
+    facet_index = get_facet_index(snapshot)
+
     # 통계 정보 표시
-    col1, col2 = st.columns(2)
-    
-    resource_groups = set(d.get('resourceGroup', 'N/A') for d in dashboards)
+    col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric("📊 총 대시보드", len(dashboards))
     with col2:
-        st.metric("📁 리소스 그룹", len(resource_groups))
+        st.metric("📁 리소스 그룹", len(facet_index.facets['resourceGroup']))
+    with col3:
+        st.metric("🔑 구독", len(facet_index.facets['subscription']))
 
     st.divider()
 
-    # 필터링 옵션
-    # 리소스 그룹 필터
-    rg_options = ["전체"] + sorted(list(resource_groups))
-    selected_rg = st.selectbox("📁 리소스 그룹 필터", rg_options, index=0)
+    # 필터링 옵션 - 검색어 + 패싯 (패싯 간 AND, 패싯 내 OR)
+    selections, search_text = _render_facet_filters(facet_index)
 
-    # 필터 적용
-    filtered_dashboards = dashboards
-    
-    if selected_rg != "전체":
-        filtered_dashboards = [d for d in filtered_dashboards if d.get('resourceGroup') == selected_rg]
+    # 필터 적용 + 테이블 생성 (스냅샷 버전과 필터 조건별로 메모이즈)
+    tenant_id = get_settings().tenant_id or ''
+    filtered_dashboards, df = _build_dashboard_table(snapshot, selections, search_text, tenant_id)
 
     if not filtered_dashboards:
         st.warning("⚠️ 선택한 필터 조건에 맞는 대시보드가 없습니다.")
@@ -304,29 +831,8 @@ def render_dashboard():
         # 대시보드 목록 표시
     st.subheader(f"📋 대시보드 목록 ({len(filtered_dashboards)}개)")
     
-    # 테이블용 데이터 준비 - 클릭 가능한 링크가 포함된 통합 테이블
+    # 클릭 가능한 링크가 포함된 통합 테이블
     if filtered_dashboards:
-        table_data = []
-        tenant_id = os.getenv('AZURE_TENANT_ID', '')
-        
-        for dashboard in filtered_dashboards:
-            dashboard_url = generate_dashboard_url(dashboard['id'], tenant_id)
-            
-            # 대시보드 이름을 클릭 가능한 링크로 생성
-            if dashboard_url:
-                dashboard_name_link = f"🚀 {dashboard['displayName']}"
-            else:
-                dashboard_name_link = f"❌ {dashboard['displayName']}"
-            
-            table_data.append({
-                'URL': dashboard_url if dashboard_url else "N/A",
-                '대시보드 이름': dashboard_name_link,
-                '리소스 그룹': dashboard['resourceGroup']
-            })
-        
-        # 데이터프레임 생성 및 표시 - URL 컬럼을 링크 컬럼으로 설정
-        df = pd.DataFrame(table_data)
-        
         # 클릭 가능한 링크가 포함된 테이블 표시
         st.dataframe(
             df,
@@ -346,6 +852,10 @@ def render_dashboard():
                 "리소스 그룹": st.column_config.TextColumn(
                     "리소스 그룹", 
                     width="medium"
+                ),
+                "구독": st.column_config.TextColumn(
+                    "구독",
+                    width="medium"
                 )
             }
         )
@@ -354,6 +864,11 @@ def render_dashboard():
         
         # 대시보드 링크는 테이블에서 직접 클릭 가능
         
+        # 상세 보기 - 선택한 대시보드의 전체 properties만 지연 조회
+        _render_dashboard_details(filtered_dashboards)
+        
+        # 타일 분석 - 스냅샷 기준 컬럼형 타일 인덱스
+        _render_tile_analytics(snapshot)
 
 
     # 상태 표시
@@ -361,7 +876,10 @@ def render_dashboard():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.success("🟢 Azure 연결: 정상")
+        if snapshot.restored:
+            st.warning(f"🟡 저장된 데이터 표시 중 ({snapshot.fetched_wall.strftime('%Y-%m-%d %H:%M')} 기준)")
+        else:
+            st.success("🟢 Azure 연결: 정상")
     
     with col2:
         st.info(f"🕐 로드 시간: {datetime.now().strftime('%H:%M:%S')}")
@@ -0,0 +1,114 @@
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 패싯 키 → 대시보드 정보 필드 (태그는 "키=값" 형태로 별도 패싯)
+FACET_FIELDS = {
+    'resourceGroup': 'resourceGroup',
+    'location': 'location',
+    'subscription': 'subscriptionName',
+}
+TAG_FACET = 'tag'
+HIDDEN_TAG_KEYS = ('hidden-title',)
+
+# 표시 이름을 토큰으로 나누는 패턴 (영문/숫자/한글 단어 단위)
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text):
+    """검색용 토큰 목록 (소문자)"""
+    return _TOKEN_PATTERN.findall(str(text or '').lower())
+
+def _postings(positions, values):
+    """(위치, 값) 쌍 → {값: 정렬된 위치 배열}
+    값을 정수 코드로 바꾼 뒤 코드 순으로 한 번 정렬해 나누므로 값마다 리스트를 키우지 않는다.
+    """
+    if not len(values):
+        return {}
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    sorted_positions = np.asarray(positions, dtype=np.int32)[order]
+    return dict(zip(uniques.tolist(), np.split(sorted_positions, boundaries)))
+
+def _multi_value_postings(values_by_position):
+    """위치별 값 목록 → {값: 정렬된 위치 배열}"""
+    positions = []
+    values = []
+    for position, position_values in enumerate(values_by_position):
+        positions.extend([position] * len(position_values))
+        values.extend(position_values)
+    return _postings(positions, values)
+
+class FacetIndex:
+    """스냅샷 하나의 대시보드 목록에 대한 역색인
+    패싯(리소스 그룹, 위치, 구독, 태그 키=값)과 표시 이름 토큰마다 대시보드 위치 배열을 미리 만들어 두고,
+    필터는 위치 배열을 마스크로 교집합하여 목록을 다시 훑지 않는다.
+    """
+
+    def __init__(self, dashboards):
+        self.size = len(dashboards)
+        all_positions = range(self.size)
+        self.facets = {
+            facet: _postings(all_positions, [dashboard.get(field) or 'N/A' for dashboard in dashboards])
+            for facet, field in FACET_FIELDS.items()
+        }
+        # hidden-title 태그는 표시 이름과 같으므로 패싯에서 제외 (이름 검색으로 대체)
+        self.facets[TAG_FACET] = _multi_value_postings([
+            [f"{key}={value}" for key, value in (dashboard.get('tags') or {}).items() if key not in HIDDEN_TAG_KEYS]
+            for dashboard in dashboards
+        ])
+        self.tokens = _multi_value_postings([set(tokenize(dashboard.get('displayName'))) for dashboard in dashboards])
+        # 접두사 검색용 정렬된 토큰 목록
+        self.vocabulary = sorted(self.tokens)
+
+    def values(self, facet):
+        """패싯 값 목록 (정렬)"""
+        return sorted(self.facets[facet])
+
+    def _facet_mask(self, facet, selected):
+        """같은 패싯 안에서 선택한 값들은 합집합"""
+        mask = np.zeros(self.size, dtype=bool)
+        postings = self.facets[facet]
+        for value in selected:
+            if value in postings:
+                mask[postings[value]] = True
+        return mask
+
+    def _text_mask(self, query):
+        """검색어의 모든 토큰이 (접두사로) 표시 이름 토큰과 일치하는 대시보드"""
+        mask = np.ones(self.size, dtype=bool)
+        for term in tokenize(query):
+            term_mask = np.zeros(self.size, dtype=bool)
+            start = bisect_left(self.vocabulary, term)
+            for token in self.vocabulary[start:]:
+                if not token.startswith(term):
+                    break
+                term_mask[self.tokens[token]] = True
+            mask &= term_mask
+        return mask
+
+    def _mask(self, selections, text, exclude=None):
+        mask = np.ones(self.size, dtype=bool)
+        for facet, selected in selections.items():
+            if selected and facet != exclude:
+                mask &= self._facet_mask(facet, selected)
+        if text:
+            mask &= self._text_mask(text)
+        return mask
+
+    def search(self, selections, text=''):
+        """선택한 패싯 값(패싯 간 교집합, 패싯 내 합집합)과 검색어에 맞는 대시보드 위치 배열"""
+        return np.flatnonzero(self._mask(selections, text))
+
+    def counts(self, facet, selections, text=''):
+        """해당 패싯의 값별 건수 - 자기 패싯 선택은 제외하고 나머지 조건을 적용한 결과 기준"""
+        mask = self._mask(selections, text, exclude=facet)
+        return {value: int(mask[positions].sum()) for value, positions in self.facets[facet].items()}
+
+@lru_cache(maxsize=2)
+def get_facet_index(snapshot):
+    """스냅샷별 패싯 인덱스 (스냅샷은 변경되지 않으므로 버전마다 한 번만 생성)"""
+    return FacetIndex(snapshot.data['dashboards'])
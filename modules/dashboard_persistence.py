@@ -0,0 +1,108 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+# 저장 형식 버전 (스키마가 바뀌면 올려서 이전 파일을 무시)
+SNAPSHOT_FORMAT_VERSION = "1"
+
+# 대시보드 정보 필드 → 컬럼 (tags는 JSON 문자열, isShared는 정수로 저장)
+DASHBOARD_COLUMNS = (
+    'id', 'name', 'displayName', 'resourceGroup', 'location',
+    'subscriptionId', 'subscriptionName', 'tags', 'isShared', 'created', 'modified'
+)
+
+_COLUMN_LIST = ", ".join(f'"{column}"' for column in DASHBOARD_COLUMNS)
+_SCHEMA = f"""
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE dashboards (position INTEGER PRIMARY KEY, {_COLUMN_LIST});
+"""
+
+class DashboardSnapshotFile:
+    """마지막 정상 대시보드 스냅샷을 로컬 SQLite 파일로 보관 (SnapshotStore persistence)
+    컨테이너 재시작 직후 첫 화면을 Azure 조회 없이 바로 그리고, Azure에 연결할 수 없을 때 대체 데이터로 사용한다.
+    저장은 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일만 본다.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+    def save(self, data, fetched_wall):
+        """스냅샷 데이터 저장 (일부 배치만 성공한 불완전한 스냅샷은 저장하지 않음)"""
+        if not data.get('complete'):
+            return
+        subscription_info = data.get('subscription_info')
+        meta = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'fetched_wall': fetched_wall.isoformat(),
+            'fetched_utc': data['fetched_utc'].isoformat(),
+            'subscription_info': json.dumps({
+                'display_name': subscription_info.display_name,
+                'subscription_ids': list(subscription_info.subscription_ids),
+                'subscription_names': dict(subscription_info.subscription_names)
+            }, ensure_ascii=False) if subscription_info is not None else None
+        }
+        rows = [
+            (position,) + tuple(
+                json.dumps(dashboard.get('tags') or {}, ensure_ascii=False) if column == 'tags'
+                else int(bool(dashboard.get(column))) if column == 'isShared'
+                else dashboard.get(column)
+                for column in DASHBOARD_COLUMNS
+            )
+            for position, dashboard in enumerate(data['dashboards'])
+        ]
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            connection = sqlite3.connect(temp_path)
+            try:
+                connection.executescript(_SCHEMA)
+                connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+                connection.executemany(
+                    f"INSERT INTO dashboards VALUES ({', '.join('?' * (len(DASHBOARD_COLUMNS) + 1))})",
+                    rows
+                )
+                connection.commit()
+            finally:
+                connection.close()
+            os.replace(temp_path, self.path)
+
+    def load(self):
+        """저장된 스냅샷을 (데이터, 조회 시각)으로 반환 (파일이 없거나 형식이 다르면 None)"""
+        if not os.path.exists(self.path):
+            return None
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+                return None
+            tags_index = DASHBOARD_COLUMNS.index('tags')
+            shared_index = DASHBOARD_COLUMNS.index('isShared')
+            dashboards = []
+            for row in connection.execute(f"SELECT {_COLUMN_LIST} FROM dashboards ORDER BY position"):
+                dashboard = dict(zip(DASHBOARD_COLUMNS, row))
+                dashboard['tags'] = json.loads(row[tags_index]) if row[tags_index] not in (None, '{}') else {}
+                dashboard['isShared'] = bool(row[shared_index])
+                dashboards.append(dashboard)
+        finally:
+            connection.close()
+
+        subscription_info = None
+        if meta.get('subscription_info'):
+            subscription_info = SimpleNamespace(**json.loads(meta['subscription_info']))
+        data = {
+            'dashboards': tuple(dashboards),
+            'subscription_info': subscription_info,
+            'messages': (),
+            'fetched_utc': datetime.fromisoformat(meta['fetched_utc']),
+            # 저장 시점에 완전했던 스냅샷이므로 복원 후 증분 갱신의 기준으로 사용
+            'complete': True,
+            'refresh_stats': {'mode': 'restored', 'total': len(dashboards)}
+        }
+        return data, datetime.fromisoformat(meta['fetched_wall'])
@@ -0,0 +1,141 @@
+import threading
+from itertools import chain
+
+import pandas as pd
+
+# 타일 인덱스 컬럼 (대시보드 하나의 lenses/parts를 펼친 결과)
+TILE_COLUMNS = ['dashboard_id', 'lens', 'part', 'tile_type', 'resource_id', 'metric_name']
+
+# 리소스 ID가 담기는 input 이름 후보
+RESOURCE_INPUT_NAMES = ('resourceid', 'resource', 'scope', 'id')
+
+def _as_list(value):
+    """lenses/parts는 {"0": {...}} 형태의 dict이거나 list로 내려옴"""
+    if isinstance(value, dict):
+        # 숫자 키는 숫자 순서로 먼저, 그 밖의 키는 문자열 순서로 (키 형식이 섞여도 비교 가능한 튜플)
+        return [value[key] for key in sorted(value, key=lambda k: (not str(k).isdigit(), int(k) if str(k).isdigit() else 0, str(k)))]
+    return list(value or [])
+
+def _chart_metrics(metadata):
+    """타일 설정(inputs의 options 또는 settings.content.options)에서 차트 메트릭 목록 추출"""
+    metrics = []
+    option_sources = [
+        item.get('value') for item in metadata.get('inputs', []) or []
+        if isinstance(item, dict) and item.get('name') == 'options'
+    ]
+    option_sources.append(((metadata.get('settings') or {}).get('content') or {}).get('options'))
+    for options in option_sources:
+        if isinstance(options, dict):
+            metrics.extend(((options.get('chart') or {}).get('metrics')) or [])
+    return metrics
+
+def flatten_dashboard_tiles(dashboard_id, properties):
+    """대시보드 properties의 lenses/parts를 (dashboard_id, lens, part, tile_type, resource_id, metric_name) 행으로 펼침"""
+    rows = []
+    for lens_index, lens in enumerate(_as_list((properties or {}).get('lenses'))):
+        if not isinstance(lens, dict):
+            continue
+        for part_index, part in enumerate(_as_list(lens.get('parts'))):
+            metadata = (part or {}).get('metadata') or {}
+            tile_type = metadata.get('type', 'Unknown')
+
+            # inputs에 직접 지정된 리소스
+            input_resource = None
+            for item in metadata.get('inputs', []) or []:
+                if isinstance(item, dict) and str(item.get('name', '')).lower() in RESOURCE_INPUT_NAMES:
+                    if isinstance(item.get('value'), str) and item['value'].startswith('/subscriptions/'):
+                        input_resource = item['value'].lower()
+                        break
+
+            metrics = _chart_metrics(metadata)
+            if metrics:
+                for metric in metrics:
+                    resource_id = ((metric.get('resourceMetadata') or {}).get('id') or input_resource or '')
+                    rows.append((dashboard_id, lens_index, part_index, tile_type, resource_id.lower() or None, metric.get('name')))
+            else:
+                rows.append((dashboard_id, lens_index, part_index, tile_type, input_resource, None))
+    return rows
+
+def _to_frame(rows):
+    frame = pd.DataFrame(list(rows), columns=TILE_COLUMNS)
+    # 반복되는 문자열 컬럼은 category로 저장해 메모리와 필터 비용을 줄임
+    for column in ('dashboard_id', 'tile_type', 'resource_id', 'metric_name'):
+        frame[column] = frame[column].astype('category')
+    return frame
+
+class TileIndex:
+    """대시보드 타일을 펼친 컬럼형 테이블
+    스냅샷이 바뀌면 (id, modified)가 달라진 대시보드만 다시 펼쳐 반영한다.
+    """
+
+    def __init__(self):
+        self.frame = _to_frame([])
+        self.snapshot_version = None   # 모든 대시보드가 반영된 스냅샷 버전
+        self._applied_version = None   # 마지막으로 (일부라도) 반영한 스냅샷 버전
+        self._indexed = {}  # 소문자 대시보드 id → modified
+        self._rows = {}     # 소문자 대시보드 id → 펼친 타일 행
+        self._lock = threading.Lock()
+
+    def update(self, snapshot, fetch_properties_batch):
+        """스냅샷 기준으로 추가/수정/삭제된 대시보드만 반영하고 (추가·수정, 삭제) 개수를 반환
+        properties 조회(네트워크)는 잠금 밖에서 하고 결과만 잠금 안에서 합친다. 조회 결과에 없는 대시보드는
+        반영하지 않으므로 다음 update()에서 다시 조회한다.
+        """
+        with self._lock:
+            if self.snapshot_version == snapshot.version:
+                return 0, 0
+            current = {d['id'].lower(): d.get('modified') for d in snapshot.data['dashboards']}
+            changed_ids = [dashboard_id for dashboard_id, modified in current.items() if self._indexed.get(dashboard_id, object()) != modified]
+
+        properties_by_id = fetch_properties_batch(changed_ids) if changed_ids else {}
+
+        with self._lock:
+            # 조회하는 동안 다른 세션이 같은 스냅샷이나 더 새 스냅샷을 반영했으면 버림
+            if self.snapshot_version == snapshot.version or (
+                    self._applied_version is not None and self._applied_version > snapshot.version):
+                return 0, 0
+
+            fetched_ids = [dashboard_id for dashboard_id in changed_ids if dashboard_id in properties_by_id]
+            for dashboard_id in fetched_ids:
+                # JSON 순회는 바뀐 대시보드에 대해서만 수행
+                self._rows[dashboard_id] = flatten_dashboard_tiles(dashboard_id, properties_by_id[dashboard_id])
+                self._indexed[dashboard_id] = current[dashboard_id]
+            removed_ids = set(self._indexed) - set(current)
+            for dashboard_id in removed_ids:
+                self._rows.pop(dashboard_id, None)
+                self._indexed.pop(dashboard_id, None)
+
+            if fetched_ids or removed_ids:
+                self.frame = _to_frame(chain.from_iterable(self._rows.values()))
+            self._applied_version = snapshot.version
+            if len(fetched_ids) == len(changed_ids):
+                self.snapshot_version = snapshot.version
+            return len(fetched_ids), len(removed_ids)
+
+    def dashboards_for_resource(self, resource_id):
+        """해당 리소스를 참조하는 타일이 있는 대시보드 id 목록 (리소스 ID 접두사 일치)"""
+        frame = self.frame
+        if not len(frame) or not resource_id:
+            return []
+        # 행 전체 대신 고유 리소스(category) 목록에서만 문자열 비교
+        categories = frame['resource_id'].cat.categories
+        matched = categories[categories.str.startswith(resource_id.strip().lower())]
+        mask = frame['resource_id'].isin(matched)
+        return sorted(frame.loc[mask, 'dashboard_id'].astype(str).unique())
+
+    def tiles_per_type(self):
+        """타일 유형별 개수"""
+        return self.frame.groupby('tile_type', observed=True).size().sort_values(ascending=False)
+
+    def metrics_per_resource(self):
+        """리소스별로 차트에 사용된 메트릭 수"""
+        frame = self.frame.dropna(subset=['resource_id', 'metric_name'])
+        return frame.groupby('resource_id', observed=True)['metric_name'].nunique().sort_values(ascending=False)
+
+# 프로세스 단위로 공유하는 타일 인덱스
+_tile_index = TileIndex()
+
+def get_tile_index(snapshot, fetch_properties_batch):
+    """공유 타일 인덱스를 스냅샷에 맞게 갱신한 뒤 반환"""
+    _tile_index.update(snapshot, fetch_properties_batch)
+    return _tile_index
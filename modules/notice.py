@@ -1,31 +1,17 @@
 import streamlit as st
 import time
-import json
-from pathlib import Path
 
-# 공지사항 영속화를 위한 경로 설정
-BASE_DIR = Path(__file__).resolve().parent.parent
-NOTICES_FILE = BASE_DIR / "data" / "notices.json"
+from modules.notice_store import get_notices_snapshot, create_notice, delete_notice, clear_notices, record_ai_check
 
-def _load_notices():
+def _save(action, *args):
+    """공지 저장 작업 실행 (실패 시 경고 표시 후 None)"""
     try:
-        NOTICES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        if NOTICES_FILE.exists():
-            with open(NOTICES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return []
-
-def _save_notices(notices):
-    try:
-        NOTICES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(NOTICES_FILE, "w", encoding="utf-8") as f:
-            json.dump(notices, f, ensure_ascii=False, indent=2)
+        return action(*args)
     except Exception as e:
         st.warning(f"공지 저장 실패: {e}")
+        return None
 
-def _perform_ai_code_check(notice, notice_index):
+def _perform_ai_code_check(notice):
     """AI를 통한 코드 준수 점검 수행"""
     if "ai_check_config" not in st.session_state:
         st.error("AI 점검 설정이 없습니다.")
@@ -161,33 +147,17 @@ def _perform_ai_code_check(notice, notice_index):
                     "citations": []
                 })
         
-        # 결과를 세션 상태에 저장
-        if "ai_check_results" not in st.session_state:
-            st.session_state["ai_check_results"] = {}
-        
-        st.session_state["ai_check_results"][notice_index] = {
-            "container": container,
-            "index": index,
-            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-            "results": results
-        }
-        
-        # AI 점검 결과를 공지사항에 저장 (컨테이너/인덱스별 최신 1건씩 저장)
-        notice = st.session_state["notices"][notice_index]
-        if "ai_check_results_by_env" not in notice:
-            notice["ai_check_results_by_env"] = {}
-        
-        # 컨테이너/인덱스 조합을 키로 사용
+        # AI 점검 결과를 공지사항에 저장 (컨테이너/인덱스 조합별 최신 1건씩, 모든 세션이 공유)
         env_key = f"{container}|{index}"
-        notice["ai_check_results_by_env"][env_key] = {
+        _save(record_ai_check, notice["id"], env_key, {
             "container": container,
             "index": index,
             "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
             "results": results
-        }
+        })
         
-        # 공지사항 파일에 저장
-        _save_notices(st.session_state["notices"])
+        # 세션에는 이번에 점검한 조합만 기록 (결과 본문은 공유 공지 목록에서 읽음)
+        st.session_state.setdefault("ai_check_results", {})[notice["id"]] = env_key
         
         st.success("AI 점검이 완료되었습니다!")
         st.rerun()
@@ -242,9 +212,8 @@ def render_notice_board():
     st.title("📌 공지사항")
     st.write("팀의 소스 코드 표준 변경 공지를 작성하고 공유하세요.")
 
-    # 최초 로드 시 파일에서 불러오기
-    if "notices" not in st.session_state:
-        st.session_state["notices"] = _load_notices()
+    # 프로세스 공유 공지 목록 (변경 불가, 세션에 복사하지 않음 - 파일이 바뀌면 자동으로 새 버전)
+    notices = get_notices_snapshot().data
 
     # AI 점검 설정 섹션
     st.subheader("🔍 AI 코드 준수 점검")
@@ -254,11 +223,8 @@ def render_notice_board():
         with col1:
             st.markdown("**컨테이너 선택**")
             try:
-                # AI Chat 모듈의 실제 Blob Storage 컨테이너 조회 함수 사용
-                import sys
-                from pathlib import Path
-                sys.path.append(str(Path(__file__).resolve().parent))
-                from ai_chat import get_azure_storage_containers
+                # AI Chat 모듈의 실제 Blob Storage 컨테이너 조회 함수 사용 (같은 모듈 객체를 써야 캐시가 공유됨)
+                from modules.ai_chat import get_azure_storage_containers
                 
                 containers_data = get_azure_storage_containers()
                 if containers_data:
@@ -332,14 +298,13 @@ def render_notice_board():
     with col_header:
         st.subheader("📣 공지 목록")
     with col_clear:
-        if st.session_state["notices"]:  # 공지가 있을 때만 표시
+        if notices:  # 공지가 있을 때만 표시
             if "clear_all_confirm" not in st.session_state:
                 st.session_state["clear_all_confirm"] = False
             
             if st.session_state["clear_all_confirm"]:
                 if st.button("⚠️ 전체 삭제 확인", type="primary"):
-                    st.session_state["notices"] = []
-                    _save_notices(st.session_state["notices"])
+                    _save(clear_notices)
                     st.session_state["clear_all_confirm"] = False
                     st.success("모든 공지사항이 삭제되었습니다.")
                     st.rerun()
@@ -351,47 +316,47 @@ def render_notice_board():
                     st.session_state["clear_all_confirm"] = True
                     st.rerun()
     
-    if not st.session_state["notices"]:
+    if not notices:
         st.info("등록된 공지가 없습니다.")
     else:
         # 삭제 확인을 위한 세션 상태 초기화
         if "delete_confirm" not in st.session_state:
             st.session_state["delete_confirm"] = {}
         
-        for i, n in enumerate(st.session_state["notices"]):
+        for n in notices:
+            notice_id = n["id"]
             with st.expander(f"{n.get('timestamp','')} - {n.get('title','(제목 없음)')}"):
-                # 상단에 버튼들 추가
+                # 상단에 버튼들 추가 (위젯 키는 공지 id 기준 - 다른 세션이 목록을 바꿔도 유지됨)
                 col_delete, col_ai_check, col_empty = st.columns([1, 1, 4])
                 with col_delete:
-                    delete_key = f"delete_{i}"
+                    delete_key = f"delete_{notice_id}"
                     
                     # 삭제 확인 상태 확인
                     if st.session_state["delete_confirm"].get(delete_key, False):
                         st.error("⚠️ 정말 삭제하시겠습니까?")
                         col_yes, col_no = st.columns(2)
                         with col_yes:
-                            if st.button("✅ 예", key=f"confirm_yes_{i}"):
+                            if st.button("✅ 예", key=f"confirm_yes_{notice_id}"):
                                 # 실제 삭제 수행
-                                st.session_state["notices"].pop(i)
-                                _save_notices(st.session_state["notices"])
+                                _save(delete_notice, notice_id)
                                 st.session_state["delete_confirm"][delete_key] = False
                                 st.success("공지사항이 삭제되었습니다.")
                                 st.rerun()
                         with col_no:
-                            if st.button("❌ 아니요", key=f"confirm_no_{i}"):
+                            if st.button("❌ 아니요", key=f"confirm_no_{notice_id}"):
                                 st.session_state["delete_confirm"][delete_key] = False
                                 st.rerun()
                     else:
-                        if st.button("🗑️ 삭제", key=f"delete_btn_{i}"):
+                        if st.button("🗑️ 삭제", key=f"delete_btn_{notice_id}"):
                             st.session_state["delete_confirm"][delete_key] = True
                             st.rerun()
                 
                 with col_ai_check:
                     # AI 점검 버튼
                     ai_check_disabled = "ai_check_config" not in st.session_state
-                    if st.button("🤖 AI 점검하기", key=f"ai_check_{i}", disabled=ai_check_disabled,
+                    if st.button("🤖 AI 점검하기", key=f"ai_check_{notice_id}", disabled=ai_check_disabled,
                                 help="선택된 인덱스에서 코드 준수 여부를 점검합니다" if not ai_check_disabled else "먼저 컨테이너와 인덱스를 선택하세요"):
-                        _perform_ai_code_check(n, i)
+                        _perform_ai_code_check(n)
                 
                 # 공지사항 내용
                 if n.get("desc"):
@@ -427,26 +392,16 @@ def render_notice_board():
                 current_container = current_config.get("container")
                 current_index = current_config.get("index")
                 
-                result_displayed = False
-                
-                # 현재 세션 결과 확인 (컨테이너/인덱스 일치 시에만 표시)
-                if ("ai_check_results" in st.session_state and 
-                    i in st.session_state["ai_check_results"]):
-                    session_check = st.session_state["ai_check_results"][i]
-                    if (session_check.get("container") == current_container and 
-                        session_check.get("index") == current_index):
-                        st.divider()
-                        _display_ai_check_results(session_check)
-                        result_displayed = True
-                
-                # 저장된 최신 AI 점검 결과 표시 (세션 결과가 없거나 매칭되지 않을 때만)
-                if not result_displayed and n.get("ai_check_results_by_env") and current_container and current_index:
+                # 저장된 최신 AI 점검 결과 표시 (컨테이너/인덱스 일치 시에만)
+                if n.get("ai_check_results_by_env") and current_container and current_index:
                     env_key = f"{current_container}|{current_index}"
                     if env_key in n["ai_check_results_by_env"]:
                         latest_check = n["ai_check_results_by_env"][env_key]
                         st.divider()
-                        st.markdown("### 🤖 최근 AI 점검 결과")
-                        st.info(f"**{latest_check.get('container')}** 컨테이너의 **{latest_check.get('index')}** 인덱스에서 점검한 결과입니다.")
+                        # 이 세션에서 방금 점검한 결과가 아니면 이전 점검 결과임을 안내
+                        if st.session_state.get("ai_check_results", {}).get(notice_id) != env_key:
+                            st.markdown("### 🤖 최근 AI 점검 결과")
+                            st.info(f"**{latest_check.get('container')}** 컨테이너의 **{latest_check.get('index')}** 인덱스에서 점검한 결과입니다.")
                         _display_ai_check_results(latest_check)
 
     # 구분선 추가
@@ -531,15 +486,12 @@ def render_notice_board():
                 elif not valid_changes:
                     st.warning("최소 하나의 변경 전/후 소스를 입력하세요.")
                 else:
-                    new_item = {
+                    _save(create_notice, {
                         "title": title,
                         "desc": desc,
                         "lang": lang,
                         "code_changes": valid_changes,
-                        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    st.session_state["notices"].insert(0, new_item)
-                    _save_notices(st.session_state["notices"])
+                    })
                     
                     # 폼 초기화
                     st.session_state["new_notice_code_changes"] = [{"before": "", "after": ""}]
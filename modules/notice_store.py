@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import hashlib
+import uuid
+import threading
+from pathlib import Path
+
+from azureai.shared import shared_dataset, thaw
+
+# 공지사항 영속화를 위한 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent
+NOTICES_FILE = BASE_DIR / "data" / "notices.json"
+
+# API로 수정할 수 있는 공지 필드 (AI 점검 결과는 점검 기능에서만 기록)
+EDITABLE_FIELDS = ("title", "desc", "lang", "code_changes")
+
+# 같은 프로세스 안의 읽기-수정-쓰기를 직렬화 (Streamlit 세션과 API 워커가 공유)
+_lock = threading.RLock()
+
+def new_notice_id():
+    return uuid.uuid4().hex[:12]
+
+def _ensure_ids(notices):
+    """id가 없는 기존 공지에 id 부여 (다음 저장 시 파일에 기록됨)
+    작성 시각/제목으로 만든 id이므로 저장 전에 파일을 다시 읽어도 같은 id가 된다 (세션 위젯 키로 사용).
+    """
+    used = {notice.get("id") for notice in notices}
+    for notice in notices:
+        if not notice.get("id"):
+            seed = f"{notice.get('timestamp', '')}|{notice.get('title', '')}"
+            notice_id = hashlib.sha1(seed.encode("utf-8")).hexdigest()[:12]
+            while notice_id in used:
+                seed += "+"
+                notice_id = hashlib.sha1(seed.encode("utf-8")).hexdigest()[:12]
+            notice["id"] = notice_id
+            used.add(notice_id)
+    return notices
+
+def _file_token():
+    """공지 파일이 바뀌었는지 판단하는 값 (다른 프로세스가 저장한 경우 공유 스냅샷을 다시 읽음)"""
+    try:
+        stat = NOTICES_FILE.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def load_notices():
+    """공지 목록 읽기 (파일이 없거나 읽을 수 없으면 빈 목록)"""
+    try:
+        if NOTICES_FILE.exists():
+            with open(NOTICES_FILE, "r", encoding="utf-8") as f:
+                return _ensure_ids(json.load(f))
+    except Exception:
+        pass
+    return []
+
+def _write(notices):
+    # 임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않음
+    NOTICES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = NOTICES_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(notices, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, NOTICES_FILE)
+
+def save_notices(notices):
+    """공지 목록 저장 후 모든 세션이 보는 공유 스냅샷을 새 버전으로 교체"""
+    with _lock:
+        _write(notices)
+        return _notices.publish(notices)
+
+# 모든 세션/API 워커가 같은 불변 공지 목록(tuple of FrozenDict)을 참조 - 세션에는 복사본을 두지 않음
+_notices = shared_dataset("notices", load_notices, _file_token)
+
+def get_notices_snapshot():
+    """현재 공지 목록 스냅샷 (data: 변경 불가 공지 tuple, version: 변경될 때마다 증가)"""
+    return _notices.get()
+
+def _modify(change):
+    """현재 공지 목록의 수정용 복사본에 change를 적용해 저장 (change가 False를 반환하면 저장하지 않고 False)"""
+    with _lock:
+        notices = thaw(_notices.get().data)
+        if change(notices) is False:
+            return False
+        save_notices(notices)
+    return True
+
+def _find(notices, notice_id):
+    return next((n for n in notices if n.get("id") == notice_id), None)
+
+def validate_notice_fields(fields, partial=False):
+    """공지 입력값 검증 - 허용된 필드만 남겨 반환하고 잘못된 값이면 ValueError"""
+    unknown = set(fields) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"수정할 수 없는 필드입니다: {', '.join(sorted(unknown))}")
+    if not partial or "title" in fields:
+        if not isinstance(fields.get("title"), str) or not fields["title"].strip():
+            raise ValueError("제목(title)을 입력하세요.")
+    for key in ("desc", "lang"):
+        if key in fields and not isinstance(fields[key], str):
+            raise ValueError(f"{key}는 문자열이어야 합니다.")
+    if "code_changes" in fields:
+        changes = fields["code_changes"]
+        if (not isinstance(changes, list)
+                or not all(isinstance(c, dict) and isinstance(c.get("before", ""), str) and isinstance(c.get("after", ""), str)
+                           for c in changes)):
+            raise ValueError("code_changes는 {before, after} 문자열 객체의 목록이어야 합니다.")
+        fields = dict(fields, code_changes=[
+            {"before": c.get("before", ""), "after": c.get("after", "")}
+            for c in changes if c.get("before", "").strip() or c.get("after", "").strip()
+        ])
+        if not fields["code_changes"]:
+            raise ValueError("최소 하나의 변경 전/후 소스를 입력하세요.")
+    elif not partial:
+        raise ValueError("최소 하나의 변경 전/후 소스를 입력하세요.")
+    return fields
+
+def list_notices():
+    return get_notices_snapshot().data
+
+def get_notice(notice_id):
+    """id로 공지 조회 (없으면 None)"""
+    return _find(get_notices_snapshot().data, notice_id)
+
+def create_notice(fields):
+    """새 공지를 목록 맨 앞에 추가하고 반환"""
+    fields = validate_notice_fields(fields)
+    notice = {
+        "id": new_notice_id(),
+        "title": fields["title"],
+        "desc": fields.get("desc", ""),
+        "lang": fields.get("lang", "python"),
+        "code_changes": fields["code_changes"],
+        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    _modify(lambda notices: notices.insert(0, notice))
+    return get_notice(notice["id"])
+
+def update_notice(notice_id, fields):
+    """공지 일부 필드 수정 후 반환 (없으면 None)"""
+    fields = validate_notice_fields(fields, partial=True)
+
+    def change(notices):
+        notice = _find(notices, notice_id)
+        if notice is None:
+            return False
+        notice.update(fields)
+
+    return get_notice(notice_id) if _modify(change) else None
+
+def delete_notice(notice_id):
+    """공지 삭제 (삭제했으면 True)"""
+    def change(notices):
+        notice = _find(notices, notice_id)
+        if notice is None:
+            return False
+        notices.remove(notice)
+
+    return _modify(change)
+
+def clear_notices():
+    """모든 공지 삭제"""
+    save_notices([])
+
+def record_ai_check(notice_id, env_key, check):
+    """공지의 AI 점검 결과를 컨테이너/인덱스 조합(env_key)별 최신 1건으로 저장 (공지가 없으면 False)"""
+    def change(notices):
+        notice = _find(notices, notice_id)
+        if notice is None:
+            return False
+        notice.setdefault("ai_check_results_by_env", {})[env_key] = check
+
+    return _modify(change)
@@ -0,0 +1,199 @@
+import streamlit as st
+import re
+import io
+import time
+import hashlib
+import importlib.util
+from datetime import datetime
+from itertools import chain
+
+import pandas as pd
+
+from azureai.cache import get_cache
+from modules.dashboard import get_resource_graph_clients, iter_resource_graph_pages, RESOURCE_GRAPH_MAX_SUBSCRIPTIONS
+
+# 쿼리 결과 캐시 (프로세스 단위, 정규화된 쿼리 해시 기준)
+QUERY_CACHE_MAX_ENTRIES = 32
+QUERY_TTL_OPTIONS = {"1분": 60, "5분": 300, "15분": 900, "1시간": 3600}
+MAX_ROWS_OPTIONS = [1000, 5000, 20000, 100000]
+
+EXAMPLE_QUERY = """Resources
+| summarize count() by type
+| order by count_ desc"""
+
+_query_cache = get_cache("resource_graph.query", max_entries=QUERY_CACHE_MAX_ENTRIES)
+
+# 문자열 리터럴('...' 또는 "...")은 그대로 두고 나머지 공백만 정리하기 위한 패턴
+_KQL_TOKEN_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\s+|[^'\"\s]+")
+
+def normalize_query(query):
+    """캐시 키용 KQL 정규화 - 문자열 리터럴 밖의 공백을 한 칸으로 줄이고 끝의 세미콜론 제거"""
+    tokens = []
+    for token in _KQL_TOKEN_PATTERN.findall(query.strip().rstrip(';').strip()):
+        tokens.append(' ' if token.isspace() else token)
+    return ''.join(tokens)
+
+def _cache_key(query, max_rows, subscription_ids):
+    payload = "\n".join([normalize_query(query), str(max_rows), ",".join(sorted(subscription_ids))])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def clear_query_cache():
+    """쿼리 결과 캐시 비우기"""
+    _query_cache.invalidate()
+
+def run_resource_graph_query(query, ttl_seconds=300, max_rows=5000, use_cache=True, on_page=None):
+    """임의의 KQL을 Resource Graph에서 페이지 단위로 실행해 DataFrame으로 반환하는 함수
+    결과는 정규화된 쿼리 해시로 ttl_seconds 동안 캐시되며, on_page(누적 행 수)로 진행 상황을 알린다.
+    반환: {'frame', 'fetched_at', 'elapsed_ms', 'pages', 'truncated', 'cached'}
+    """
+    graph_client, subscription_names = get_resource_graph_clients()
+    subscription_ids = list(subscription_names)
+    key = _cache_key(query, max_rows, subscription_ids)
+
+    if use_cache:
+        entry = _query_cache.get(key)
+        if entry is not None:
+            return dict(entry, cached=True)
+
+    start = time.perf_counter()
+    frames = []
+    row_count = 0
+    page_count = 0
+    truncated = False
+    batches = [
+        subscription_ids[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+        for i in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS)
+    ] or [None]
+    pages = chain.from_iterable(
+        iter_resource_graph_pages(graph_client, query, subscriptions=batch) for batch in batches
+    )
+    for page in pages:
+        if not page:
+            continue
+        # 페이지마다 바로 DataFrame으로 변환해 원본 dict 목록을 오래 들고 있지 않음
+        remaining = max_rows - row_count
+        frames.append(pd.DataFrame.from_records(page[:remaining]))
+        row_count += min(len(page), remaining)
+        page_count += 1
+        if on_page:
+            on_page(row_count)
+        if row_count >= max_rows:
+            # 버린 행이 있거나 뒤에 행이 남아 있을 때만 잘린 결과
+            # (skip_token이 없으면 다음 페이지 요청 없이 끝나므로 정확히 max_rows행인 결과는 추가 요청 없이 판정됨)
+            truncated = len(page) > remaining or any(pages)
+            break
+
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    entry = {
+        'frame': frame,
+        'fetched_at': datetime.now(),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        'pages': page_count,
+        'truncated': truncated
+    }
+    _query_cache.set(key, entry, ttl_seconds)
+    return dict(entry, cached=False)
+
+def _to_csv_bytes(frame):
+    """CSV 변환 (Excel에서 한글이 깨지지 않도록 BOM 포함)"""
+    return frame.to_csv(index=False).encode('utf-8-sig')
+
+def _parquet_available():
+    return any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet"))
+
+def _to_parquet_bytes(frame):
+    """Parquet 변환 (pyarrow/fastparquet가 없으면 None)"""
+    # 중첩된 dict/list 컬럼은 Parquet 엔진이 처리할 수 있도록 문자열로 변환
+    export_frame = frame.copy()
+    for column in export_frame.columns:
+        if export_frame[column].map(lambda value: isinstance(value, (dict, list))).any():
+            export_frame[column] = export_frame[column].astype(str)
+    buffer = io.BytesIO()
+    try:
+        export_frame.to_parquet(buffer, index=False)
+    except ImportError:
+        return None
+    return buffer.getvalue()
+
+def render_resource_graph_explorer():
+    """Resource Graph 탐색기 페이지"""
+    st.title("🧭 Resource Graph 탐색기")
+    st.write("Azure Resource Graph에 KQL 쿼리를 실행하고 결과를 내보내세요. 같은 쿼리는 캐시에서 바로 반환됩니다.")
+
+    query = st.text_area("KQL 쿼리", value=EXAMPLE_QUERY, height=160)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        ttl_label = st.selectbox("캐시 유지 시간", list(QUERY_TTL_OPTIONS), index=1)
+    with col2:
+        max_rows = st.selectbox("최대 행 수", MAX_ROWS_OPTIONS, index=1)
+    with col3:
+        bypass_cache = st.checkbox("캐시 무시하고 다시 실행", value=False)
+
+    col_run, col_clear = st.columns([1, 4])
+    with col_run:
+        run_clicked = st.button("▶️ 실행", type="primary")
+    with col_clear:
+        if st.button("🗑️ 쿼리 캐시 비우기"):
+            clear_query_cache()
+            st.success("쿼리 캐시를 비웠습니다.")
+
+    if run_clicked:
+        if not query.strip():
+            st.warning("⚠️ 쿼리를 입력해주세요.")
+            return
+
+        progress_text = st.empty()
+        try:
+            result = run_resource_graph_query(
+                query,
+                ttl_seconds=QUERY_TTL_OPTIONS[ttl_label],
+                max_rows=max_rows,
+                use_cache=not bypass_cache,
+                on_page=lambda rows: progress_text.caption(f"⏳ {rows:,}행 수신 중...")
+            )
+        except ImportError as e:
+            st.error(f"❌ 필요한 Azure SDK 패키지가 설치되지 않았습니다: {str(e)}")
+            return
+        except Exception as e:
+            st.error(f"❌ 쿼리 실행 실패: {str(e)}")
+            return
+        progress_text.empty()
+        # 재실행 시에도 결과를 유지하기 위해 세션에는 결과 참조만 보관
+        st.session_state["resource_graph_result"] = result
+
+    result = st.session_state.get("resource_graph_result")
+    if not result:
+        return
+
+    frame = result['frame']
+    source = "⚡ 캐시" if result['cached'] else f"🌐 Azure ({result['pages']}페이지)"
+    st.caption(
+        f"{source} | {len(frame):,}행 | 조회 {result['elapsed_ms']:.0f} ms | "
+        f"기준 시각 {result['fetched_at'].strftime('%Y-%m-%d %H:%M:%S')}"
+    )
+    if result['truncated']:
+        st.warning(f"⚠️ 최대 행 수({len(frame):,})에서 결과를 잘랐습니다.")
+
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+
+    if len(frame):
+        # 내보내기 파일은 버튼을 눌렀을 때만 만듦 (rerun마다 전체 결과를 직렬화하지 않도록 callable 전달)
+        col_csv, col_parquet = st.columns(2)
+        with col_csv:
+            st.download_button(
+                "⬇️ CSV 내보내기",
+                data=lambda: _to_csv_bytes(frame),
+                file_name="resource_graph_result.csv",
+                mime="text/csv"
+            )
+        with col_parquet:
+            if _parquet_available():
+                st.download_button(
+                    "⬇️ Parquet 내보내기",
+                    data=lambda: _to_parquet_bytes(frame),
+                    file_name="resource_graph_result.parquet",
+                    mime="application/octet-stream"
+                )
+            else:
+                st.caption("💡 Parquet 내보내기는 pyarrow 패키지가 필요합니다.")
@@ -0,0 +1,50 @@
+import sys
+import time
+import logging
+import threading
+import importlib
+
+logger = logging.getLogger(__name__)
+
+# 메뉴 이름 → (페이지 모듈, 렌더 함수). 페이지 모듈은 처음 선택될 때 import 된다.
+PAGES = {
+    "대시보드 보기": ("modules.dashboard", "render_dashboard"),
+    "공지사항": ("modules.notice", "render_notice_board"),
+    "AI에게 질문하기": ("modules.ai_chat", "render_ai_chat"),
+    "Resource Graph 탐색기": ("modules.resource_graph", "render_resource_graph_explorer"),
+}
+
+# import 비용 보고에서 따로 표시할 무거운 의존성
+HEAVY_PACKAGES = ("pandas", "numpy", "pyarrow", "openai", "azure")
+
+_import_report = {}
+_import_lock = threading.Lock()
+
+def load_page(page):
+    """선택한 페이지의 렌더 함수를 반환 (모듈은 처음 한 번만 import 하고 소요 시간을 기록)"""
+    module_name, function_name = PAGES[page]
+    module = sys.modules.get(module_name)
+    if module is None:
+        with _import_lock:
+            module = sys.modules.get(module_name)
+            if module is None:
+                loaded_before = set(sys.modules)
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                new_modules = set(sys.modules) - loaded_before
+                heavy = sorted({name.split('.')[0] for name in new_modules if name.split('.')[0] in HEAVY_PACKAGES})
+                _import_report[module_name] = {
+                    'page': page,
+                    'elapsed_ms': round(elapsed_ms, 1),
+                    'new_modules': len(new_modules),
+                    'heavy_packages': heavy
+                }
+                logger.info("페이지 모듈 import: %s %.1f ms (새 모듈 %d개, 무거운 의존성: %s)",
+                            module_name, elapsed_ms, len(new_modules), ", ".join(heavy) or "-")
+    return getattr(module, function_name)
+
+def get_import_report():
+    """지금까지 import 한 페이지 모듈별 소요 시간 목록 (import 순서)"""
+    with _import_lock:
+        return [dict(entry, module=module_name) for module_name, entry in _import_report.items()]
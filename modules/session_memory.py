@@ -0,0 +1,44 @@
+import streamlit as st
+
+from azureai.shared import deep_sizeof, get_shared_datasets, shared_object_ids
+
+# 사이드바에 표시할 최대 session_state 키 수 (큰 순서)
+MAX_SESSION_KEYS = 15
+
+def _format_bytes(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+def session_memory_report():
+    """현재 세션 session_state의 키별 대략적인 메모리 (공유 데이터셋을 참조하는 부분은 세지 않음)
+    여러 키가 같은 객체를 참조하면 처음 센 키에만 포함된다.
+    """
+    exclude_ids = shared_object_ids()
+    seen = set()
+    rows = []
+    for key, value in st.session_state.to_dict().items():
+        rows.append({"key": key, "type": type(value).__name__, "bytes": deep_sizeof(value, exclude_ids, seen)})
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    return rows
+
+def render_session_memory(container=st.sidebar):
+    """이 세션이 따로 차지하는 메모리와 모든 세션이 한 벌씩 공유하는 데이터셋 크기 표시"""
+    rows = session_memory_report()
+    total = sum(row["bytes"] for row in rows)
+    container.caption(f"이 세션: {_format_bytes(total)} (session_state 키 {len(rows)}개, 공유 데이터 제외)")
+    # True/False/None처럼 프로세스 전체가 함께 쓰는 값만 가진 키(0 B)는 생략
+    sized = [row for row in rows if row["bytes"]]
+    for row in sized[:MAX_SESSION_KEYS]:
+        container.caption(f"· {row['key']} ({row['type']}): {_format_bytes(row['bytes'])}")
+    if len(sized) > MAX_SESSION_KEYS:
+        rest = sum(row["bytes"] for row in sized[MAX_SESSION_KEYS:])
+        container.caption(f"· 그 외 {len(sized) - MAX_SESSION_KEYS}개: {_format_bytes(rest)}")
+
+    for dataset in get_shared_datasets():
+        stats = dataset.stats()
+        if stats["version"] is None:
+            continue
+        container.caption(f"공유 {stats['name']} v{stats['version']}: {_format_bytes(stats['bytes'])} (프로세스당 한 벌)")
@@ -0,0 +1,76 @@
+import functools
+
+import streamlit as st
+
+from azureai.tracing import current_trace, start_trace
+
+# 워터폴에 표시할 최대 span 수 (오래 걸린 rerun에서도 사이드바가 과도하게 길어지지 않도록)
+MAX_WATERFALL_SPANS = 60
+# 상태별 막대 색상
+STATUS_COLORS = {"OK": "#4C78A8", "ERROR": "#E45756", "UNSET": "#B0B0B0"}
+
+def render_trace_waterfall(trace, container=st.sidebar):
+    """rerun(또는 fragment) 트레이스의 span을 시작 시각 기준 워터폴로 표시 (루트 span은 전체 실행 시간)"""
+    rows = trace.waterfall()
+    if not rows:
+        container.caption("기록된 호출이 없습니다.")
+        return
+
+    root, calls = rows[0], rows[1:]
+    sdk_ms = sum(row['duration_ms'] for row in calls if row['depth'] == 1)
+    errors = sum(1 for row in calls if row['status'] == "ERROR")
+    container.caption(
+        f"{root['name']} {root['duration_ms']:.0f} ms · Azure 호출 {len(calls)}건 (최상위 합계 {sdk_ms:.0f} ms)"
+        + (f" · 오류 {errors}건" if errors else "")
+    )
+    if not calls:
+        container.caption("이번 rerun에서는 Azure 호출이 없었습니다 (캐시 적중 포함).")
+        return
+
+    import plotly.graph_objects as go
+
+    shown = rows[:MAX_WATERFALL_SPANS]
+    labels = [f"{i:02d} {'  ' * row['depth']}{row['name']}" for i, row in enumerate(shown)]
+    hover = [
+        f"{row['name']}<br>시작 +{row['offset_ms']:.1f} ms · {row['duration_ms']:.1f} ms<br>"
+        f"{row['thread']}<br>{', '.join(f'{k}={v}' for k, v in row['attributes'].items())}"
+        for row in shown
+    ]
+    figure = go.Figure(go.Bar(
+        y=labels,
+        x=[max(row['duration_ms'], 0.5) for row in shown],
+        base=[row['offset_ms'] for row in shown],
+        orientation='h',
+        marker_color=[STATUS_COLORS.get(row['status'], STATUS_COLORS["UNSET"]) for row in shown],
+        hovertext=hover,
+        hoverinfo="text",
+    ))
+    figure.update_layout(
+        height=max(160, 22 * len(shown) + 60),
+        margin=dict(l=0, r=0, t=10, b=30),
+        xaxis_title="ms",
+        yaxis=dict(autorange="reversed", tickfont=dict(size=10)),
+        showlegend=False,
+    )
+    container.plotly_chart(figure, width='stretch')
+    if len(rows) > MAX_WATERFALL_SPANS:
+        container.caption(f"처음 {MAX_WATERFALL_SPANS}개 span만 표시했습니다 (전체 {len(rows)}개).")
+
+def traced_fragment(name):
+    """st.fragment 본문을 감싸는 데코레이터 (@st.fragment 아래에 적용)
+    fragment만 다시 실행될 때는 app.py의 rerun 트레이스가 없으므로 "fragment:<name>" 트레이스를 새로 시작하고,
+    호출 타이밍 보기가 켜져 있으면 사이드바 대신 fragment 아래에 그 워터폴을 표시한다 (사이드바는 fragment rerun에서 갱신되지 않음).
+    전체 rerun에서는 rerun 트레이스에 그대로 포함된다.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_trace() is not None:
+                return fn(*args, **kwargs)
+            with start_trace(f"fragment:{name}") as fragment_trace:
+                result = fn(*args, **kwargs)
+            if st.session_state.get("debug_trace_waterfall"):
+                render_trace_waterfall(fragment_trace, container=st.expander(f"🐞 호출 타이밍 (fragment: {name})", expanded=True))
+            return result
+        return wrapper
+    return decorator